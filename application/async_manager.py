@@ -0,0 +1,215 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from application.provisioning import ProvisioningBackend, SimulatedBackend
+from application.resource_manager import ResourceManager
+from domain.lifecycle import LIFECYCLE, PHASES_BY_NAME
+from providers import LocalProvider, current_provider
+
+
+class AsyncResourceManager:
+    """
+    asyncio front end to a ResourceManager for slow provisioning.
+
+    Every operation first awaits the ProvisioningBackend and only then
+    applies the change through the wrapped manager, in one synchronous step.
+    A backend error, a timeout or a cancellation therefore leaves the
+    resource in its previous state (and a create leaves no resource and no
+    reserved name behind). Provider calls (the remote create and the
+    lifecycle pre-hook) follow the backend and run in a worker thread when
+    a remote provider is installed. At most `max_concurrency` backend calls
+    run at once, and operations on the same resource queue behind each other.
+
+    The wrapped manager keeps working for synchronous callers; both share the
+    inventory, logs and locks.
+    """
+
+    def __init__(self, manager: Optional[ResourceManager] = None,
+                 backend: Optional[ProvisioningBackend] = None, max_concurrency: int = 100,
+                 timeout: Optional[float] = None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self._manager = manager if manager is not None else ResourceManager()
+        self._backend = backend if backend is not None else SimulatedBackend()
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        # name -> [lock, users]; entries exist only while a name is in use
+        self._busy: Dict[str, List[Any]] = {}
+
+    @property
+    def manager(self) -> ResourceManager:
+        """The synchronous manager that holds the resources."""
+        return self._manager
+
+    @property
+    def backend(self) -> ProvisioningBackend:
+        return self._backend
+
+    async def create_resource(self, resource_type: str, name: str, config: Dict[str, Any],
+                              timeout: Optional[float] = None) -> str:
+        """
+        Build and validate a resource, await the backend, then register it
+        with the provider and store it. If storing fails, the remote create
+        is undone.
+        """
+        manager = self._manager
+        manager.reserve(name)
+        started = time.perf_counter()
+        try:
+            resource = manager.factory.create(resource_type, name, config)
+            async with self._slot():
+                await self._call(self._backend.provision(resource), timeout)
+        except Exception as e:
+            raise manager.abort_create(resource_type, name, e, started)
+        except asyncio.CancelledError:
+            # Release the name too; the cancellation itself propagates
+            manager.abort_create(resource_type, name, RuntimeError("Cancelled"), started)
+            raise
+        return await self._apply(self._register, resource_type, name, resource, started)
+
+    async def start_resource(self, name: str, timeout: Optional[float] = None) -> str:
+        return await self._transition(name, "start", timeout)
+
+    async def stop_resource(self, name: str, timeout: Optional[float] = None) -> str:
+        return await self._transition(name, "stop", timeout)
+
+    async def delete_resource(self, name: str, timeout: Optional[float] = None) -> str:
+        return await self._transition(name, "delete", timeout)
+
+    async def bulk_create(self, specs: Iterable[Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Create many resources concurrently; specs as for ResourceManager.bulk_create."""
+        items = []
+        for spec in specs:
+            if isinstance(spec, dict):
+                spec = (spec.get("type"), spec.get("name"), spec.get("config") or {})
+            items.append((spec[1], spec))
+        return await self._run_bulk(lambda spec: self.create_resource(*spec, timeout=timeout), items)
+
+    async def bulk_start(self, names: Any, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Start many resources concurrently; accepts the same selectors as ResourceManager."""
+        return await self._run_bulk(lambda name: self.start_resource(name, timeout),
+                                    ResourceManager._names_from(names))
+
+    async def bulk_stop(self, names: Any, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await self._run_bulk(lambda name: self.stop_resource(name, timeout),
+                                    ResourceManager._names_from(names))
+
+    async def bulk_delete(self, names: Any, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await self._run_bulk(lambda name: self.delete_resource(name, timeout),
+                                    ResourceManager._names_from(names))
+
+    def list_resources(self) -> Dict[str, Dict[str, Any]]:
+        return self._manager.list_resources()
+
+    def get_resource_count(self) -> Dict[str, int]:
+        return self._manager.get_resource_count()
+
+    async def _transition(self, name: str, action: str, timeout: Optional[float]) -> str:
+        resource = self._manager.inventory.get(name)
+        if resource is None:
+            raise RuntimeError(f"Resource '{name}' not found")
+        async with self._serialized(name):
+            try:
+                # Refuse transitions the lifecycle would reject before paying for them
+                LIFECYCLE.check(int(PHASES_BY_NAME[resource.status]), action)
+                async with self._slot():
+                    await self._call(self._backend.transition(resource, action), timeout)
+            except Exception as e:
+                raise RuntimeError(f"Failed to {action} '{name}': {str(e)}")
+            return await self._apply(getattr(self._manager, f"{action}_resource"), name)
+
+    def _register(self, resource_type: str, name: str, resource: Any, started: float) -> str:
+        manager = self._manager
+        provider = current_provider()
+        try:
+            provider.create(resource)
+        except Exception as e:
+            raise manager.abort_create(resource_type, name, e, started)
+        try:
+            return manager.commit_create(resource_type, name, resource, started)
+        except RuntimeError as failure:
+            try:
+                provider.transition(resource, "delete")
+            except Exception as e:
+                raise RuntimeError(f"{failure}; undoing the remote create also failed: {e}")
+            raise
+
+    async def _apply(self, step: Callable[..., str], *args: Any) -> str:
+        """
+        Run the synchronous final step of an operation. Provider calls block,
+        so with a remote provider installed the step runs in a worker thread.
+        It cannot be taken back once running: a cancellation arriving
+        meanwhile is raised after the step has finished.
+        """
+        if isinstance(current_provider(), LocalProvider):
+            return step(*args)
+        future = asyncio.ensure_future(asyncio.to_thread(step, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            while not future.done():
+                try:
+                    await asyncio.wait([future])
+                except asyncio.CancelledError:
+                    pass
+            if not future.cancelled():
+                future.exception()  # Retrieved; the cancellation wins
+            raise
+
+    async def _call(self, operation: Awaitable[None], timeout: Optional[float]) -> None:
+        timeout = timeout if timeout is not None else self._timeout
+        try:
+            await asyncio.wait_for(operation, timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Timed out after {timeout:g}s")
+
+    async def _run_bulk(self, operation: Callable[[Any], Awaitable[str]],
+                        items: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        """
+        Run `operation` for every (name, argument) item as its own task and
+        return the same report shape as ResourceManager's bulk operations.
+        Cancelling the call cancels every unfinished item.
+        """
+        async def run(argument):
+            try:
+                return {"ok": True, "message": await operation(argument)}
+            except Exception as e:
+                return {"ok": False, "error": str(e)}
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(run(argument) for _, argument in items))
+        results = {name: outcome for (name, _), outcome in zip(items, outcomes)}
+        succeeded = sum(1 for result in results.values() if result["ok"])
+        return {
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "elapsed_seconds": time.perf_counter() - started,
+            "results": results,
+        }
+
+    def _slot(self) -> asyncio.Semaphore:
+        # asyncio primitives belong to one event loop; make one per loop used
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore[0] is not loop:
+            self._semaphore = (loop, asyncio.Semaphore(self._max_concurrency))
+        return self._semaphore[1]
+
+    @asynccontextmanager
+    async def _serialized(self, name: str) -> AsyncIterator[None]:
+        """Hold a per-name asyncio lock; the entry is dropped once nobody uses it."""
+        entry = self._busy.get(name)
+        if entry is None:
+            entry = self._busy[name] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._busy[name]
@@ -0,0 +1,516 @@
+import threading
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from application.inventory import INDEXED_FIELDS
+from application.locks import NameLocks
+from application.persistence import InventoryStore
+from domain.cloud_resource import CloudResource
+from domain.config import FrozenConfig
+from domain.lifecycle import LIFECYCLE, PHASE_NAMES, Phase
+from domain.state import STATES_BY_PHASE
+from resources import get
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; columns fall back to the array module
+    np = None
+
+# Config keys stored as interned string codes and as int64 columns
+CODE_COLUMNS = ("region", "runtime", "eviction_policy")
+NUMERIC_COLUMNS = ("replica_count", "max_size_gb", "ttl_seconds", "capacity_mb")
+BOOL_COLUMNS = ("encryption_enabled",)
+
+_MISSING = -1
+_DELETED = int(Phase.DELETED)
+_NUMPY_TYPES = {"B": "uint8", "b": "int8", "H": "uint16", "I": "uint32", "q": "int64"}
+
+
+class _Column:
+    """Growable fixed-width column backed by a NumPy array or array.array."""
+
+    def __init__(self, typecode: str):
+        self._size = 0
+        if np is not None:
+            self._data = np.zeros(1024, dtype=_NUMPY_TYPES[typecode])
+        else:
+            self._data = array(typecode)
+
+    def append(self, value: int) -> None:
+        if np is None:
+            self._data.append(value)
+            return
+        if self._size == len(self._data):
+            self._data = np.resize(self._data, 2 * len(self._data))
+        self._data[self._size] = value
+        self._size += 1
+
+    def __getitem__(self, row: int) -> int:
+        return int(self._data[row])
+
+    def __setitem__(self, row: int, value: int) -> None:
+        self._data[row] = value
+
+    def values(self):
+        """The filled part of the column (a NumPy view when available)."""
+        return self._data[:self._size] if np is not None else self._data
+
+
+class _Interner:
+    """Maps values to small integer codes; code 0 is reserved for 'missing'."""
+
+    def __init__(self):
+        self.values: List[Any] = [None]
+        self._codes: Dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def find(self, value: Any) -> Optional[int]:
+        return 0 if value is None else self._codes.get(value)
+
+
+class ResourceProxy:
+    """
+    Lightweight view of one row of a ColumnarInventory. It exposes the same
+    interface as CloudResource, and lifecycle actions write straight back
+    into the columns.
+    """
+
+    __slots__ = ("_inventory", "_row", "_name")
+
+    def __init__(self, inventory: "ColumnarInventory", row: int):
+        self._inventory = inventory
+        self._row = row
+        self._name = inventory._names[row]
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def resource_type(self) -> str:
+        return self._inventory._types.values[self._inventory._type_col[self._row]]
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self._inventory._config(self._row)
+
+    @property
+    def status(self) -> str:
+        return PHASE_NAMES[self._phase]
+
+    @property
+    def state(self):
+        return STATES_BY_PHASE[self._phase]
+
+    @property
+    def deleted(self) -> bool:
+        return bool(self._inventory._deleted_col[self._row])
+
+    @deleted.setter
+    def deleted(self, value: bool):
+        if not isinstance(value, bool):
+            raise ValueError("Deleted status must be boolean")
+        self._inventory._update(self._row, self._phase, value)
+
+    @property
+    def _phase(self) -> int:
+        return self._inventory._phase_col[self._row]
+
+    def _enter(self, phase: int) -> None:
+        self._inventory._update(self._row, phase, True if phase == _DELETED else self.deleted)
+
+    def set_state(self, state) -> None:
+        self._inventory._update(self._row, int(state.phase), self.deleted)
+
+    def set_listener(self, listener) -> None:
+        # Transitions already update the columns and counters directly
+        pass
+
+    def start(self) -> str:
+        return LIFECYCLE.fire(self, "start")
+
+    def stop(self) -> str:
+        return LIFECYCLE.fire(self, "stop")
+
+    def delete(self) -> str:
+        return LIFECYCLE.fire(self, "delete")
+
+    @property
+    def compiled_schema(self):
+        return getattr(self._resource_class(), "compiled_schema", None)
+
+    def validate_config(self) -> None:
+        self._resource_class().validate_config(self)
+
+    def get_details(self) -> str:
+        return self._resource_class().get_details(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self._name,
+            "type": self.resource_type,
+            "status": self.status,
+            "deleted": self.deleted,
+            "details": self.get_details(),
+            "config": self.config,
+        }
+
+    def _resource_class(self):
+        return get(self.resource_type)
+
+
+class _ProxyMapping(Mapping):
+    """Read-only name -> resource view over a ColumnarInventory."""
+
+    def __init__(self, inventory: "ColumnarInventory"):
+        self._inventory = inventory
+
+    def __getitem__(self, name):
+        resource = self._inventory.get(name)
+        if resource is None:
+            raise KeyError(name)
+        return resource
+
+    def __iter__(self):
+        return iter(self._inventory)
+
+    def __len__(self):
+        return len(self._inventory)
+
+
+class ColumnarInventory:
+    """
+    Struct-of-arrays alternative to ResourceInventory for very large fleets.
+
+    Resources are decomposed into columns when added: interned codes for type,
+    region, runtime and eviction policy, a phase and deleted column, and int64
+    columns for the numeric config keys. Config keys without a column are kept
+    in a sparse per-row dict. `get()` returns a ResourceProxy (re-wrapped in
+    the decorators the resource was added with), so nothing but the columns
+    lives per resource. Counts, filters and group-by aggregations run over
+    whole columns, vectorized with NumPy when it is installed.
+    """
+
+    def __init__(self, store: Optional[InventoryStore] = None, lock_stripes: int = 64):
+        self._store = store
+        self._locks = NameLocks(lock_stripes)
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._types = _Interner()
+        self._wrappers = _Interner()
+        self._codes = {column: _Interner() for column in CODE_COLUMNS}
+        self._type_col = _Column("H")
+        self._phase_col = _Column("B")
+        self._deleted_col = _Column("B")
+        self._wrapper_col = _Column("B")
+        self._code_cols = {column: _Column("I") for column in CODE_COLUMNS}
+        self._numeric_cols = {column: _Column("q") for column in NUMERIC_COLUMNS}
+        self._bool_cols = {column: _Column("b") for column in BOOL_COLUMNS}
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        # Config columns in the order _cells() produces their values
+        self._config_cols = ([self._code_cols[column] for column in CODE_COLUMNS]
+                             + [self._numeric_cols[column] for column in NUMERIC_COLUMNS]
+                             + [self._bool_cols[column] for column in BOOL_COLUMNS])
+        self._version = 0
+        self._lock = threading.RLock()
+
+    @property
+    def resources(self) -> Mapping:
+        """Name to resource mapping; values are proxies created on access."""
+        return _ProxyMapping(self)
+
+    @property
+    def locks(self) -> NameLocks:
+        """Per-name locks shared by every manager using this inventory."""
+        return self._locks
+
+    @property
+    def store(self) -> Optional[InventoryStore]:
+        """Durable store receiving creates and transitions, if any."""
+        return self._store
+
+    def attach_store(self, store: InventoryStore) -> None:
+        """Journal every later create and transition to `store`."""
+        with self._lock:
+            self._store = store
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every add or transition."""
+        return self._version
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rows
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def get(self, name: str):
+        row = self._rows.get(name)
+        if row is None:
+            return None
+        resource = ResourceProxy(self, row)
+        for wrapper in reversed(self._wrappers.values[self._wrapper_col[row]] or ()):
+            resource = wrapper(resource)
+        return resource
+
+    def name_at(self, seq: int) -> str:
+        """Resource name for an insertion sequence number (row)."""
+        return self._names[seq]
+
+    def add(self, name: str, resource: CloudResource, journal: bool = True) -> None:
+        """Decompose `resource` into a new row; the object itself is not kept."""
+        # Remember decorators (outermost first) so get() can re-apply them
+        wrappers = []
+        while hasattr(resource, "_wrapped"):
+            wrappers.append(type(resource))
+            resource = resource._wrapped
+        config = resource.config
+        with self._lock:
+            if name in self._rows:
+                raise RuntimeError(f"Resource '{name}' already exists")
+            row = len(self._names)
+            self._names.append(name)
+            self._rows[name] = row
+            self._type_col.append(self._types.code(resource.resource_type))
+            self._phase_col.append(int(resource.state.phase))
+            self._deleted_col.append(int(resource.deleted))
+            self._wrapper_col.append(self._wrappers.code(tuple(wrappers) or None))
+
+            cells, extras = self._cells(config)
+            for column, cell in zip(self._config_cols, cells):
+                column.append(cell)
+            if extras:
+                self._extras[row] = extras
+            self._version += 1
+
+            if journal and self._store is not None:
+                self._store.record_create(name, resource.resource_type, config,
+                                          resource.status, resource.deleted)
+                self._maybe_checkpoint()
+
+    def replace(self, name: str, resource: CloudResource, journal: bool = True) -> None:
+        """
+        Rewrite the config cells of an existing row (a config update). The
+        resource must keep its type and state; its decorators are ignored.
+        """
+        while hasattr(resource, "_wrapped"):
+            resource = resource._wrapped
+        config = resource.config
+        with self._lock:
+            row = self._rows.get(name)
+            if row is None:
+                raise RuntimeError(f"Resource '{name}' not found")
+            if (self._types.values[self._type_col[row]] != resource.resource_type
+                    or self._phase_col[row] != int(resource.state.phase)
+                    or bool(self._deleted_col[row]) != resource.deleted):
+                raise RuntimeError(f"Replacement for '{name}' must keep its type and state")
+            cells, extras = self._cells(config)
+            for column, cell in zip(self._config_cols, cells):
+                column[row] = cell
+            if extras:
+                self._extras[row] = extras
+            else:
+                self._extras.pop(row, None)
+            self._version += 1
+            if journal and self._store is not None:
+                self._store.record_update(name, config)
+                self._maybe_checkpoint()
+
+    def snapshot(self, name: str) -> Dict[str, Any]:
+        return ResourceProxy(self, self._rows[name]).to_dict()
+
+    def snapshots(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: ResourceProxy(self, row).to_dict() for row, name in enumerate(self._names)}
+
+    def export(self) -> Iterator[Dict[str, Any]]:
+        """Yield persistable records for every resource in creation order."""
+        for row, name in enumerate(self._names):
+            yield {"name": name, "type": self._types.values[self._type_col[row]], "config": self._config(row),
+                   "state": PHASE_NAMES[self._phase_col[row]], "deleted": bool(self._deleted_col[row])}
+
+    def checkpoint(self) -> None:
+        """Write a compacted snapshot of the inventory to the attached store."""
+        with self._lock:
+            if self._store is not None:
+                self._store.write_snapshot(self.export())
+
+    def counts(self) -> Dict[str, Any]:
+        """Counts by type and status, computed over whole columns."""
+        with self._lock:
+            total = len(self._names)
+            deleted = self._sum(self._deleted_col.values())
+            by_type = self._histogram(self._type_col.values(), self._types.values)
+            by_status = self._histogram(self._phase_col.values(), PHASE_NAMES)
+        return {"total": total, "active": total - deleted, "deleted": deleted,
+                "by_type": by_type, "by_status": by_status}
+
+    def aggregate(self, column: str, by: str = "type", func: str = "sum") -> Dict[Any, float]:
+        """
+        Group a numeric config column (e.g. "capacity_mb") by "type",
+        "status" or one of the interned config columns, and reduce it with
+        "sum", "mean", "min", "max" or "count". Rows without a value are skipped.
+        """
+        if column not in self._numeric_cols:
+            raise ValueError(f"Cannot aggregate column: {column}")
+        if func not in ("sum", "mean", "min", "max", "count"):
+            raise ValueError(f"Unknown aggregate: {func}")
+        with self._lock:
+            keys, labels = self._group_column(by)
+            values = self._numeric_cols[column].values()
+            if np is not None:
+                return self._aggregate_numpy(keys, labels, values, func)
+            groups: Dict[int, List[int]] = {}
+            for key, value in zip(keys, values):
+                if value != _MISSING:
+                    groups.setdefault(key, []).append(value)
+        reducers = {"sum": sum, "min": min, "max": max, "count": len,
+                    "mean": lambda items: sum(items) / len(items)}
+        return {labels[key]: reducers[func](items) for key, items in groups.items()}
+
+    def iter_seqs(self, filters: Dict[str, Any], after: Optional[int] = None) -> Iterator[int]:
+        """Yield matching rows after `after`, filtering whole columns at once."""
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on: {', '.join(sorted(unknown))}")
+        start = 0 if after is None else after + 1
+        with self._lock:
+            conditions = []
+            for field, value in filters.items():
+                column, code = self._filter_code(field, value)
+                if code is None:
+                    return
+                conditions.append((column.values(), code))
+            end = len(self._names)
+            if np is not None:
+                mask = np.ones(end - start, dtype=bool)
+                for values, code in conditions:
+                    mask &= values[start:end] == code
+                rows = (start + np.flatnonzero(mask)).tolist()
+            else:
+                rows = [row for row in range(start, end)
+                        if all(values[row] == code for values, code in conditions)]
+        yield from rows
+
+    def _filter_code(self, field: str, value: Any):
+        if field == "type":
+            return self._type_col, self._types.find(value)
+        if field == "status":
+            phase = PHASE_NAMES.index(value) if value in PHASE_NAMES else None
+            return self._phase_col, phase
+        if field == "deleted":
+            return self._deleted_col, int(bool(value))
+        return self._code_cols[field], self._codes[field].find(value)
+
+    def _group_column(self, by: str) -> Tuple[Any, List[Any]]:
+        if by == "type":
+            return self._type_col.values(), self._types.values
+        if by == "status":
+            return self._phase_col.values(), list(PHASE_NAMES)
+        if by in self._code_cols:
+            return self._code_cols[by].values(), self._codes[by].values
+        raise ValueError(f"Cannot group by: {by}")
+
+    def _update(self, row: int, phase: int, deleted: bool) -> None:
+        with self._lock:
+            if self._phase_col[row] == phase and bool(self._deleted_col[row]) == deleted:
+                return
+            self._phase_col[row] = phase
+            self._deleted_col[row] = int(deleted)
+            self._version += 1
+            if self._store is not None:
+                self._store.record_transition(self._names[row], PHASE_NAMES[phase], deleted)
+                self._maybe_checkpoint()
+
+    def _config(self, row: int) -> FrozenConfig:
+        config = {}
+        for column in CODE_COLUMNS:
+            code = self._code_cols[column][row]
+            if code:
+                config[column] = self._codes[column].values[code]
+        for column in NUMERIC_COLUMNS:
+            value = self._numeric_cols[column][row]
+            if value != _MISSING:
+                config[column] = value
+        for column in BOOL_COLUMNS:
+            value = self._bool_cols[column][row]
+            if value != _MISSING:
+                config[column] = bool(value)
+        config.update(self._extras.get(row, ()))
+        return FrozenConfig.intern(config)
+
+    def _cells(self, config: Dict[str, Any]) -> Tuple[List[int], Dict[str, Any]]:
+        """Cells of a config, in `_config_cols` order, plus the keys that have no column."""
+        cells = []
+        extras = {}
+        for key, value in config.items():
+            if key not in CODE_COLUMNS and key not in NUMERIC_COLUMNS and key not in BOOL_COLUMNS:
+                extras[key] = value
+        for column in CODE_COLUMNS:
+            value = config.get(column)
+            if value is None or isinstance(value, str):
+                cells.append(self._codes[column].code(value))
+            else:
+                cells.append(0)
+                extras[column] = value
+        for column in NUMERIC_COLUMNS:
+            value = config.get(column)
+            if type(value) is int and value >= 0:
+                cells.append(value)
+            else:
+                cells.append(_MISSING)
+                if column in config:
+                    extras[column] = value
+        for column in BOOL_COLUMNS:
+            value = config.get(column)
+            if isinstance(value, bool):
+                cells.append(int(value))
+            else:
+                cells.append(_MISSING)
+                if column in config:
+                    extras[column] = value
+        return cells, extras
+
+    def _maybe_checkpoint(self) -> None:
+        if self._store.snapshot_due:
+            self._store.write_snapshot(self.export())
+
+    @staticmethod
+    def _sum(values) -> int:
+        return int(values.sum()) if np is not None else sum(values)
+
+    @staticmethod
+    def _histogram(values, labels) -> Dict[str, int]:
+        if np is not None:
+            counts = np.bincount(values, minlength=len(labels)).tolist()
+            return {labels[code]: count for code, count in enumerate(counts) if count}
+        return {labels[code]: count for code, count in sorted(Counter(values).items())}
+
+    @staticmethod
+    def _aggregate_numpy(keys, labels, values, func: str) -> Dict[Any, float]:
+        present = values != _MISSING
+        keys, values = keys[present], values[present]
+        counts = np.bincount(keys, minlength=len(labels))
+        if func in ("sum", "mean", "count"):
+            sums = np.zeros(len(labels), dtype=np.int64)
+            np.add.at(sums, keys, values)
+            result = {"sum": sums, "count": counts, "mean": sums / np.maximum(counts, 1)}[func]
+        else:
+            fill = np.iinfo(np.int64).max if func == "min" else np.iinfo(np.int64).min
+            result = np.full(len(labels), fill, dtype=np.int64)
+            (np.minimum if func == "min" else np.maximum).at(result, keys, values)
+        return {labels[code]: result[code].item() for code in range(len(labels)) if counts[code]}
@@ -0,0 +1,114 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+class ResourceGroup:
+    """
+    Named set of resources with dependencies between them. "app" depending
+    on "storage" means storage must be started before app, and app stopped
+    or deleted before storage. Dependencies are always members themselves.
+
+    waves() orders the members into topological levels: a member's wave
+    comes after those of everything it depends on, so the members of one
+    wave can run concurrently and a start takes as many waves as the
+    dependency chain is deep. Adding a dependency that closes a cycle
+    raises ValueError and leaves the group unchanged.
+    """
+
+    def __init__(self, name: str, dependencies: Optional[Mapping[str, Iterable[str]]] = None):
+        self.name = name
+        self._dependencies: Dict[str, Tuple[str, ...]] = {}
+        self._waves: Optional[List[List[str]]] = None
+        for member, depends_on in (dependencies or {}).items():
+            self.add(member, depends_on)
+
+    def __len__(self) -> int:
+        return len(self._dependencies)
+
+    def __contains__(self, member: str) -> bool:
+        return member in self._dependencies
+
+    @property
+    def members(self) -> Tuple[str, ...]:
+        """Members in the order they were added."""
+        return tuple(self._dependencies)
+
+    def dependencies_of(self, member: str) -> Tuple[str, ...]:
+        return self._dependencies[member]
+
+    def dependents_of(self, member: str) -> Tuple[str, ...]:
+        return tuple(other for other, depends_on in self._dependencies.items() if member in depends_on)
+
+    def add(self, member: str, depends_on: Iterable[str] = ()) -> None:
+        """Add `member` (if new) and make it depend on `depends_on`, which are added too."""
+        depends_on = tuple(dict.fromkeys(depends_on))
+        for dependency in depends_on:
+            path = self._path(dependency, member)
+            if path is not None:
+                raise ValueError(f"Dependency cycle in group '{self.name}': {' -> '.join([member] + path)}")
+        for dependency in depends_on:
+            self._dependencies.setdefault(dependency, ())
+        current = self._dependencies.get(member, ())
+        self._dependencies[member] = current + tuple(d for d in depends_on if d not in current)
+        self._waves = None
+
+    def remove(self, member: str) -> None:
+        """Drop `member` and every dependency on it."""
+        del self._dependencies[member]
+        for other, depends_on in self._dependencies.items():
+            if member in depends_on:
+                self._dependencies[other] = tuple(d for d in depends_on if d != member)
+        self._waves = None
+
+    def waves(self) -> List[List[str]]:
+        """Members grouped into topological levels, dependencies first (cached)."""
+        if self._waves is None:
+            remaining = {member: len(depends_on) for member, depends_on in self._dependencies.items()}
+            dependents: Dict[str, List[str]] = {member: [] for member in self._dependencies}
+            for member, depends_on in self._dependencies.items():
+                for dependency in depends_on:
+                    dependents[dependency].append(member)
+            wave = [member for member, count in remaining.items() if not count]
+            waves = []
+            while wave:
+                waves.append(wave)
+                following = []
+                for member in wave:
+                    for dependent in dependents[member]:
+                        remaining[dependent] -= 1
+                        if not remaining[dependent]:
+                            following.append(dependent)
+                wave = following
+            # add() rejects cycles, so every member has been placed
+            self._waves = waves
+        return [list(wave) for wave in self._waves]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "resources": {member: list(deps) for member, deps in self._dependencies.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ResourceGroup":
+        """Build a group from to_dict() output; "resources" may also be a plain list of names."""
+        resources = data.get("resources") or {}
+        if not isinstance(resources, Mapping):
+            resources = {member: () for member in resources}
+        return cls(data.get("name") or "group", resources)
+
+    def _path(self, start: str, goal: str) -> Optional[List[str]]:
+        """Dependency path from `start` to `goal` (both included), or None."""
+        if start == goal:
+            return [start]
+        parents = {start: None}
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for dependency in self._dependencies.get(current, ()):
+                if dependency in parents:
+                    continue
+                parents[dependency] = current
+                if dependency == goal:
+                    path = [goal]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                stack.append(dependency)
+        return None
@@ -0,0 +1,343 @@
+import threading
+from heapq import heapify, heappop, heapreplace
+from bisect import bisect_right, insort
+from functools import partial
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from application.locks import NameLocks
+from application.persistence import InventoryStore
+from domain.cloud_resource import CloudResource
+
+# Fields kept in secondary indexes; the last three are read from the config
+INDEXED_FIELDS = ("type", "status", "deleted", "region", "runtime", "eviction_policy")
+_CONFIG_FIELDS = INDEXED_FIELDS[3:]
+
+
+class _Shard:
+    """Counters, secondary indexes and dirty names of the resources in one lock stripe."""
+
+    __slots__ = ("by_type", "by_status", "deleted", "indexes", "dirty", "version")
+
+    def __init__(self):
+        self.by_type: Dict[str, int] = {}
+        self.by_status: Dict[str, int] = {}
+        self.deleted = 0
+        self.indexes: Dict[str, Dict[Any, List[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self.dirty = set()
+        self.version = 0
+
+    def count(self, key: Tuple[str, str, bool], delta: int) -> None:
+        resource_type, status, deleted = key
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + delta
+        self.by_status[status] = self.by_status.get(status, 0) + delta
+        if deleted:
+            self.deleted += delta
+
+    def move(self, field: str, old: Any, new: Any, seq: int) -> None:
+        bucket = self.indexes[field][old]
+        del bucket[bisect_right(bucket, seq) - 1]
+        insort(self.indexes[field].setdefault(new, []), seq)
+
+    def next_seq(self, filters: Dict[str, Any], last: int) -> Optional[int]:
+        # Drive the scan from the most selective index among the filters
+        best = None
+        for field, value in filters.items():
+            bucket = self.indexes[field].get(value, ())
+            if best is None or len(bucket) < len(best):
+                best = bucket
+        pos = bisect_right(best, last)
+        return best[pos] if pos < len(best) else None
+
+
+class ResourceInventory:
+    """
+    In-memory store of managed resources.
+    Keeps running counters by type, status and deleted flag, and a snapshot
+    cache of `to_dict()` results that is refreshed only for resources that
+    changed since the last read. Resources report their transitions through
+    `CloudResource.set_listener`, so counters stay correct even when a state
+    change does not go through the ResourceManager.
+
+    Every resource also gets an insertion sequence number, and secondary
+    indexes map each value of INDEXED_FIELDS to a sorted list of sequence
+    numbers, which is what `iter_seqs` walks to answer filtered queries.
+
+    Counters, indexes and dirty marks are kept per lock stripe and guarded
+    by that stripe of `locks`, which the ResourceManager already holds
+    around a transition, so unrelated resources never contend. Only the
+    assignment of sequence numbers and, with a store attached, journaling
+    are serialized. Whole-inventory reads hold every stripe.
+    """
+
+    def __init__(self, store: Optional[InventoryStore] = None, lock_stripes: int = 64):
+        self._store = store
+        self._locks = NameLocks(lock_stripes)
+        self._stripes = self._locks.stripes
+        self._shards = tuple(_Shard() for _ in range(lock_stripes))
+        self._resources: Dict[str, CloudResource] = {}
+        self._keys: Dict[str, Tuple[str, str, bool]] = {}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._names: List[str] = []
+        self._seqs: Dict[str, int] = {}
+        self._fields: List[Tuple[Any, ...]] = []
+        self._seq_lock = threading.Lock()
+        # Orders journal records and snapshots; taken only with a store attached
+        self._store_lock = threading.RLock()
+
+    @property
+    def resources(self) -> Dict[str, CloudResource]:
+        """Name to resource mapping (read-only by convention)."""
+        return self._resources
+
+    @property
+    def locks(self) -> NameLocks:
+        """Per-name locks shared by every manager using this inventory."""
+        return self._locks
+
+    @property
+    def store(self) -> Optional[InventoryStore]:
+        """Durable store receiving creates and transitions, if any."""
+        return self._store
+
+    def attach_store(self, store: InventoryStore) -> None:
+        """Journal every later create and transition to `store`."""
+        with self._store_lock:
+            self._store = store
+
+    def export(self) -> Iterator[Dict[str, Any]]:
+        """Yield persistable records for every resource in creation order."""
+        for name in self._names:
+            resource = self._resources[name]
+            yield {"name": name, "type": resource.resource_type, "config": resource.config,
+                   "state": resource.status, "deleted": resource.deleted}
+
+    def checkpoint(self) -> None:
+        """
+        Write a compacted snapshot of the inventory to the attached store.
+        Journaling waits meanwhile; a change that reaches the snapshot before
+        its journal record is simply applied again on replay, as records hold
+        the resulting state rather than a delta.
+        """
+        with self._store_lock:
+            if self._store is not None:
+                self._store.write_snapshot(self.export())
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every add or transition."""
+        return sum(shard.version for shard in self._shards)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._resources
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._resources)
+
+    def get(self, name: str) -> Optional[CloudResource]:
+        return self._resources.get(name)
+
+    def add(self, name: str, resource: CloudResource, journal: bool = True) -> None:
+        """
+        Store a new resource and start tracking its transitions. With
+        `journal=False` (used during recovery) the create is not persisted.
+        """
+        index = hash(name) % len(self._stripes)
+        with self._stripes[index]:
+            if name in self._resources:
+                raise RuntimeError(f"Resource '{name}' already exists")
+            key = self._key_of(resource)
+            config = resource.config
+            fields = key + tuple(config.get(field) for field in _CONFIG_FIELDS)
+            self._resources[name] = resource
+            self._keys[name] = key
+            with self._seq_lock:
+                seq = len(self._names)
+                self._fields.append(fields)
+                self._names.append(name)
+            self._seqs[name] = seq
+            shard = self._shards[index]
+            shard.count(key, 1)
+            for field, value in zip(INDEXED_FIELDS, fields):
+                shard.indexes[field].setdefault(value, []).append(seq)
+            shard.dirty.add(name)
+            shard.version += 1
+
+            if journal and self._store is not None:
+                self._journal(self._store.record_create, name, key[0], config, key[1], key[2])
+        resource.set_listener(partial(self._on_transition, name))
+
+    def replace(self, name: str, resource: CloudResource, journal: bool = True) -> None:
+        """
+        Swap in a new object for an existing resource of the same type and
+        state (a config update). Its sequence number is kept; the config
+        indexes are updated and the new config is journaled.
+        """
+        index = hash(name) % len(self._stripes)
+        with self._stripes[index]:
+            current = self._resources.get(name)
+            if current is None:
+                raise RuntimeError(f"Resource '{name}' not found")
+            if self._key_of(resource) != self._keys[name]:
+                raise RuntimeError(f"Replacement for '{name}' must keep its type and state")
+            current.set_listener(None)
+            self._resources[name] = resource
+            shard = self._shards[index]
+            shard.dirty.add(name)
+            shard.version += 1
+
+            seq = self._seqs[name]
+            old_fields = self._fields[seq]
+            new_fields = old_fields[:3] + tuple(resource.config.get(field) for field in _CONFIG_FIELDS)
+            for field, old, new in zip(_CONFIG_FIELDS, old_fields[3:], new_fields[3:]):
+                if old != new:
+                    shard.move(field, old, new, seq)
+            self._fields[seq] = new_fields
+
+            if journal and self._store is not None:
+                self._journal(self._store.record_update, name, resource.config)
+        resource.set_listener(partial(self._on_transition, name))
+
+    def snapshot(self, name: str) -> Dict[str, Any]:
+        """Return the cached `to_dict()` of a resource, refreshing it if stale."""
+        index = hash(name) % len(self._stripes)
+        with self._stripes[index]:
+            dirty = self._shards[index].dirty
+            if name in dirty or name not in self._snapshots:
+                self._snapshots[name] = self._resources[name].to_dict()
+                dirty.discard(name)
+            return self._snapshots[name]
+
+    def snapshots(self) -> Dict[str, Dict[str, Any]]:
+        """Return `to_dict()` of every resource in creation order, re-serializing only changed ones."""
+        with self._locks.hold_all():
+            snapshots, resources = self._snapshots, self._resources
+            for shard in self._shards:
+                for name in shard.dirty:
+                    snapshots[name] = resources[name].to_dict()
+                shard.dirty.clear()
+            return {name: snapshots[name] for name in self._names}
+
+    def counts(self) -> Dict[str, Any]:
+        """Return resource counts by type and status in O(stripes x (types + statuses))."""
+        by_type: Dict[str, int] = {}
+        by_status: Dict[str, int] = {}
+        deleted = 0
+        with self._locks.hold_all():
+            total = len(self._resources)
+            for shard in self._shards:
+                for key, value in shard.by_type.items():
+                    by_type[key] = by_type.get(key, 0) + value
+                for key, value in shard.by_status.items():
+                    by_status[key] = by_status.get(key, 0) + value
+                deleted += shard.deleted
+        return {
+            "total": total,
+            "active": total - deleted,
+            "deleted": deleted,
+            "by_type": {k: v for k, v in by_type.items() if v},
+            "by_status": {k: v for k, v in by_status.items() if v},
+        }
+
+    def aggregate(self, column: str, by: str = "type", func: str = "sum") -> Dict[Any, float]:
+        """
+        Group the numeric config value `column` by "type", "status" or an
+        indexed config key and reduce it with "sum", "mean", "min", "max" or
+        "count". Resources without a numeric value are skipped.
+        """
+        reducers = {"sum": sum, "min": min, "max": max, "count": len,
+                    "mean": lambda items: sum(items) / len(items)}
+        if func not in reducers:
+            raise ValueError(f"Unknown aggregate: {func}")
+        if by not in INDEXED_FIELDS or by == "deleted":
+            raise ValueError(f"Cannot group by: {by}")
+        position = INDEXED_FIELDS.index(by)
+        groups: Dict[Any, List[Any]] = {}
+        with self._locks.hold_all():
+            for seq, name in enumerate(self._names):
+                value = self._resources[name].config.get(column)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    groups.setdefault(self._fields[seq][position], []).append(value)
+        return {key: reducers[func](items) for key, items in groups.items()}
+
+    def _on_transition(self, name: str, resource: CloudResource) -> None:
+        index = hash(name) % len(self._stripes)
+        with self._stripes[index]:
+            old_key = self._keys.get(name)
+            if old_key is None:
+                return
+            shard = self._shards[index]
+            new_key = self._key_of(resource)
+            if new_key != old_key:
+                shard.count(old_key, -1)
+                shard.count(new_key, 1)
+                self._keys[name] = new_key
+                self._reindex(shard, name, new_key)
+                if self._store is not None:
+                    self._journal(self._store.record_transition, name, new_key[1], new_key[2])
+            shard.dirty.add(name)
+            shard.version += 1
+
+    def iter_seqs(self, filters: Dict[str, Any], after: Optional[int] = None) -> Iterator[int]:
+        """
+        Lazily yield sequence numbers (in insertion order) of resources whose
+        indexed fields equal every value in `filters`, starting after `after`.
+        The per-stripe indexes are merged by sequence number; each step
+        re-checks the resource and re-seeks its stripe under that stripe's
+        lock, so concurrent inserts and transitions never invalidate the
+        iteration (a resource changing meanwhile may or may not be yielded).
+        """
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on: {', '.join(sorted(unknown))}")
+        last = -1 if after is None else after
+        if not filters:
+            while last + 1 < len(self._names):
+                last += 1
+                yield last
+            return
+        checks = [(INDEXED_FIELDS.index(field), value) for field, value in filters.items()]
+        heads = []
+        for index, shard in enumerate(self._shards):
+            with self._stripes[index]:
+                seq = shard.next_seq(filters, last)
+            if seq is not None:
+                heads.append((seq, index))
+        heapify(heads)
+        while heads:
+            seq, index = heads[0]
+            with self._stripes[index]:
+                fields = self._fields[seq]
+                matched = all(fields[i] == value for i, value in checks)
+                following = self._shards[index].next_seq(filters, seq)
+            if following is None:
+                heappop(heads)
+            else:
+                heapreplace(heads, (following, index))
+            if matched:
+                yield seq
+
+    def name_at(self, seq: int) -> str:
+        """Resource name for an insertion sequence number."""
+        return self._names[seq]
+
+    def _reindex(self, shard: _Shard, name: str, key: Tuple[str, str, bool]) -> None:
+        seq = self._seqs[name]
+        old_fields = self._fields[seq]
+        new_fields = key + old_fields[len(key):]
+        for i, field in enumerate(INDEXED_FIELDS[:len(key)]):
+            if old_fields[i] != new_fields[i]:
+                shard.move(field, old_fields[i], new_fields[i], seq)
+        self._fields[seq] = new_fields
+
+    def _journal(self, record, *args) -> None:
+        # Records of one resource stay in order, as its stripe is held here
+        with self._store_lock:
+            record(*args)
+            if self._store.snapshot_due:
+                self._store.write_snapshot(self.export())
+
+    @staticmethod
+    def _key_of(resource: CloudResource) -> Tuple[str, str, bool]:
+        return resource.resource_type, resource.status, resource.deleted
@@ -0,0 +1,80 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Set, Tuple
+
+
+class NameLocks:
+    """
+    Striped locks keyed by resource name, plus reservations for names that
+    are being created. A name always maps to the same one of `stripes`
+    re-entrant locks, so operations on unrelated resources almost never wait
+    for each other while operations on one resource are serialized.
+
+    Several stripes are always taken in ascending stripe order, which keeps
+    `hold_many` and `hold_all` deadlock-free among themselves. Do not take
+    more stripes while already holding one.
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError("stripes must be a positive integer")
+        self._stripes = tuple(threading.RLock() for _ in range(stripes))
+        self._reserved: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._stripes)
+
+    def lock_for(self, name: str) -> threading.RLock:
+        """The stripe lock guarding `name`."""
+        return self._stripes[hash(name) % len(self._stripes)]
+
+    @property
+    def stripes(self) -> Tuple[threading.RLock, ...]:
+        """The stripe locks; `name` maps to `stripes[hash(name) % len(stripes)]`."""
+        return self._stripes
+
+    def hold(self, name: str) -> threading.RLock:
+        """Context manager holding the stripe of `name`."""
+        return self.lock_for(name)
+
+    @contextmanager
+    def hold_many(self, names: Iterable[str]) -> Iterator[None]:
+        """Hold the stripes of all `names` at once."""
+        count = len(self._stripes)
+        with self._holding(sorted({hash(name) % count for name in names})):
+            yield
+
+    @contextmanager
+    def hold_all(self) -> Iterator[None]:
+        """Hold every stripe: no locked operation runs until released."""
+        with self._holding(range(len(self._stripes))):
+            yield
+
+    def reserve(self, name: str) -> bool:
+        """
+        Claim `name` for a create in progress. Returns False if it is already
+        claimed. Callers check and claim while holding the name's stripe.
+        """
+        if name in self._reserved:
+            return False
+        self._reserved.add(name)
+        return True
+
+    def release(self, name: str) -> None:
+        """Drop the claim on `name`."""
+        self._reserved.discard(name)
+
+    def is_reserved(self, name: str) -> bool:
+        return name in self._reserved
+
+    @contextmanager
+    def _holding(self, indexes: Iterable[int]) -> Iterator[None]:
+        acquired = []
+        try:
+            for index in indexes:
+                self._stripes[index].acquire()
+                acquired.append(self._stripes[index])
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
@@ -0,0 +1,39 @@
+import hashlib
+import hmac
+import os
+from hashlib import sha256
+
+ALGORITHM = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 200000
+SALT_BYTES = 16
+
+
+def hash_password(password: str, iterations: int = DEFAULT_ITERATIONS) -> str:
+    """Hash a password with a random salt as 'pbkdf2_sha256$iterations$salt$hash'."""
+    if iterations < 1:
+        raise ValueError("iterations must be positive")
+    salt = os.urandom(SALT_BYTES).hex()
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), iterations)
+    return f"{ALGORITHM}${iterations}${salt}${digest.hex()}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check a password against a stored hash, including legacy unsalted sha256 hashes."""
+    if not stored:
+        return False
+    if "$" not in stored:
+        return hmac.compare_digest(stored, sha256(password.encode()).hexdigest())
+    try:
+        algorithm, iterations, salt, expected = stored.split("$")
+        if algorithm != ALGORITHM:
+            return False
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+def needs_rehash(stored: str, iterations: int = DEFAULT_ITERATIONS) -> bool:
+    """Whether a stored hash is legacy or uses a different cost than `iterations`."""
+    parts = stored.split("$")
+    return len(parts) != 4 or parts[0] != ALGORITHM or parts[1] != str(iterations)
@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+INVENTORY_DIR = os.path.join("cloudconnect", "data", "inventory")
+
+_JOURNAL_PREFIX = "journal-"
+_SNAPSHOT_PREFIX = "snapshot-"
+
+
+class InventoryStore:
+    """
+    Durable storage for the resource inventory.
+
+    Every create, config update and state transition is appended to a JSONL
+    journal. Writes
+    are group-committed: the journal is fsynced once `group_commit_size`
+    records are pending, or after `group_commit_interval` seconds, whichever
+    comes first. Once `snapshot_every` records have accumulated, the owner
+    writes a compacted snapshot of the live inventory, and journal segments
+    covered by it are removed, so recovery only replays a bounded tail.
+    """
+
+    def __init__(self, directory: str = INVENTORY_DIR, group_commit_size: int = 128,
+                 group_commit_interval: float = 0.05, snapshot_every: int = 50000, fsync: bool = True):
+        if group_commit_size < 1 or snapshot_every < 1:
+            raise ValueError("group_commit_size and snapshot_every must be positive")
+        self._directory = directory
+        self._group_commit_size = group_commit_size
+        self._group_commit_interval = group_commit_interval
+        self._snapshot_every = snapshot_every
+        self._fsync = fsync
+        self._lock = threading.Lock()
+        self._commit_wakeup = threading.Condition(self._lock)
+        self._journal = None
+        self._seq = 0
+        self._since_snapshot = 0
+        self._pending = 0
+        self._committer: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def snapshot_due(self) -> bool:
+        """Whether enough records have accumulated to justify a new snapshot."""
+        return self._since_snapshot >= self._snapshot_every
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Recover the inventory: read the newest snapshot, then replay every
+        journal record written after it. Returns one record per resource
+        ({"name", "type", "config", "state", "deleted"}) in creation order.
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        resources: Dict[str, Dict[str, Any]] = {}
+        snapshot_seq = 0
+        snapshots = self._files(_SNAPSHOT_PREFIX)
+        if snapshots:
+            snapshot_seq, path = snapshots[-1]
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for record in data["resources"]:
+                resources[record["name"]] = record
+
+        seq = snapshot_seq
+        tail = 0
+        for record in self._journal_records():
+            if record["seq"] <= snapshot_seq:
+                continue
+            seq = record["seq"]
+            tail += 1
+            if record["op"] == "create":
+                resources[record["name"]] = {key: record[key] for key in ("name", "type", "config", "state", "deleted")}
+            elif record["op"] == "update":
+                if record["name"] in resources:
+                    resources[record["name"]]["config"] = record["config"]
+            elif record["name"] in resources:
+                resources[record["name"]]["state"] = record["state"]
+                resources[record["name"]]["deleted"] = record["deleted"]
+
+        with self._lock:
+            self._seq = seq
+            self._since_snapshot = tail
+        return list(resources.values())
+
+    def record_create(self, name: str, resource_type: str, config: Dict[str, Any],
+                      state: str, deleted: bool) -> None:
+        self._append({"op": "create", "name": name, "type": resource_type, "config": config,
+                      "state": state, "deleted": deleted})
+
+    def record_update(self, name: str, config: Dict[str, Any]) -> None:
+        self._append({"op": "update", "name": name, "config": config})
+
+    def record_transition(self, name: str, state: str, deleted: bool) -> None:
+        op = "delete" if deleted else "transition"
+        self._append({"op": op, "name": name, "state": state, "deleted": deleted})
+
+    def write_snapshot(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Persist `records` (the full live inventory) as the state at the
+        current journal position, then start a new journal segment and drop
+        the segments and snapshots it supersedes. The caller must prevent new
+        records from being appended while the snapshot is taken.
+        """
+        with self._lock:
+            self._commit_locked()
+            seq = self._seq
+            path = os.path.join(self._directory, f"{_SNAPSHOT_PREFIX}{seq:012d}.json")
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write('{"seq": %d, "resources": [' % seq)
+                for i, record in enumerate(records):
+                    f.write(("," if i else "") + json.dumps(record, separators=(",", ":")))
+                f.write("]}")
+                f.flush()
+                if self._fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            for file_seq, old_path in self._files(_JOURNAL_PREFIX) + self._files(_SNAPSHOT_PREFIX):
+                if old_path != path and file_seq <= seq:
+                    os.remove(old_path)
+            self._since_snapshot = 0
+
+    def sync(self) -> None:
+        """Force all appended records to disk."""
+        with self._lock:
+            self._commit_locked()
+
+    def close(self) -> None:
+        """Commit pending records and stop the background committer."""
+        with self._lock:
+            self._commit_locked()
+            self._closed = True
+            self._commit_wakeup.notify_all()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        if self._committer is not None:
+            self._committer.join()
+            self._committer = None
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Inventory store is closed")
+            if self._journal is None:
+                os.makedirs(self._directory, exist_ok=True)
+                path = os.path.join(self._directory, f"{_JOURNAL_PREFIX}{self._seq + 1:012d}.jsonl")
+                self._journal = open(path, "a", encoding="utf-8")
+            self._seq += 1
+            self._since_snapshot += 1
+            self._journal.write(json.dumps({"seq": self._seq, **record}, separators=(",", ":")) + "\n")
+            self._pending += 1
+            if self._pending >= self._group_commit_size:
+                self._commit_locked()
+            elif self._committer is None:
+                self._committer = threading.Thread(target=self._run_committer,
+                                                   name="cloudconnect-journal", daemon=True)
+                self._committer.start()
+
+    def _run_committer(self) -> None:
+        with self._lock:
+            while not self._closed:
+                self._commit_wakeup.wait(self._group_commit_interval)
+                self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        if self._pending and self._journal is not None:
+            self._journal.flush()
+            if self._fsync:
+                os.fsync(self._journal.fileno())
+        self._pending = 0
+
+    def _journal_records(self) -> Iterator[Dict[str, Any]]:
+        for _, path in self._files(_JOURNAL_PREFIX):
+            good = 0
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line) if line.endswith("\n") else None
+                    except ValueError:
+                        record = None
+                    if record is None:
+                        # A torn write from a crash ends the segment
+                        self._truncate(path, good)
+                        break
+                    good += 1
+                    yield record
+
+    def _truncate(self, path: str, lines: int) -> None:
+        # Cut the torn tail off: if it was the segment's first record,
+        # appending resumes in this same file after recovery
+        with open(path, "r+b") as f:
+            for _ in range(lines):
+                f.readline()
+            f.truncate(f.tell())
+            if self._fsync:
+                os.fsync(f.fileno())
+
+    def _files(self, prefix: str) -> List:
+        if not os.path.isdir(self._directory):
+            return []
+        found = []
+        for entry in os.listdir(self._directory):
+            if entry.startswith(prefix) and not entry.endswith(".tmp"):
+                digits = entry[len(prefix):].split(".", 1)[0]
+                if digits.isdigit():
+                    found.append((int(digits), os.path.join(self._directory, entry)))
+        return sorted(found)
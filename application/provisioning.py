@@ -0,0 +1,53 @@
+import asyncio
+import random
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple, Union
+
+# Seconds as a constant, a (low, high) uniform range or a function returning seconds
+Latency = Union[float, Tuple[float, float], Callable[[], float]]
+
+
+class ProvisioningBackend(ABC):
+    """
+    Where the AsyncResourceManager's slow work happens. The manager awaits
+    the backend first and changes the resource's state only once the
+    backend has finished, so a failed, timed-out or cancelled call leaves
+    the resource as it was.
+    """
+
+    @abstractmethod
+    async def provision(self, resource) -> None:
+        """Bring a newly built resource into existence before it is stored."""
+
+    @abstractmethod
+    async def transition(self, resource, action: str) -> None:
+        """Carry out "start", "stop" or "delete" for an existing resource."""
+
+
+class SimulatedBackend(ProvisioningBackend):
+    """
+    Backend that only waits. `latency` applies to every resource type unless
+    `per_type` gives the type its own distribution. Pass `seed` for
+    repeatable uniform draws.
+    """
+
+    def __init__(self, latency: Latency = 0.0, per_type: Optional[Dict[str, Latency]] = None,
+                 seed: Optional[int] = None):
+        self._latency = latency
+        self._per_type = {name.lower(): value for name, value in (per_type or {}).items()}
+        self._random = random.Random(seed)
+
+    def latency_for(self, resource_type: str) -> float:
+        """Draw one delay in seconds for `resource_type`."""
+        latency = self._per_type.get(resource_type.lower(), self._latency)
+        if callable(latency):
+            return max(0.0, latency())
+        if isinstance(latency, tuple):
+            return self._random.uniform(*latency)
+        return latency
+
+    async def provision(self, resource) -> None:
+        await asyncio.sleep(self.latency_for(resource.resource_type))
+
+    async def transition(self, resource, action: str) -> None:
+        await asyncio.sleep(self.latency_for(resource.resource_type))
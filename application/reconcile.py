@@ -0,0 +1,238 @@
+import hashlib
+import json
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from application.resource_manager import ResourceManager
+from domain.config import FrozenConfig
+
+# Lifecycle states a manifest may ask for; without "state" it is left alone
+DESIRED_STATES = ("started", "stopped")
+
+# Plan actions in the order apply() runs them
+PLAN_ACTIONS = ("stop", "delete", "create", "update", "start")
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Read a manifest from a JSON file, or a YAML file (.yaml/.yml) when PyYAML is installed."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("Reading YAML manifests requires PyYAML (pip install pyyaml)")
+            return yaml.safe_load(f) or {}
+        return json.load(f)
+
+
+def fingerprint(resource_type: str, config: Mapping[str, Any]) -> str:
+    """Stable digest of a resource type and its normalized (defaults applied) config."""
+    data = json.dumps([resource_type.lower(), config], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Plan:
+    """
+    Steps that bring the inventory in line with a manifest. `steps` maps each
+    action of PLAN_ACTIONS to its entries: (name, type, config) for creates,
+    (name, type, config, old fingerprint, new fingerprint) for updates and
+    plain names otherwise. Entries that cannot be reconciled are listed in
+    `conflicts` with the reason.
+    """
+
+    def __init__(self):
+        self.steps: Dict[str, List[Any]] = {action: [] for action in PLAN_ACTIONS}
+        self.unchanged = 0
+        self.conflicts: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.steps.values())
+
+    def summary(self) -> Dict[str, int]:
+        counts = {action: len(entries) for action, entries in self.steps.items()}
+        counts.update(unchanged=self.unchanged, conflicts=len(self.conflicts))
+        return counts
+
+    def describe(self) -> List[str]:
+        """Human-readable lines for a dry run, in execution order."""
+        lines = []
+        for action in PLAN_ACTIONS:
+            for entry in self.steps[action]:
+                if action == "create":
+                    lines.append(f"+ create {entry[1]} '{entry[0]}' {dict(entry[2])}")
+                elif action == "update":
+                    lines.append(f"~ update {entry[1]} '{entry[0]}' {dict(entry[2])} ({entry[3][:8]} -> {entry[4][:8]})")
+                else:
+                    lines.append(f"{'-' if action == 'delete' else '>'} {action} '{entry}'")
+        lines += [f"! conflict '{name}': {reason}" for name, reason in self.conflicts.items()]
+        counts = self.summary()
+        lines.append(", ".join(f"{count} to {action}" for action, count in counts.items()
+                               if action in self.steps) + f", {counts['unchanged']} unchanged")
+        return lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        steps = {action: [entry if isinstance(entry, str) else entry[0] for entry in entries]
+                 for action, entries in self.steps.items()}
+        return {"summary": self.summary(), "steps": steps, "conflicts": dict(self.conflicts)}
+
+
+class Reconciler:
+    """
+    Makes the inventory match a declarative manifest, touching only what
+    differs. A manifest is {"resources": [...], "prune": bool}, where each
+    resource is {"type", "name", "config", "state"}; "resources" may also
+    map names to {"type", "config", "state"}.
+
+    Configs are compared by fingerprint after the creating factory's defaults
+    are applied. Normalized configs are interned like resource configs (value
+    types included), so an unchanged resource shares its config object with
+    the inventory and its fingerprint is a cache hit. Re-applying an
+    unchanged manifest therefore costs one lookup per resource and runs
+    nothing.
+
+    `creators` maps lower-case resource types to the manager whose factory
+    creates and updates them, as in the CLI; other types use `manager`.
+    """
+
+    def __init__(self, manager: ResourceManager, creators: Optional[Mapping[str, ResourceManager]] = None):
+        self._manager = manager
+        self._creators = {key.lower(): value for key, value in (creators or {}).items()}
+        self._fingerprints: Dict[Tuple[str, int], Tuple[Mapping[str, Any], str]] = {}
+
+    def plan(self, manifest: Mapping[str, Any], prune: Optional[bool] = None) -> Plan:
+        """
+        Compute the minimal plan for `manifest`. With `prune` (default: the
+        manifest's "prune" flag), live resources missing from the manifest
+        are stopped if needed and deleted.
+        """
+        desired = self._desired(manifest)
+        if prune is None:
+            prune = bool(manifest.get("prune"))
+        plan = Plan()
+        steps = plan.steps
+        inventory = self._manager.inventory
+        for name, (resource_type, config, state) in desired.items():
+            current = inventory.get(name)
+            if current is None:
+                steps["create"].append((name, resource_type, config))
+                if state == "started":
+                    steps["start"].append(name)
+                continue
+            if current.deleted:
+                plan.conflicts[name] = "was deleted; names of deleted resources cannot be reused"
+                continue
+            if current.resource_type.lower() != resource_type.lower():
+                plan.conflicts[name] = f"is a {current.resource_type}, not a {resource_type}"
+                continue
+            changed = False
+            current_config = current.config
+            # Equal configs are interned to one object, which skips the digests
+            if config is not current_config:
+                new = self._fingerprint(resource_type, config)
+                old = self._fingerprint(resource_type, current_config)
+                if new != old:
+                    steps["update"].append((name, current.resource_type, config, old, new))
+                    changed = True
+            status = current.status
+            if state == "started" and status != "started":
+                steps["start"].append(name)
+                changed = True
+            elif state == "stopped" and status == "started":
+                steps["stop"].append(name)
+                changed = True
+            if not changed:
+                plan.unchanged += 1
+        if prune:
+            for name in [name for name in inventory if name not in desired]:
+                current = inventory.get(name)
+                if current is None or current.deleted:
+                    continue
+                if current.status == "started":
+                    steps["stop"].append(name)
+                steps["delete"].append(name)
+        return plan
+
+    def apply(self, manifest: Mapping[str, Any], dry_run: bool = False, prune: Optional[bool] = None,
+              workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Plan `manifest` and, unless `dry_run`, execute the plan: stops,
+        deletes, creates, updates and starts, each phase in parallel through
+        the bulk operations. A resource whose stop or create failed is not
+        deleted or started. Returns the plan, per-phase results and totals.
+        """
+        plan = self.plan(manifest, prune)
+        report: Dict[str, Any] = {"dry_run": dry_run, "plan": plan.to_dict()}
+        if dry_run:
+            report["changes"] = plan.describe()
+            return report
+
+        started = time.perf_counter()
+        steps = plan.steps
+        results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        results["stop"] = self._manager.bulk_stop(steps["stop"], workers)["results"] if steps["stop"] else {}
+        failed_stops = {name for name, result in results["stop"].items() if not result["ok"]}
+        deletes = [name for name in steps["delete"] if name not in failed_stops]
+        results["delete"] = self._manager.bulk_delete(deletes, workers)["results"] if deletes else {}
+        results["create"] = {}
+        for manager, specs in self._by_creator(steps["create"]):
+            results["create"].update(manager.bulk_create(specs, workers)["results"])
+        results["update"] = {}
+        for manager, specs in self._by_creator(steps["update"]):
+            results["update"].update(manager.bulk_update([(name, config) for _, name, config in specs],
+                                                         workers)["results"])
+        failed_creates = {name for name, result in results["create"].items() if not result["ok"]}
+        starts = [name for name in steps["start"] if name not in failed_creates]
+        results["start"] = self._manager.bulk_start(starts, workers)["results"] if starts else {}
+        results["conflicts"] = {name: {"ok": False, "error": reason} for name, reason in plan.conflicts.items()}
+
+        outcomes = [result["ok"] for phase in results.values() for result in phase.values()]
+        succeeded = sum(outcomes)
+        report.update(total=len(outcomes), succeeded=succeeded, failed=len(outcomes) - succeeded,
+                      elapsed_seconds=time.perf_counter() - started, results=results)
+        return report
+
+    def _desired(self, manifest: Mapping[str, Any]) -> Dict[str, Tuple[str, Any, Optional[str]]]:
+        """Validate the manifest's entries into name -> (type, normalized config, state)."""
+        # Manifests are parsed JSON or YAML, so entries are checked against
+        # dict: isinstance() against the typing aliases is several times slower
+        resources = manifest.get("resources") or []
+        if isinstance(resources, dict):
+            resources = [dict(entry, name=name) for name, entry in resources.items()]
+        desired: Dict[str, Tuple[str, Any, Optional[str]]] = {}
+        apply_defaults = {}
+        intern = FrozenConfig.intern
+        for index, entry in enumerate(resources):
+            if type(entry) is not dict or not entry.get("name") or not entry.get("type"):
+                raise ValueError(f"Manifest resource #{index + 1} needs a name and a type")
+            name, resource_type, state = entry["name"], entry["type"], entry.get("state")
+            if name in desired:
+                raise ValueError(f"Resource '{name}' appears twice in the manifest")
+            if state is not None and state not in DESIRED_STATES:
+                raise ValueError(f"Resource '{name}': state must be one of {', '.join(DESIRED_STATES)}")
+            defaults = apply_defaults.get(resource_type)
+            if defaults is None:
+                defaults = apply_defaults[resource_type] = self._creator(resource_type).factory.apply_defaults
+            desired[name] = (resource_type, intern(defaults(resource_type, entry.get("config") or {})), state)
+        return desired
+
+    def _fingerprint(self, resource_type: str, config: Mapping[str, Any]) -> str:
+        # Keyed by identity, not equality: {"x": 1} == {"x": True}, but their
+        # digests differ. The entry holds the config, so its id stays unique.
+        key = (resource_type.lower(), id(config))
+        cached = self._fingerprints.get(key)
+        if cached is None or cached[0] is not config:
+            if len(self._fingerprints) >= 1 << 20:
+                self._fingerprints.clear()
+            cached = self._fingerprints[key] = (config, fingerprint(resource_type, config))
+        return cached[1]
+
+    def _creator(self, resource_type: str) -> ResourceManager:
+        return self._creators.get(resource_type.lower(), self._manager)
+
+    def _by_creator(self, entries: Iterable[Tuple[Any, ...]]) -> List[Tuple[ResourceManager, List[Tuple[str, str, Any]]]]:
+        """Group (name, type, config, ...) entries by the manager that handles their type."""
+        groups: Dict[int, Tuple[ResourceManager, List[Tuple[str, str, Any]]]] = {}
+        for entry in entries:
+            name, resource_type, config = entry[:3]
+            manager = self._creator(resource_type)
+            groups.setdefault(id(manager), (manager, []))[1].append((resource_type, name, config))
+        return list(groups.values())
@@ -1,113 +1,480 @@
-from typing import Dict, Any, Type, Optional
+import time
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Tuple, Type, Optional
+from application.groups import ResourceGroup
+from application.inventory import ResourceInventory
+from application.persistence import InventoryStore
 from domain.cloud_resource import CloudResource
-from core.decorator import LoggingDecorator
+from domain.state import state_for
 from core.factory import ResourceFactory
-from utils.logger_utils import now_ts, write_log
+from core.middleware import EventMiddleware, LoggingMiddleware, MetricsMiddleware, Middleware, Pipeline
+from utils.logger_utils import acting_as, current_actor, log_batch, log_event, now_ts, write_log
+from utils.metrics import METRICS, metrics_enabled
 
 class ResourceManager:
     """
     Facade class that orchestrates all operations.
     Follows Single Responsibility Principle - manages resource lifecycle.
     Follows Open/Closed Principle - extensible via factory pattern.
+
+    Safe to call from many threads. Operations on one resource are serialized
+    by its stripe of the inventory's NameLocks; a create reserves its name
+    first, so exactly one of several concurrent creates of a name succeeds.
+
+    Start, stop and delete run through a middleware Pipeline. Unless given
+    `middleware`, it is built from the flags: metrics (outermost, so its
+    latencies include logging), then log lines and events. Resources are
+    stored undecorated.
     """
 
-    def __init__(self, factory: Optional[Type[ResourceFactory]] = None, use_decorator: bool = True):
-        self._resources: Dict[str, CloudResource] = {}
+    def __init__(self, factory: Optional[Type[ResourceFactory]] = None, use_decorator: bool = True,
+                 inventory: Optional[ResourceInventory] = None, bulk_workers: int = 4,
+                 bulk_chunk_size: int = 256, store: Optional[InventoryStore] = None,
+                 use_metrics: Optional[bool] = None, middleware: Optional[Iterable[Middleware]] = None):
+        # Managers created with the same inventory share one set of resources;
+        # pass a ColumnarInventory for very large fleets
+        self._inventory = inventory if inventory is not None else ResourceInventory()
+        self._locks = self._inventory.locks
         self._factory_class = factory or ResourceFactory
-        self._use_decorator = use_decorator
+        # Metrics follow set_metrics_enabled() unless chosen explicitly
+        self._use_metrics = metrics_enabled() if use_metrics is None else use_metrics
+        if self._use_metrics:
+            METRICS.track(self._inventory)
+        if middleware is None:
+            middleware = [MetricsMiddleware()] if self._use_metrics else []
+            if use_decorator:
+                middleware += [LoggingMiddleware(), EventMiddleware()]
+        self._pipeline = Pipeline(middleware)
+        if bulk_workers < 1 or bulk_chunk_size < 1:
+            raise ValueError("bulk_workers and bulk_chunk_size must be positive")
+        self._bulk_workers = bulk_workers
+        self._bulk_chunk_size = bulk_chunk_size
+        if store is not None:
+            self.restore(store)
 
     def create_resource(self, resource_type: str, name: str, config: Dict[str, Any]) -> str:
         """
         Create a new resource using Factory pattern.
         Follows Dependency Inversion - depends on abstraction (factory).
         """
+        self.reserve(name)
+        started = time.perf_counter()
+        try:
+            # Use factory to create resource (Factory pattern); the name is
+            # reserved, so this runs without holding its lock
+            resource = self._factory_class.provision(resource_type, name, config)
+        except Exception as e:
+            raise self.abort_create(resource_type, name, e, started)
+        return self.commit_create(resource_type, name, resource, started)
+
+    def reserve(self, name: str) -> None:
+        """
+        Reserve `name` for a resource that is being built, so concurrent
+        creates of the same name fail. Must be followed by commit_create()
+        or abort_create(), which release it.
+        """
         self._validate_resource_creation(name)
-        
+
+    def commit_create(self, resource_type: str, name: str, resource: CloudResource,
+                      started: Optional[float] = None) -> str:
+        """
+        Store a resource built for the reserved `name`, log its creation and
+        release the name. `started` (a perf_counter() value) records the
+        create in the metrics.
+        """
         try:
-            # Use factory to create resource (Factory pattern)
-            resource = self._factory_class.create(resource_type, name, config)
-            
-            # Apply decorator if needed (Decorator pattern)
-            decorated_resource = LoggingDecorator(resource) if self._use_decorator else resource
-            
-            # Store the resource
-            self._resources[name] = decorated_resource
-            
-            # Log creation
-            write_log(name, f"[{now_ts()}] {resource_type} '{name}' created with config {config}")
-            
-            return f"{resource_type} '{name}' created successfully."
-            
+            message = self._store_created(resource_type, name, resource)
         except Exception as e:
-            error_msg = f"Failed to create {resource_type} '{name}': {str(e)}"
-            write_log(name, f"[{now_ts()}] {error_msg}")
-            raise RuntimeError(error_msg)
+            raise self.abort_create(resource_type, name, e, started)
+        self._locks.release(name)
+        if self._use_metrics and started is not None:
+            METRICS.observe(resource_type, "create", time.perf_counter() - started)
+        return message
 
-    def start_resource(self, name: str) -> str:
-        """Start a resource with proper error handling."""
-        resource = self._get_resource(name)
+    def abort_create(self, resource_type: str, name: str, error: Exception,
+                     started: Optional[float] = None) -> RuntimeError:
+        """Log a failed create, release the reserved `name` and return the error to raise."""
+        failure = self._create_failed(resource_type, name, error)
+        self._locks.release(name)
+        if self._use_metrics and started is not None:
+            METRICS.observe(resource_type, "create", time.perf_counter() - started, ok=False)
+        return failure
+
+    def update_resource(self, name: str, config: Dict[str, Any]) -> str:
+        """
+        Replace the config of a resource, keeping its type and state. The new
+        config gets this manager's factory defaults and is validated first.
+        Only the local inventory changes; providers are not contacted.
+        """
+        resource_type = None
         try:
-            return resource.start()
+            with self._locks.hold(name):
+                current = self._get_resource(name)
+                resource_type = current.resource_type
+                if current.deleted:
+                    raise RuntimeError("Cannot update deleted resource.")
+                resource = self._factory_class.create(resource_type, name, config)
+                if resource.status != current.status:
+                    resource.set_state(current.state)
+                self._inventory.replace(name, resource)
+                write_log(name, f"[{now_ts()}] {resource_type} '{name}' updated with config {resource.config}")
+                log_event(name, resource_type, "updated", f"updated with config {resource.config}")
         except Exception as e:
-            raise RuntimeError(f"Failed to start '{name}': {str(e)}")
+            raise RuntimeError(f"Failed to update '{name}': {str(e)}")
+        return f"{resource_type} '{name}' updated successfully."
+
+    def start_resource(self, name: str) -> str:
+        """Start a resource with proper error handling."""
+        # Looked up under the lock, as update_resource() may replace the object
+        with self._locks.hold(name):
+            resource = self._get_resource(name)
+            try:
+                return self._pipeline.run(resource, "start")
+            except Exception as e:
+                raise RuntimeError(f"Failed to start '{name}': {str(e)}")
 
     def stop_resource(self, name: str) -> str:
         """Stop a resource with proper error handling."""
-        resource = self._get_resource(name)
-        try:
-            return resource.stop()
-        except Exception as e:
-            raise RuntimeError(f"Failed to stop '{name}': {str(e)}")
+        with self._locks.hold(name):
+            resource = self._get_resource(name)
+            try:
+                return self._pipeline.run(resource, "stop")
+            except Exception as e:
+                raise RuntimeError(f"Failed to stop '{name}': {str(e)}")
 
     def delete_resource(self, name: str) -> str:
         """Delete a resource with proper error handling."""
+        with self._locks.hold(name):
+            resource = self._get_resource(name)
+            try:
+                return self._pipeline.run(resource, "delete")
+            except Exception as e:
+                raise RuntimeError(f"Failed to delete '{name}': {str(e)}")
+
+    def cache(self, name: str):
+        """
+        Data plane (a CacheEngine) of the running CacheDB `name`. Only a
+        ResourceInventory keeps resource objects, so caches held in a
+        ColumnarInventory have none.
+        """
         resource = self._get_resource(name)
-        try:
-            return resource.delete()
-        except Exception as e:
-            raise RuntimeError(f"Failed to delete '{name}': {str(e)}")
+        if resource.resource_type != "CacheDB":
+            raise RuntimeError(f"Resource '{name}' is not a CacheDB")
+        if not hasattr(type(resource), "data"):
+            raise RuntimeError(f"CacheDB '{name}' has no data plane in this inventory")
+        return resource.data
+
+    def restore(self, store: InventoryStore) -> int:
+        """
+        Rebuild resources recorded in `store` (latest snapshot plus journal
+        tail) and journal every later change to it. Resources are recreated
+        through ResourceFactory and put back into their exact recorded state.
+        Returns the number of resources restored.
+        """
+        records = store.load()
+        for record in records:
+            name = record["name"]
+            resource = ResourceFactory.create(record["type"], name, record["config"])
+            if record["state"] != resource.status:
+                resource.set_state(state_for(record["state"], resource))
+            resource.deleted = record["deleted"]
+            self._inventory.add(name, resource, journal=False)
+        self._inventory.attach_store(store)
+        if store.snapshot_due:
+            self._inventory.checkpoint()
+        return len(records)
+
+    def close(self) -> None:
+        """Commit and close the inventory's durable store, if any."""
+        if self._inventory.store is not None:
+            self._inventory.store.close()
+
+    @property
+    def inventory(self) -> ResourceInventory:
+        """Resource store backing this manager."""
+        return self._inventory
+
+    @property
+    def factory(self) -> Type[ResourceFactory]:
+        """Factory whose defaults and limits this manager's creates and updates use."""
+        return self._factory_class
+
+    @property
+    def pipeline(self) -> Pipeline:
+        """Middleware applied to start, stop and delete; add() and remove() take effect immediately."""
+        return self._pipeline
 
     def list_resources(self) -> Dict[str, Dict[str, Any]]:
-        """List all resources with their metadata."""
-        return {name: resource.to_dict() for name, resource in self._resources.items()}
+        """
+        List all resources with their metadata (cached; treat as read-only).
+        Taken while no operation is running, so it is a consistent snapshot.
+        """
+        with self._locks.hold_all():
+            return self._inventory.snapshots()
 
     def get_resource_count(self) -> Dict[str, int]:
-        """Get count of resources by type and status."""
-        counts = {
-            "total": len(self._resources), 
-            "active": 0,
-            "deleted": 0,
-            "by_type": {}, 
-            "by_status": {}
+        """Get count of resources by type and status (consistent, like list_resources)."""
+        with self._locks.hold_all():
+            return self._inventory.counts()
+
+    def aggregate(self, column: str, by: str = "type", func: str = "sum") -> Dict[Any, float]:
+        """Group a numeric config value (e.g. capacity_mb) by type, status or a config key."""
+        return self._inventory.aggregate(column, by=by, func=func)
+
+    def iter_query(self, type: Optional[str] = None, status: Optional[str] = None,
+                   region: Optional[str] = None, runtime: Optional[str] = None,
+                   eviction_policy: Optional[str] = None, deleted: Optional[bool] = None,
+                   cursor: Optional[int] = None) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Lazily yield (cursor, name, metadata) for resources matching all given
+        filters, in creation order. Filters left as None are not applied.
+        Passing a yielded cursor back resumes right after that resource.
+        """
+        filters = {"type": type, "status": status, "region": region, "runtime": runtime,
+                   "eviction_policy": eviction_policy, "deleted": deleted}
+        filters = {field: value for field, value in filters.items() if value is not None}
+        for seq in self._inventory.iter_seqs(filters, after=cursor):
+            name = self._inventory.name_at(seq)
+            with self._locks.hold(name):
+                meta = self._inventory.snapshot(name)
+            yield seq, name, meta
+
+    def query(self, type: Optional[str] = None, status: Optional[str] = None,
+              region: Optional[str] = None, runtime: Optional[str] = None,
+              eviction_policy: Optional[str] = None, deleted: Optional[bool] = None,
+              limit: Optional[int] = None, cursor: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Return one page of matching resources using the secondary indexes.
+        The result holds "resources" (name to metadata) and "next_cursor",
+        which is None once the last match has been returned.
+        """
+        if limit is not None and limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        results = self.iter_query(type=type, status=status, region=region, runtime=runtime,
+                                  eviction_policy=eviction_policy, deleted=deleted, cursor=cursor)
+        page: Dict[str, Dict[str, Any]] = {}
+        next_cursor = None
+        for seq, name, meta in results:
+            if limit is not None and len(page) == limit:
+                break
+            page[name] = meta
+            next_cursor = seq
+        else:
+            next_cursor = None
+        return {"resources": page, "next_cursor": next_cursor}
+
+    def bulk_create(self, specs: Iterable[Any], workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Create many resources. Each spec is a (resource_type, name, config)
+        tuple or a dict with "type", "name" and "config" keys.
+        """
+        items = []
+        for spec in specs:
+            if isinstance(spec, dict):
+                spec = (spec.get("type"), spec.get("name"), spec.get("config") or {})
+            items.append((spec[1], spec))
+        return self._run_bulk(lambda spec: self.create_resource(*spec), items, workers)
+
+    def bulk_update(self, specs: Iterable[Tuple[str, Dict[str, Any]]],
+                    workers: Optional[int] = None) -> Dict[str, Any]:
+        """Update many resources from (name, config) pairs."""
+        return self._run_bulk(lambda spec: self.update_resource(*spec), [(spec[0], spec) for spec in specs], workers)
+
+    def validate_configs(self, specs: Iterable[Any]) -> Dict[str, List[str]]:
+        """
+        Check many create specs (same shapes as bulk_create) without creating
+        anything. Configs are validated per type in one pass through the
+        compiled schemas; returns every error per resource name.
+        """
+        by_type: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for spec in specs:
+            if isinstance(spec, dict):
+                spec = (spec.get("type"), spec.get("name"), spec.get("config") or {})
+            by_type.setdefault(spec[0], []).append((spec[1], spec[2]))
+        errors: Dict[str, List[str]] = {}
+        for resource_type, items in by_type.items():
+            try:
+                results = self._factory_class.validate_many(resource_type, (config for _, config in items))
+            except ValueError as e:
+                results = [[str(e)]] * len(items)
+            for (name, _), item_errors in zip(items, results):
+                errors[name] = item_errors
+        return errors
+
+    def bulk_start(self, names: Any, workers: Optional[int] = None) -> Dict[str, Any]:
+        """Start many resources; see `_names_from` for accepted selectors."""
+        return self._run_bulk(self.start_resource, self._names_from(names), workers)
+
+    def bulk_stop(self, names: Any, workers: Optional[int] = None) -> Dict[str, Any]:
+        """Stop many resources; see `_names_from` for accepted selectors."""
+        return self._run_bulk(self.stop_resource, self._names_from(names), workers)
+
+    def bulk_delete(self, names: Any, workers: Optional[int] = None) -> Dict[str, Any]:
+        """Delete many resources; see `_names_from` for accepted selectors."""
+        return self._run_bulk(self.delete_resource, self._names_from(names), workers)
+
+    def start_group(self, group: ResourceGroup, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Start a group wave by wave, dependencies first; each wave's members
+        run concurrently. Members already started count as succeeded, and
+        members that depend on a failed one are skipped.
+        """
+        return self._run_group(group, self.start_resource, ("started",), False, workers)
+
+    def stop_group(self, group: ResourceGroup, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Stop a group in reverse dependency order. Members that are not running
+        count as succeeded; a member is skipped if one of its dependents
+        failed to stop.
+        """
+        return self._run_group(group, self.stop_resource, ("created", "stopped", "deleted"), True, workers)
+
+    def delete_group(self, group: ResourceGroup, workers: Optional[int] = None) -> Dict[str, Any]:
+        """Delete a stopped group in reverse dependency order, skipping as stop_group does."""
+        return self._run_group(group, self.delete_resource, ("deleted",), True, workers)
+
+    def _run_group(self, group: ResourceGroup, operation: Callable[[str], str], settled: Tuple[str, ...],
+                   reverse: bool, workers: Optional[int]) -> Dict[str, Any]:
+        """
+        Run `operation` over the group's waves (last wave first if `reverse`)
+        with _run_bulk. A member whose blockers (dependencies, or dependents
+        if `reverse`) did not succeed is skipped with the original error.
+        Returns the bulk report plus "waves" and "skipped" counts.
+        """
+        waves = group.waves()
+        if reverse:
+            waves.reverse()
+            blockers: Dict[str, List[str]] = {member: [] for member in group.members}
+            for member in group.members:
+                for dependency in group.dependencies_of(member):
+                    blockers[dependency].append(member)
+        else:
+            blockers = {member: group.dependencies_of(member) for member in group.members}
+
+        def settle(name):
+            # The operation re-enters the stripe, so the check cannot go stale
+            with self._locks.hold(name):
+                status = self._get_resource(name).status
+                if status in settled:
+                    return f"'{name}' is {status}, nothing to do."
+                return operation(name)
+
+        started = time.perf_counter()
+        results: Dict[str, Dict[str, Any]] = {}
+        for wave in waves:
+            items = []
+            for name in wave:
+                blocker = next((other for other in blockers[name] if not results[other]["ok"]), None)
+                if blocker is None:
+                    items.append((name, name))
+                elif results[blocker].get("skipped"):
+                    results[name] = results[blocker]
+                else:
+                    results[name] = {"ok": False, "skipped": True,
+                                     "error": f"Skipped: '{blocker}' failed: {results[blocker].get('error')}"}
+            if items:
+                results.update(self._run_bulk(settle, items, workers)["results"])
+        succeeded = sum(1 for result in results.values() if result["ok"])
+        return {
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "skipped": sum(1 for result in results.values() if result.get("skipped")),
+            "waves": len(waves),
+            "elapsed_seconds": time.perf_counter() - started,
+            "results": results,
         }
-        
-        for resource in self._resources.values():
-            resource_data = resource.to_dict()
-            resource_type = resource_data["type"]
-            status = resource_data["status"]
-            is_deleted = resource_data.get("deleted", False)
-            
-            # Count by type
-            counts["by_type"][resource_type] = counts["by_type"].get(resource_type, 0) + 1
-            
-            # Count by status
-            counts["by_status"][status] = counts["by_status"].get(status, 0) + 1
+
+    def _run_bulk(self, operation: Callable[[Any], str], items: List[Tuple[str, Any]],
+                  workers: Optional[int]) -> Dict[str, Any]:
+        """
+        Run `operation` over (name, argument) items on a bounded thread pool.
+        Items are processed in chunks; each chunk batches its log writes.
+        Returns a report with a per-item result keyed by resource name.
+        """
+        workers = workers or self._bulk_workers
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        size = self._bulk_chunk_size
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+
+        # Worker threads do not inherit context variables, so pass the actor on
+        actor = current_actor()
+
+        def run_chunk(chunk):
+            results = []
+            with acting_as(actor), log_batch():
+                for name, argument in chunk:
+                    try:
+                        results.append((name, {"ok": True, "message": operation(argument)}))
+                    except Exception as e:
+                        results.append((name, {"ok": False, "error": str(e)}))
+            return results
+
+        started = time.perf_counter()
+        if workers == 1 or len(chunks) <= 1:
+            chunk_results = [run_chunk(chunk) for chunk in chunks]
+        else:
+            # Imported here: concurrent.futures pulls in logging, which short
+            # CLI and batch runs that never bulk-operate should not pay for
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cloudconnect-bulk") as pool:
+                chunk_results = list(pool.map(run_chunk, chunks))
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for chunk in chunk_results:
+            results.update(chunk)
+        succeeded = sum(1 for result in results.values() if result["ok"])
+        return {
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "elapsed_seconds": time.perf_counter() - started,
+            "results": results,
+        }
+
+    @staticmethod
+    def _names_from(selector: Any) -> List[Tuple[str, str]]:
+        """
+        Normalize a bulk selector into unique (name, name) items. Accepts a
+        name, an iterable of names, a query() page, a list_resources() mapping
+        or the (cursor, name, metadata) tuples yielded by iter_query().
+        """
+        if isinstance(selector, str):
+            selector = [selector]
+        elif isinstance(selector, dict):
+            selector = selector["resources"] if "resources" in selector and "next_cursor" in selector else selector
+        names = (item[1] if isinstance(item, tuple) else item for item in selector)
+        return [(name, name) for name in dict.fromkeys(names)]
+
+    def _validate_resource_creation(self, name: str) -> None:
+        """Validate resource creation prerequisites and reserve the name."""
+        with self._locks.hold(name):
+            if name in self._inventory or not self._locks.reserve(name):
+                raise RuntimeError(f"Resource '{name}' already exists")
+
+    def _store_created(self, resource_type: str, name: str, resource: CloudResource) -> str:
+        """Add a resource built for a reserved name and log its creation."""
+        with self._locks.hold(name):
+            # Store the resource
+            self._inventory.add(name, resource)
             
-            # Count active vs deleted
-            if is_deleted:
-                counts["deleted"] += 1
-            else:
-                counts["active"] += 1
+            # Log creation
+            write_log(name, f"[{now_ts()}] {resource_type} '{name}' created with config {resource.config}")
+            log_event(name, resource_type, "created", f"created with config {resource.config}")
         
-        return counts
+        return f"{resource_type} '{name}' created successfully."
 
-    def _validate_resource_creation(self, name: str) -> None:
-        """Validate resource creation prerequisites."""
-        if name in self._resources:
-            raise RuntimeError(f"Resource '{name}' already exists")
+    @staticmethod
+    def _create_failed(resource_type: str, name: str, error: Exception) -> RuntimeError:
+        """Log a failed create and return the error to raise."""
+        error_msg = f"Failed to create {resource_type} '{name}': {str(error)}"
+        write_log(name, f"[{now_ts()}] {error_msg}")
+        log_event(name, resource_type, "create_failed", str(error))
+        return RuntimeError(error_msg)
 
     def _get_resource(self, name: str) -> CloudResource:
         """Get resource by name with validation."""
-        if name not in self._resources:
+        resource = self._inventory.get(name)
+        if resource is None:
             raise RuntimeError(f"Resource '{name}' not found")
-        return self._resources[name]
+        return resource
@@ -0,0 +1,62 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+
+class SessionTable:
+    """
+    In-memory table of issued session tokens.
+    Tokens expire `ttl_seconds` after they were issued. The table holds at
+    most `max_sessions` tokens; when full, the least recently used one is
+    evicted. Validation is a single dictionary lookup.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_sessions: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        if ttl_seconds <= 0 or max_sessions < 1:
+            raise ValueError("ttl_seconds and max_sessions must be positive")
+        self._ttl = ttl_seconds
+        self._max_sessions = max_sessions
+        self._clock = clock
+        self._sessions: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def issue(self, username: str) -> str:
+        """Create a new token for `username`."""
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._sessions[token] = (username, self._clock() + self._ttl)
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        return token
+
+    def validate(self, token: str) -> Optional[str]:
+        """Return the username for a live token, or None if unknown or expired."""
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= self._clock():
+                del self._sessions[token]
+                return None
+            self._sessions.move_to_end(token)
+            return entry[0]
+
+    def revoke(self, token: str) -> bool:
+        """Invalidate a token; returns whether it existed."""
+        with self._lock:
+            return self._sessions.pop(token, None) is not None
+
+    def purge_expired(self) -> int:
+        """Drop every expired token; returns how many were removed."""
+        now = self._clock()
+        with self._lock:
+            expired = [token for token, (_, expires) in self._sessions.items() if expires <= now]
+            for token in expired:
+                del self._sessions[token]
+        return len(expired)
@@ -1,48 +1,55 @@
 import os
-import json
-from hashlib import sha256
+from typing import Optional
+from application.passwords import DEFAULT_ITERATIONS, hash_password, needs_rehash, verify_password
+from application.session import SessionTable
+from application.user_store import JsonUserStore, SqliteUserStore, UserStore
+from utils.logger_utils import set_actor
 
 USER_DB_PATH = os.path.join("cloudconnect", "data", "users.json")
-os.makedirs(os.path.dirname(USER_DB_PATH), exist_ok=True)
+USER_SQLITE_PATH = os.path.join("cloudconnect", "data", "users.db")
 
-class UserManager:
-    """Handles user signup and login functionality."""
-    
-    def __init__(self):
-        self._load_users()
-        self._current_user = None
+def default_user_store(backend: str = "sqlite") -> UserStore:
+    """
+    Build a user store. "sqlite" (the default) imports users.json once on
+    first use; "json" keeps reading and writing users.json directly.
+    """
+    if backend == "sqlite":
+        return SqliteUserStore(USER_SQLITE_PATH, migrate_from=USER_DB_PATH)
+    if backend == "json":
+        return JsonUserStore(USER_DB_PATH)
+    raise ValueError(f"Unknown user store backend: {backend}")
 
-    def _load_users(self):
-        """Load users from the database file."""
-        if os.path.exists(USER_DB_PATH):
-            with open(USER_DB_PATH, "r", encoding="utf-8") as f:
-                self._users = json.load(f)
-        else:
-            self._users = {}
+class UserManager:
+    """
+    Handles user signup and login functionality.
+    Besides the single interactive login, callers can open any number of
+    session tokens; the salted password hash is checked once per session and
+    each later operation only validates the token.
+    """
 
-    def _save_users(self):
-        """Save users to the database file."""
-        with open(USER_DB_PATH, "w", encoding="utf-8") as f:
-            json.dump(self._users, f, indent=4)
+    def __init__(self, store: Optional[UserStore] = None, hash_iterations: int = DEFAULT_ITERATIONS,
+                 sessions: Optional[SessionTable] = None):
+        self._store = store or default_user_store()
+        self._hash_iterations = hash_iterations
+        self._sessions = sessions or SessionTable()
+        self._current_user = None
 
     def signup(self, username, name, email, password):
         """Register a new user."""
-        if username in self._users:
+        if username in self._store:
             raise ValueError("User already exists. Please login.")
-        self._users[username] = {
+        self._store.add(username, {
             "name": name,
             "email": email,
-            "password": sha256(password.encode()).hexdigest()
-        }
-        self._save_users()
+            "password": hash_password(password, self._hash_iterations)
+        })
         return f"User '{username}' signed up successfully."
 
     def login(self, username, password):
         """Authenticate an existing user."""
-        user = self._users.get(username)
-        if not user or user["password"] != sha256(password.encode()).hexdigest():
-            raise ValueError("Invalid username or password.")
+        self._authenticate(username, password)
         self._current_user = username
+        set_actor(username)
         return f"User '{username}' logged in successfully."
 
     def logout(self):
@@ -50,8 +57,39 @@ class UserManager:
         if not self._current_user:
             raise ValueError("No user is currently logged in.")
         self._current_user = None
+        set_actor(None)
         return "Logged out successfully."
 
     def get_current_user(self):
         """Get the currently logged-in user."""
         return self._current_user
+
+    def open_session(self, username, password):
+        """Authenticate once and return a session token for later operations."""
+        self._authenticate(username, password)
+        return self._sessions.issue(username)
+
+    def validate_session(self, token):
+        """Return the username owning a live session token."""
+        username = self._sessions.validate(token)
+        if username is None:
+            raise ValueError("Invalid or expired session.")
+        return username
+
+    def close_session(self, token):
+        """Invalidate a session token."""
+        if not self._sessions.revoke(token):
+            raise ValueError("Invalid or expired session.")
+        return "Session closed."
+
+    def close(self):
+        """Close the underlying user store."""
+        self._store.close()
+
+    def _authenticate(self, username, password):
+        user = self._store.get(username)
+        if not user or not verify_password(password, user["password"]):
+            raise ValueError("Invalid username or password.")
+        # Upgrade legacy sha256 hashes and hashes made with a different cost
+        if needs_rehash(user["password"], self._hash_iterations):
+            self._store.update_password(username, hash_password(password, self._hash_iterations))
@@ -0,0 +1,167 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+USER_EXISTS_MESSAGE = "User already exists. Please login."
+
+
+class UserStore(ABC):
+    """Storage backend for user records (name, email, password hash)."""
+
+    @abstractmethod
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        """Return the record for `username`, or None."""
+        pass
+
+    @abstractmethod
+    def add(self, username: str, record: Dict[str, Any]) -> None:
+        """Insert a new user; raises ValueError if the username is taken."""
+        pass
+
+    @abstractmethod
+    def update_password(self, username: str, password_hash: str) -> None:
+        """Replace the stored password hash of an existing user."""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored users."""
+        pass
+
+    def __contains__(self, username: str) -> bool:
+        return self.get(username) is not None
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        pass
+
+
+class JsonUserStore(UserStore):
+    """
+    The original users.json format: one object keyed by username.
+    The file is parsed on first access and rewritten on every change,
+    via a temporary file so a crash never leaves it half-written.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._users: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        return self._load().get(username)
+
+    def add(self, username, record):
+        with self._lock:
+            users = self._load()
+            if username in users:
+                raise ValueError(USER_EXISTS_MESSAGE)
+            users[username] = dict(record)
+            self._save()
+
+    def update_password(self, username, password_hash):
+        with self._lock:
+            self._load()[username]["password"] = password_hash
+            self._save()
+
+    def count(self):
+        return len(self._load())
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._users is None:
+            if os.path.exists(self._path):
+                with open(self._path, "r", encoding="utf-8") as f:
+                    self._users = json.load(f)
+            else:
+                self._users = {}
+        return self._users
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._users, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+
+
+class SqliteUserStore(UserStore):
+    """
+    SQLite-backed user store. Usernames are the primary key, so lookups
+    and duplicate checks use the index, and each signup is one transaction.
+    If `migrate_from` names a users.json file, its users are imported once
+    the first time the database is opened.
+    """
+
+    def __init__(self, path: str, migrate_from: Optional[str] = None):
+        self._path = path
+        self._migrate_from = migrate_from
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT name, email, password FROM users WHERE username = ?", (username,)).fetchone()
+        if row is None:
+            return None
+        return {"name": row[0], "email": row[1], "password": row[2]}
+
+    def add(self, username, record):
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("INSERT INTO users (username, name, email, password) VALUES (?, ?, ?, ?)",
+                                 (username, record["name"], record["email"], record["password"]))
+            except sqlite3.IntegrityError:
+                raise ValueError(USER_EXISTS_MESSAGE)
+
+    def update_password(self, username, password_hash):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("UPDATE users SET password = ? WHERE username = ?", (password_hash, username))
+
+    def count(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS users ("
+                             "username TEXT PRIMARY KEY, name TEXT, email TEXT, password TEXT NOT NULL)")
+                conn.execute("CREATE TABLE IF NOT EXISTS migrations (source TEXT PRIMARY KEY)")
+            self._conn = conn
+            if self._migrate_from:
+                self._migrate(self._migrate_from)
+        return self._conn
+
+    def _migrate(self, json_path: str) -> None:
+        """Import users from a legacy users.json once; the file is left in place."""
+        source = os.path.abspath(json_path)
+        conn = self._conn
+        if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+            return
+        users = JsonUserStore(json_path)._load() if os.path.exists(json_path) else {}
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (username, name, email, password) VALUES (?, ?, ?, ?)",
+                ((username, user.get("name"), user.get("email"), user["password"])
+                 for username, user in users.items()))
+            conn.execute("INSERT INTO migrations (source) VALUES (?)", (source,))
@@ -0,0 +1 @@
+# Benchmarks for CloudConnect; run modules with `python -m benchmarks.<name>`
@@ -0,0 +1,42 @@
+"""Measure bulk lifecycle throughput at different worker counts."""
+import argparse
+import os
+import tempfile
+from application.resource_manager import ResourceManager
+from core.factory import AppResourceFactory
+from utils.logger_utils import close_logs
+
+
+def run(count: int, workers: int) -> dict:
+    manager = ResourceManager(factory=AppResourceFactory, bulk_workers=workers)
+    specs = [("AppService", f"app-{i}", {"runtime": "python", "region": "EastUS"}) for i in range(count)]
+    names = [name for _, name, _ in specs]
+    timings = {}
+    for label, call in (("create", lambda: manager.bulk_create(specs)),
+                        ("start", lambda: manager.bulk_start(names)),
+                        ("stop", lambda: manager.bulk_stop(names)),
+                        ("delete", lambda: manager.bulk_delete(names))):
+        report = call()
+        if report["failed"]:
+            raise RuntimeError(f"{label}: {report['failed']} operations failed")
+        timings[label] = count / report["elapsed_seconds"]
+    close_logs()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    import resources.app_service  # noqa: F401  (registers AppService)
+    os.chdir(tempfile.mkdtemp(prefix="cloudconnect-bench-"))
+    print(f"{'workers':>8} {'create/s':>12} {'start/s':>12} {'stop/s':>12} {'delete/s':>12}")
+    for workers in args.workers:
+        t = run(args.count, workers)
+        print(f"{workers:>8} {t['create']:>12.0f} {t['start']:>12.0f} {t['stop']:>12.0f} {t['delete']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Stress the ResourceManager from many threads and measure lock-striping scalability."""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from application.inventory import ResourceInventory
+from application.resource_manager import ResourceManager
+from core.factory import AppResourceFactory
+from domain.lifecycle import LIFECYCLE
+from utils.logger_utils import close_logs, set_console_echo
+
+CONFIG = {"runtime": "python", "region": "EastUS"}
+
+
+def _run_threads(threads, target):
+    barrier = threading.Barrier(threads)
+
+    def body(index):
+        barrier.wait()
+        target(index)
+
+    workers = [threading.Thread(target=body, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def check_create_race(threads, names):
+    """Every thread creates every name; exactly one create per name may win."""
+    manager = ResourceManager(factory=AppResourceFactory)
+    wins = [0] * threads
+    unexpected = []
+
+    def create_all(index):
+        order = [f"race-{i}" for i in range(names)]
+        random.Random(index).shuffle(order)
+        for name in order:
+            try:
+                manager.create_resource("AppService", name, CONFIG)
+                wins[index] += 1
+            except RuntimeError as e:
+                if "already exists" not in str(e):
+                    unexpected.append(str(e))
+
+    _run_threads(threads, create_all)
+    assert not unexpected, unexpected[:3]
+    assert sum(wins) == names == len(manager.inventory), (sum(wins), len(manager.inventory))
+    print(f"create race: {threads} threads x {names} names -> {sum(wins)} created, no duplicates")
+
+
+def check_lifecycle_race(threads, names, operations):
+    """Threads toggle a small set of shared resources; no transition may be lost."""
+    manager = ResourceManager(factory=AppResourceFactory)
+    hot = [f"hot-{i}" for i in range(names)]
+    for name in hot:
+        manager.create_resource("AppService", name, CONFIG)
+    tallies = [{name: [0, 0] for name in hot} for _ in range(threads)]
+
+    def toggle(index):
+        rng = random.Random(index)
+        tally = tallies[index]
+        for _ in range(operations):
+            name = rng.choice(hot)
+            action = rng.randrange(2)
+            try:
+                (manager.start_resource if action == 0 else manager.stop_resource)(name)
+                tally[name][action] += 1
+            except RuntimeError:
+                pass
+
+    _run_threads(threads, toggle)
+    resources = manager.list_resources()
+    for name in hot:
+        starts = sum(tally[name][0] for tally in tallies)
+        stops = sum(tally[name][1] for tally in tallies)
+        # Successful starts and stops of one resource must strictly alternate
+        expected = "created" if starts == 0 else ("started" if starts == stops + 1 else "stopped")
+        assert starts - stops in (0, 1), (name, starts, stops)
+        assert resources[name]["status"] == expected, (name, resources[name]["status"], expected)
+    recount = {}
+    for meta in resources.values():
+        recount[meta["status"]] = recount.get(meta["status"], 0) + 1
+    assert manager.get_resource_count()["by_status"] == recount
+    total = sum(sum(sum(pair) for pair in tally.values()) for tally in tallies)
+    print(f"lifecycle race: {threads} threads x {operations} ops on {names} resources -> "
+          f"{total} transitions applied, none lost")
+
+
+def measure_scaling(thread_counts, per_thread, stripes):
+    """Start and stop disjoint resources from each thread; returns ops/s per thread count."""
+    results = {}
+    for threads in thread_counts:
+        manager = ResourceManager(factory=AppResourceFactory, inventory=ResourceInventory(lock_stripes=stripes))
+        names = [[f"s{t}-{i}" for i in range(per_thread)] for t in range(threads)]
+        for group in names:
+            for name in group:
+                manager.create_resource("AppService", name, CONFIG)
+
+        def work(index):
+            for name in names[index]:
+                manager.start_resource(name)
+                manager.stop_resource(name)
+
+        started = time.perf_counter()
+        _run_threads(threads, work)
+        results[threads] = threads * per_thread * 2 / (time.perf_counter() - started)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--names", type=int, default=2000, help="names raced for in the create test")
+    parser.add_argument("--operations", type=int, default=20000, help="lifecycle operations per thread")
+    parser.add_argument("--scaling", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--per-thread", type=int, default=100, help="resources per thread when scaling")
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="simulated provider latency per transition when scaling")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="cloudconnect-bench-"))
+    set_console_echo(False)
+    check_create_race(args.threads, args.names)
+    check_lifecycle_race(args.threads, 8, args.operations)
+
+    # Pure-Python transitions are serialized by the GIL, so scaling is shown
+    # with a transition hook that sleeps like a remote provider call would
+    latency = args.latency_ms / 1000
+
+    def provider_call(*_):
+        time.sleep(latency)
+
+    LIFECYCLE.add_pre_hook(provider_call)
+    try:
+        striped = measure_scaling(args.scaling, args.per_thread, stripes=64)
+        single = measure_scaling(args.scaling, args.per_thread, stripes=1)
+    finally:
+        LIFECYCLE.remove_hook(provider_call)
+    close_logs()
+
+    base = args.scaling[0]
+    print(f"\n{'threads':>8} {'striped ops/s':>14} {'speedup':>8} {'one lock ops/s':>15} {'speedup':>8}")
+    for threads in args.scaling:
+        print(f"{threads:>8} {striped[threads]:>14.0f} {striped[threads] / striped[base]:>8.1f} "
+              f"{single[threads]:>15.0f} {single[threads] / single[base]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measure config memory and listing latency with interned, frozen configs."""
+import argparse
+import gc
+import time
+import tracemalloc
+from application.resource_manager import ResourceManager
+from core.factory import AppResourceFactory
+from domain.config import FrozenConfig
+
+RUNTIMES = ("python", "nodejs", "dotnet")
+REGIONS = ("EastUS", "WestEurope", "CentralIndia")
+
+
+def _fleet(count: int, intern: bool) -> ResourceManager:
+    manager = ResourceManager(factory=AppResourceFactory, use_decorator=False)
+    for i in range(count):
+        name = f"app-{i}"
+        config = {"runtime": RUNTIMES[i % 3], "region": REGIONS[i % 3], "replica_count": 1 + i % 3}
+        resource = AppResourceFactory.create("AppService", name, config)
+        if not intern:
+            # What every resource held before: its own private copy
+            resource._config = FrozenConfig(dict(resource._config))
+        manager.inventory.add(name, resource)
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    import resources.app_service  # noqa: F401  (registers AppService)
+    for label, intern in (("private copies", False), ("interned", True)):
+        gc.collect()
+        tracemalloc.start()
+        manager = _fleet(args.count, intern)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        started = time.perf_counter()
+        manager.list_resources()
+        listing = time.perf_counter() - started
+        print(f"{label:>15}: {memory / args.count:>6.0f} bytes/resource, first list {listing * 1e3:>8.1f} ms")
+        del manager
+
+    config = FrozenConfig.intern({"runtime": "python", "region": "EastUS", "replica_count": 1})
+    legacy = dict(config)
+    reads = 1000000
+    started = time.perf_counter()
+    for _ in range(reads):
+        legacy.copy()["runtime"]
+    copy_read = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(reads):
+        config["runtime"]
+    view_read = time.perf_counter() - started
+    print(f"config read: defensive copy {copy_read / reads * 1e9:.0f} ns, frozen view {view_read / reads * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
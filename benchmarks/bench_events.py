@@ -0,0 +1,70 @@
+"""Compare indexed event queries with scanning every event."""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from utils.event_log import EventLog
+
+ACTIONS = ("created", "started", "stopped", "deleted")
+
+
+def _scan(directory, since, action=None, resource=None):
+    # What answering the question took before: read and parse everything
+    matches = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".jsonl"):
+            continue
+        with open(os.path.join(directory, name), "rb") as file:
+            for raw in file:
+                event = json.loads(raw)
+                if (event["ts"] >= since and (action is None or event["action"] == action)
+                        and (resource is None or event["resource"] == resource)):
+                    matches.append(event)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=500000)
+    parser.add_argument("--resources", type=int, default=20000)
+    parser.add_argument("--hours", type=int, default=72)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    now = time.time()
+    start = now - args.hours * 3600
+    step = args.hours * 3600 / args.events
+    with tempfile.TemporaryDirectory() as directory:
+        log = EventLog(directory)
+        started = time.perf_counter()
+        batch = []
+        for i in range(args.events):
+            batch.append({"ts": start + i * step, "resource": f"res-{rng.randrange(args.resources)}",
+                          "type": "AppService", "action": rng.choice(ACTIONS), "message": "ok", "user": "bench"})
+            if len(batch) == 4096:
+                log.append_many(batch)
+                batch = []
+        log.append_many(batch)
+        log.close()
+        print(f"wrote {args.events} events in {time.perf_counter() - started:.2f} s")
+
+        queries = (
+            ("stopped in the last hour", dict(since=now - 3600, action="stopped")),
+            ("one resource, last 6 hours", dict(since=now - 6 * 3600, resource="res-42")),
+        )
+        for label, query in queries:
+            started = time.perf_counter()
+            scanned = _scan(directory, **query)
+            scan_time = time.perf_counter() - started
+            started = time.perf_counter()
+            indexed = list(log.query(**query))
+            index_time = time.perf_counter() - started
+            assert indexed == scanned
+            print(f"{label:>28}: {len(indexed):>6} events, full scan {scan_time * 1e3:>8.1f} ms, "
+                  f"indexed {index_time * 1e3:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
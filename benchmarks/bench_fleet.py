@@ -0,0 +1,48 @@
+"""Compare memory and aggregation speed of the object and columnar inventories."""
+import argparse
+import gc
+import time
+import tracemalloc
+from application.columnar_inventory import ColumnarInventory
+from application.inventory import ResourceInventory
+from application.resource_manager import ResourceManager
+from core.factory import ResourceFactory
+
+REGIONS = ("EastUS", "WestEurope", "CentralIndia")
+
+
+def build(inventory, count: int) -> ResourceManager:
+    manager = ResourceManager(use_decorator=False, inventory=inventory)
+    for i in range(count):
+        name = f"app-{i}"
+        config = {"runtime": "python", "region": REGIONS[i % 3], "replica_count": 1 + i % 3}
+        manager.inventory.add(name, ResourceFactory.create("AppService", name, config))
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200000)
+    args = parser.parse_args()
+
+    import resources.app_service  # noqa: F401  (registers AppService)
+    for label, inventory_class in (("objects", ResourceInventory), ("columnar", ColumnarInventory)):
+        gc.collect()
+        tracemalloc.start()
+        manager = build(inventory_class(), args.count)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        manager.get_resource_count()
+        counts = time.perf_counter() - started
+        started = time.perf_counter()
+        manager.aggregate("replica_count", by="region")
+        aggregate = time.perf_counter() - started
+        print(f"{label:>9}: {memory / args.count:>7.0f} bytes/resource, "
+              f"count {counts * 1e3:>8.2f} ms, replicas by region {aggregate * 1e3:>8.2f} ms")
+        del manager
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Bring up and tear down a layered environment as a ResourceGroup, compared with one resource at a time."""
+import argparse
+import os
+import tempfile
+import time
+from application.groups import ResourceGroup
+from application.resource_manager import ResourceManager
+from core.factory import AppResourceFactory, StorageResourceFactory
+from domain.lifecycle import LIFECYCLE
+from utils.logger_utils import close_logs, set_console_echo
+
+
+def build_environment(count, depth):
+    """
+    `count` resources in `depth` layers: StorageAccounts at the bottom, then
+    AppServices that each depend on two resources of the layer below.
+    """
+    manager = ResourceManager(factory=AppResourceFactory, bulk_chunk_size=1)
+    storage = ResourceManager(factory=StorageResourceFactory, inventory=manager.inventory)
+    group = ResourceGroup("env")
+    width = max(1, count // depth)
+    layers = [[f"l{layer}-{i}" for i in range(width)] for layer in range(depth)]
+    for name in layers[0]:
+        storage.create_resource("StorageAccount", name, {"access_key": "bench-key", "max_size_gb": 64})
+        group.add(name)
+    for below, layer in zip(layers, layers[1:]):
+        for i, name in enumerate(layer):
+            manager.create_resource("AppService", name, {"runtime": "python", "region": "EastUS"})
+            group.add(name, (below[i], below[(i + 1) % width]))
+    return manager, group
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds per transition, as a provider call")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="cloudconnect-bench-"))
+    set_console_echo(False)
+
+    def provider_call(resource, action, source, target):
+        time.sleep(args.latency)
+
+    manager, group = build_environment(args.count, args.depth)
+    order = [name for wave in group.waves() for name in wave]
+    LIFECYCLE.add_pre_hook(provider_call)
+    try:
+        print(f"{len(group)} resources, dependency depth {args.depth}, "
+              f"{args.latency * 1000:g} ms per transition, {args.workers} workers")
+        print(f"{'operation':>10} {'one at a time s':>16} {'group s':>9} {'waves':>6}")
+        for action, run_group in (("start", manager.start_group), ("stop", manager.stop_group)):
+            names = order if action == "start" else order[::-1]
+            call = getattr(manager, f"{action}_resource")
+            started = time.perf_counter()
+            for name in names:
+                call(name)
+            sequential = time.perf_counter() - started
+            # Undo, so that the group run starts from the same state
+            undo = manager.stop_group if action == "start" else manager.start_group
+            undo(group, workers=args.workers)
+            report = run_group(group, workers=args.workers)
+            if report["failed"]:
+                raise RuntimeError(f"{action}: {report['failed']} members failed")
+            print(f"{action:>10} {sequential:>16.2f} {report['elapsed_seconds']:>9.2f} {report['waves']:>6}")
+    finally:
+        LIFECYCLE.remove_hook(provider_call)
+    close_logs()
+
+
+if __name__ == "__main__":
+    main()
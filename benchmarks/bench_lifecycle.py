@@ -0,0 +1,94 @@
+"""Compare the table-driven lifecycle with the former per-transition State objects."""
+import argparse
+import time
+import tracemalloc
+from domain.cloud_resource import CloudResource
+
+
+class _TableResource(CloudResource):
+    def validate_config(self):
+        pass
+
+    def get_details(self):
+        return self.name
+
+
+class _LegacyState:
+    """The State pattern as it was: one object allocated per transition."""
+
+    def __init__(self, resource):
+        self._resource = resource
+
+
+class _LegacyCreated(_LegacyState):
+    name = "created"
+
+    def start(self):
+        self._resource.set_state(_LegacyStarted(self._resource))
+        return f"{self._resource.name} started."
+
+
+class _LegacyStarted(_LegacyState):
+    name = "started"
+
+    def stop(self):
+        self._resource.set_state(_LegacyStopped(self._resource))
+        return f"{self._resource.name} stopped."
+
+
+class _LegacyStopped(_LegacyState):
+    name = "stopped"
+
+    def start(self):
+        self._resource.set_state(_LegacyStarted(self._resource))
+        return f"{self._resource.name} started again."
+
+
+class _LegacyResource(_TableResource):
+    """Same resource, but holding a State object and delegating to it."""
+
+    def __init__(self, name, config):
+        super().__init__(name, config)
+        self._state = _LegacyCreated(self)
+
+    def set_state(self, state):
+        self._state = state
+        if self._listener is not None:
+            self._listener(self)
+
+    def start(self):
+        return self._state.start()
+
+    def stop(self):
+        return self._state.stop()
+
+
+def _measure(factory, count: int, cycles: int):
+    tracemalloc.start()
+    fleet = [factory(f"r{i}") for i in range(count)]
+    per_resource = tracemalloc.get_traced_memory()[0] / count
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(cycles):
+        for resource in fleet:
+            resource.start()
+            resource.stop()
+    elapsed = time.perf_counter() - started
+    return per_resource, 2 * count * cycles / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--cycles", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, factory in (("state objects", lambda name: _LegacyResource(name, {})),
+                           ("table + flyweights", lambda name: _TableResource(name, {}))):
+        memory, rate = _measure(factory, args.count, args.cycles)
+        print(f"{label:>20}: {rate:>12.0f} transitions/s, {memory:>6.0f} bytes/resource")
+
+
+if __name__ == "__main__":
+    main()
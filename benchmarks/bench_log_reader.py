@@ -0,0 +1,49 @@
+"""Compare whole-file reads with LogReader tail/paging on a large log."""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from utils.log_reader import LogReader
+
+
+def _measure(label, func):
+    # Timed and traced separately: tracemalloc slows allocation-heavy code
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:>28}: {elapsed * 1e3:>8.1f} ms, peak {peak / 2 ** 20:>7.2f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=2000000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "resource.log")
+        line = "[2024-01-01 10:00:00 AM] web1 started. Resource 'web1' state transition recorded\n"
+        with open(path, "w", encoding="utf-8") as file:
+            for start in range(0, args.lines, 10000):
+                file.write(line * min(10000, args.lines - start))
+        print(f"log: {args.lines} lines, {os.path.getsize(path) / 2 ** 20:.0f} MiB")
+
+        def read_all():
+            with open(path, "r", encoding="utf-8") as file:
+                return file.read().strip()
+
+        _measure("file.read()", read_all)
+        reader = LogReader(path)
+        _measure(f"tail({args.page_size})", lambda: reader.tail(args.page_size))
+        _measure("build line index", lambda: LogReader(path).line_count())
+        middle = reader.page_count(args.page_size) // 2
+        _measure("middle page (indexed)", lambda: reader.page(middle, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
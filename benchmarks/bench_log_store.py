@@ -0,0 +1,67 @@
+"""Compare one log file per resource with the segmented LogStore."""
+import argparse
+import os
+import tempfile
+import time
+from utils.log_store import LogStore
+
+ACTIONS = ("created", "started", "stopped", "deleted")
+
+
+def _disk_usage(directory):
+    # Allocated blocks, so per-file overhead of tiny files is visible
+    total = 0
+    for name in os.listdir(directory):
+        stat = os.stat(os.path.join(directory, name))
+        total += getattr(stat, "st_blocks", stat.st_size // 512) * 512
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resources", type=int, default=100000)
+    parser.add_argument("--lines", type=int, default=4, help="log lines per resource")
+    args = parser.parse_args()
+
+    entries = [(f"res-{i}", f"[2024-01-01 10:00:00 AM] AppService 'res-{i}' {action} - res-{i} {action} (#{line}).")
+               for line, action in ((line, ACTIONS[line % len(ACTIONS)]) for line in range(args.lines))
+               for i in range(args.resources)]
+
+    with tempfile.TemporaryDirectory() as per_file, tempfile.TemporaryDirectory() as segmented:
+        started = time.perf_counter()
+        for name, message in entries:
+            with open(os.path.join(per_file, f"{name}.log"), "a", encoding="utf-8") as file:
+                file.write(message + "\n")
+        per_file_write = time.perf_counter() - started
+
+        store = LogStore(segmented)
+        started = time.perf_counter()
+        for i in range(0, len(entries), 512):
+            store.append_many(entries[i:i + 512])
+        store.rotate()
+        store_write = time.perf_counter() - started
+
+        started = time.perf_counter()
+        listed = [f for f in os.listdir(per_file) if f.endswith(".log")]
+        per_file_list = time.perf_counter() - started
+        started = time.perf_counter()
+        names = LogStore(segmented).resources()
+        store_list = time.perf_counter() - started
+        assert len(listed) == len(names) == args.resources
+
+        reopened = LogStore(segmented)
+        started = time.perf_counter()
+        lines = reopened.lines(f"res-{args.resources // 2}")
+        store_read = time.perf_counter() - started
+        assert len(lines) == args.lines
+
+        print(f"{'':>12} {'files':>8} {'disk MiB':>9} {'write s':>8} {'list ms':>8}")
+        print(f"{'per-file':>12} {len(os.listdir(per_file)):>8} {_disk_usage(per_file) / 2 ** 20:>9.1f} "
+              f"{per_file_write:>8.2f} {per_file_list * 1e3:>8.1f}")
+        print(f"{'segmented':>12} {len(os.listdir(segmented)):>8} {_disk_usage(segmented) / 2 ** 20:>9.1f} "
+              f"{store_write:>8.2f} {store_list * 1e3:>8.1f}")
+        print(f"one resource from the sealed store (cold): {store_read * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
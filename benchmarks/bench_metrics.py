@@ -0,0 +1,60 @@
+"""Measure metrics middleware overhead per transition and show where a bulk run spends its time."""
+import argparse
+import os
+import tempfile
+import time
+from application.resource_manager import ResourceManager
+from core.factory import AppResourceFactory
+from utils.logger_utils import close_logs, set_console_echo
+from utils.metrics import METRICS, render_prometheus
+
+VARIANTS = (
+    ("plain", dict(use_decorator=False, use_metrics=False)),
+    ("metrics", dict(use_decorator=False, use_metrics=True)),
+    ("logging", dict(use_decorator=True, use_metrics=False)),
+    ("logging+metrics", dict(use_decorator=True, use_metrics=True)),
+)
+
+
+def cycle(options, count, rounds):
+    manager = ResourceManager(factory=AppResourceFactory, **options)
+    names = [f"app-{i}" for i in range(count)]
+    for name in names:
+        manager.create_resource("AppService", name, {"runtime": "python", "region": "EastUS"})
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for name in names:
+            manager.start_resource(name)
+            manager.stop_resource(name)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / (count * 2) * 1e6, manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="cloudconnect-bench-"))
+    set_console_echo(False)
+    print(f"{'variant':>16} {'us/transition':>14}")
+    for label, options in VARIANTS:
+        METRICS.reset()
+        per_op, manager = cycle(options, args.count, args.rounds)
+        print(f"{label:>16} {per_op:>14.2f}")
+
+    # The last variant's snapshot shows the split between operations
+    print(f"\n{'operation':>22} {'count':>8} {'mean us':>9} {'total s':>8}")
+    for key, entry in METRICS.snapshot()["operations"].items():
+        print(f"{key:>22} {entry['count']:>8} {entry['mean_seconds'] * 1e6:>9.2f} {entry['sum_seconds']:>8.3f}")
+    started = time.perf_counter()
+    text = render_prometheus()
+    print(f"\nrendered {len(text.splitlines())} Prometheus lines in {(time.perf_counter() - started) * 1e3:.2f} ms")
+    close_logs()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure per-transition cost of the middleware pipeline with 0, 1 and 3 middleware, sampling and filtering."""
+import argparse
+import os
+import tempfile
+import time
+from application.resource_manager import ResourceManager
+from core.decorator import LoggingDecorator, MetricsDecorator
+from core.factory import AppResourceFactory
+from core.middleware import EventMiddleware, LoggingMiddleware, MetricsMiddleware, Pipeline
+from utils.logger_utils import close_logs, set_console_echo
+
+CONFIG = {"runtime": "python", "region": "EastUS"}
+
+VARIANTS = (
+    ("0 middleware", lambda: []),
+    ("1 (metrics)", lambda: [MetricsMiddleware()]),
+    ("1 (logging)", lambda: [LoggingMiddleware()]),
+    ("3 (all)", lambda: [MetricsMiddleware(), LoggingMiddleware(), EventMiddleware()]),
+    ("3, logs 1% sampled", lambda: [MetricsMiddleware(), LoggingMiddleware(sample_rate=0.01), EventMiddleware()]),
+    ("3, level=warning", lambda: [MetricsMiddleware(), LoggingMiddleware(level="warning"), EventMiddleware()]),
+)
+
+
+def best_of(rounds, names, transition):
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for name in names:
+            transition(name, "start")
+            transition(name, "stop")
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / (len(names) * 2) * 1e6
+
+
+def through_manager(middleware, count, rounds):
+    manager = ResourceManager(factory=AppResourceFactory, middleware=middleware)
+    names = [f"app-{i}" for i in range(count)]
+    for name in names:
+        manager.create_resource("AppService", name, CONFIG)
+    calls = {"start": manager.start_resource, "stop": manager.stop_resource}
+    return best_of(rounds, names, lambda name, action: calls[action](name))
+
+
+def pipeline_against_decorators(count, rounds):
+    """Raw call cost, without the manager: stacked decorators vs. the equivalent pipeline."""
+    raw = {f"app-{i}": AppResourceFactory.create("AppService", f"app-{i}", CONFIG) for i in range(count)}
+    wrapped = {name: MetricsDecorator(LoggingDecorator(resource)) for name, resource in raw.items()}
+    pipeline = Pipeline([MetricsMiddleware(), LoggingMiddleware(), EventMiddleware()])
+    empty = Pipeline()
+    return {
+        "direct call": best_of(rounds, list(raw), lambda name, action: getattr(raw[name], action)()),
+        "empty pipeline": best_of(rounds, list(raw), lambda name, action: empty.run(raw[name], action)),
+        "decorators": best_of(rounds, list(raw), lambda name, action: getattr(wrapped[name], action)()),
+        "pipeline": best_of(rounds, list(raw), lambda name, action: pipeline.run(raw[name], action)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="cloudconnect-bench-"))
+    set_console_echo(False)
+    print(f"through ResourceManager, {args.count} resources")
+    print(f"{'variant':>20} {'us/transition':>14}")
+    for label, middleware in VARIANTS:
+        print(f"{label:>20} {through_manager(middleware(), args.count, args.rounds):>14.2f}")
+
+    print("\nlogging + events + metrics, called directly")
+    print(f"{'variant':>20} {'us/transition':>14}")
+    for label, per_op in pipeline_against_decorators(args.count, args.rounds).items():
+        print(f"{label:>20} {per_op:>14.2f}")
+    close_logs()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare per-request, pooled keep-alive and batched HttpProvider calls against the mock control plane."""
+import argparse
+import os
+import tempfile
+from application.resource_manager import ResourceManager
+from core.factory import AppResourceFactory
+from providers import set_provider
+from providers.http_provider import HttpProvider
+from providers.mock_server import MockControlPlane
+from utils.logger_utils import close_logs, set_console_echo
+
+MODES = (
+    ("per-request", dict(pooled=False)),
+    ("pooled", dict(pool_size=8, batch_size=1)),
+    ("pooled+batch", dict(pool_size=8, batch_size=64)),
+)
+
+
+def run(plane, count, workers, options):
+    plane.reset()
+    provider = HttpProvider(plane.url, **options)
+    previous = set_provider(provider)
+    try:
+        manager = ResourceManager(factory=AppResourceFactory, bulk_workers=workers, bulk_chunk_size=16)
+        specs = [("AppService", f"app-{i}", {"runtime": "python", "region": "EastUS"}) for i in range(count)]
+        names = [name for _, name, _ in specs]
+        elapsed = 0.0
+        for label, call in (("create", lambda: manager.bulk_create(specs)),
+                            ("start", lambda: manager.bulk_start(names)),
+                            ("stop", lambda: manager.bulk_stop(names)),
+                            ("delete", lambda: manager.bulk_delete(names))):
+            report = call()
+            if report["failed"]:
+                raise RuntimeError(f"{label}: {report['failed']} operations failed")
+            elapsed += report["elapsed_seconds"]
+    finally:
+        set_provider(previous)
+        provider.close()
+    stats = plane.stats()
+    return count * 4 / elapsed, stats["requests"], stats["connections"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.0, help="server-side seconds per request")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="cloudconnect-bench-"))
+    set_console_echo(False)
+    with MockControlPlane(latency=args.latency) as plane:
+        print(f"{args.count} resources x 4 operations, {args.workers} threads, "
+              f"{args.latency * 1000:g} ms server latency")
+        print(f"{'mode':>14} {'ops/s':>9} {'requests':>9} {'connections':>12}")
+        for label, options in MODES:
+            ops, requests, connections = run(plane, args.count, args.workers, options)
+            print(f"{label:>14} {ops:>9.0f} {requests:>9} {connections:>12}")
+    close_logs()
+
+
+if __name__ == "__main__":
+    main()
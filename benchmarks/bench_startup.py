@@ -0,0 +1,84 @@
+"""
+Check CLI startup against an import-time budget.
+Runs a fresh interpreter with -X importtime, reports the slowest imports and
+exits non-zero if importing the CLI exceeds the budget, loads a resource
+module eagerly, or touches the filesystem.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_times(module: str, cwd: str) -> dict:
+    """Return {module: cumulative microseconds} for importing `module`."""
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1")
+    check = (f"import sys, {module}; from resources import MANIFEST; "
+             "print(','.join(m for m in set(MANIFEST.values()) if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", check],
+                            cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    times["__resource_modules__"] = [m for m in result.stdout.strip().split(",") if m]
+    return times
+
+
+def _batch_wall_time(cwd: str) -> float:
+    """Wall time of a batch invocation with no commands, interpreter included."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    started = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "run_cloudconnect.py"), "--batch", "-"],
+                   cwd=cwd, env=env, input="", capture_output=True, text=True, check=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="run_cloudconnect")
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="maximum cumulative import time of --module")
+    parser.add_argument("--runs", type=int, default=5, help="best of N runs is compared with the budget")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as cwd:
+        # Compile bytecode once so the runs measure imports, not compilation
+        subprocess.run([sys.executable, "-c", f"import {args.module}"], cwd=cwd,
+                       env=dict(os.environ, PYTHONPATH=ROOT), check=True, capture_output=True)
+        for entry in os.listdir(cwd):
+            failures.append(f"import created {entry!r} in the working directory")
+        runs = [_import_times(args.module, cwd) for _ in range(args.runs)]
+        best = min(runs, key=lambda times: times.get(args.module, 0))
+        batch = min(_batch_wall_time(cwd) for _ in range(args.runs))
+
+    total_ms = best.get(args.module, 0) / 1000
+    slowest = sorted(((us, name) for name, us in best.items() if isinstance(us, int) and name != args.module),
+                     reverse=True)[:args.top]
+    print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for us, name in slowest:
+        print(f"  {us / 1000:>7.1f} ms  {name}")
+    print(f"empty batch run (interpreter included): {batch * 1e3:.1f} ms")
+
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    if best["__resource_modules__"]:
+        failures.append(f"resource modules imported eagerly: {', '.join(best['__resource_modules__'])}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Measure signup and login cost as the user store grows."""
+import argparse
+import os
+import tempfile
+import time
+from application.user_manager import UserManager
+from application.user_store import JsonUserStore, SqliteUserStore
+
+
+def run(store, count: int, iterations: int) -> None:
+    manager = UserManager(store=store, hash_iterations=iterations)
+    started = time.perf_counter()
+    for i in range(count):
+        manager.signup(f"user{i}", f"User {i}", f"user{i}@example.com", "password")
+    signup = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(0, count, max(1, count // 1000)):
+        manager.login(f"user{i}", "password")
+    logins = len(range(0, count, max(1, count // 1000)))
+    login = time.perf_counter() - started
+    token = manager.open_session("user0", "password")
+    started = time.perf_counter()
+    for _ in range(logins):
+        manager.validate_session(token)
+    validate = time.perf_counter() - started
+    manager.close()
+    print(f"{type(store).__name__:>16}: {count / signup:>10.0f} signups/s, "
+          f"{login / logins * 1e6:>8.1f} us/login, {validate / logins * 1e6:>6.2f} us/session check "
+          f"at {count} users")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--json-count", type=int, default=2000,
+                        help="users for the JSON backend, which rewrites the file per signup")
+    parser.add_argument("--iterations", type=int, default=1000,
+                        help="password hashing cost; lower than the default to keep signups cheap")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="cloudconnect-users-")
+    run(SqliteUserStore(os.path.join(directory, "users.db")), args.count, args.iterations)
+    run(JsonUserStore(os.path.join(directory, "users.json")), args.json_count, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Benchmark suite: lifecycle, listing, counting, logging, users and persistence at fleet scale."""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from typing import Any, Callable, Dict, Iterable, List
+
+from application.persistence import InventoryStore
+from application.resource_manager import ResourceManager
+from application.user_manager import UserManager
+from application.user_store import SqliteUserStore
+from core.factory import AppResourceFactory, CacheResourceFactory, StorageResourceFactory
+from utils.logger_utils import close_logs, flush_logs, set_console_echo, write_log
+
+REGIONS = ("EastUS", "WestEurope", "CentralIndia")
+
+# (factory, resource type, config for resource i): each fleet is an even mix
+FLEET = (
+    (AppResourceFactory, "AppService", lambda i: {"runtime": "python", "region": REGIONS[i % 3]}),
+    (StorageResourceFactory, "StorageAccount", lambda i: {"access_key": f"key-{i % 64:05d}", "max_size_gb": 64 << i % 4}),
+    (CacheResourceFactory, "CacheDB", lambda i: {"capacity_mb": 256 << i % 4}),
+)
+
+Metrics = Dict[str, Dict[str, float]]
+
+
+def summarize(samples: Iterable[int]) -> Dict[str, float]:
+    """Throughput and nearest-rank latency percentiles of nanosecond samples."""
+    ordered = sorted(samples)
+    count = len(ordered)
+    total = sum(ordered) or 1
+
+    def percentile(q):
+        return ordered[min(count - 1, int(q * count))] / 1000
+
+    return {"count": count, "ops_per_sec": count * 1e9 / total, "p50_us": percentile(0.50),
+            "p95_us": percentile(0.95), "p99_us": percentile(0.99), "max_us": ordered[-1] / 1000}
+
+
+def timed(call: Callable[[Any], Any], items: Iterable[Any]) -> Dict[str, float]:
+    """Call `call(item)` for every item, timing each call."""
+    samples = array("q")
+    clock, append = time.perf_counter_ns, samples.append
+    for item in items:
+        started = clock()
+        call(item)
+        append(clock() - started)
+    return summarize(samples)
+
+
+def repeat(call: Callable[[], Any], times: int) -> Dict[str, float]:
+    return timed(lambda _: call(), range(times))
+
+
+def fleet_specs(size: int) -> List[tuple]:
+    return [(i % 3, FLEET[i % 3][1], f"res-{i}", FLEET[i % 3][2](i // 3)) for i in range(size)]
+
+
+def build_managers(decorated: bool, store: InventoryStore = None) -> List[ResourceManager]:
+    """One manager per specialized factory, sharing an inventory as the CLI does."""
+    first = ResourceManager(factory=FLEET[0][0], use_decorator=decorated, store=store)
+    return [first] + [ResourceManager(factory=factory, use_decorator=decorated, inventory=first.inventory)
+                      for factory, _, _ in FLEET[1:]]
+
+
+def bench_lifecycle(size: int, decorated: bool) -> Metrics:
+    managers = build_managers(decorated)
+    manager = managers[0]
+    specs = fleet_specs(size)
+    names = [spec[2] for spec in specs]
+    prefix = "decorated." if decorated else "plain."
+    metrics = {prefix + "create": timed(lambda spec: managers[spec[0]].create_resource(*spec[1:]), specs)}
+    if decorated:
+        # Listing and counting do not depend on decorators; measure them once
+        metrics["list_resources.cold"] = repeat(manager.list_resources, 1)
+        metrics["list_resources"] = repeat(manager.list_resources, max(3, min(50, 1000000 // size)))
+        metrics["get_resource_count"] = repeat(manager.get_resource_count, 1000)
+    metrics[prefix + "start"] = timed(manager.start_resource, names)
+    metrics[prefix + "stop"] = timed(manager.stop_resource, names)
+    metrics[prefix + "delete"] = timed(manager.delete_resource, names)
+    if decorated:
+        metrics["flush_logs"] = repeat(flush_logs, 1)
+    return metrics
+
+
+def bench_logging(size: int) -> Metrics:
+    messages = [(f"res-{i}", f"[2024-01-01 10:00:00 AM] AppService 'res-{i}' started - res-{i} started.")
+                for i in range(size)]
+    metrics = {"write_log": timed(lambda entry: write_log(*entry), messages)}
+    metrics["write_log.flush"] = repeat(flush_logs, 1)
+    return metrics
+
+
+def bench_persistence(size: int, directory: str) -> Metrics:
+    store = InventoryStore(directory)
+    managers = build_managers(False, store)
+    metrics = {"journal.create": timed(lambda spec: managers[spec[0]].create_resource(*spec[1:]), fleet_specs(size))}
+    managers[0].close()
+    del managers
+    gc.collect()
+    restored = []
+    metrics["journal.restore"] = repeat(lambda: restored.append(ResourceManager(store=InventoryStore(directory))), 1)
+    assert len(restored[0].inventory) == size
+    restored[0].close()
+    return metrics
+
+
+def bench_memory(size: int) -> Metrics:
+    gc.collect()
+    tracemalloc.start()
+    managers = build_managers(True)
+    for index, resource_type, name, config in fleet_specs(size):
+        managers[index].create_resource(resource_type, name, config)
+    flush_logs()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"memory": {"peak_mib": peak / 2 ** 20, "bytes_per_resource": peak / size}}
+
+
+def bench_users(count: int, directory: str) -> Metrics:
+    users = UserManager(store=SqliteUserStore(os.path.join(directory, "users.db")))
+    names = [f"user-{i}" for i in range(count)]
+    metrics = {"users.signup": timed(lambda name: users.signup(name, name, f"{name}@example.com", "pw"), names),
+               "users.login": timed(lambda name: users.login(name, "pw"), names)}
+    tokens = [users.open_session(name, "pw") for name in names[:10]]
+    metrics["users.validate_session"] = timed(users.validate_session, tokens * 1000)
+    users.close()
+    return metrics
+
+
+def run(sizes: List[int], users: int, memory: bool) -> Dict[str, Any]:
+    results: Dict[str, Metrics] = {}
+    for size in sizes:
+        metrics: Metrics = {}
+        for decorated in (True, False):
+            metrics.update(bench_lifecycle(size, decorated))
+            gc.collect()
+        metrics.update(bench_logging(size))
+        with tempfile.TemporaryDirectory() as directory:
+            metrics.update(bench_persistence(size, directory))
+        gc.collect()
+        if memory:
+            metrics.update(bench_memory(size))
+            gc.collect()
+        close_logs()
+        results[str(size)] = metrics
+        print(f"finished fleet of {size}", file=sys.stderr)
+    if users:
+        with tempfile.TemporaryDirectory() as directory:
+            results["users"] = bench_users(users, directory)
+    return {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                     "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, stat: str,
+            min_delta_us: float) -> List[str]:
+    """
+    Describe every metric that got worse than the baseline by more than
+    `threshold` (a fraction): latency `stat` for timings, peak_mib for
+    memory. Latency changes below `min_delta_us` are treated as noise.
+    """
+    regressions = []
+    for group, metrics in current["results"].items():
+        for name, values in metrics.items():
+            old = baseline.get("results", {}).get(group, {}).get(name)
+            key = "peak_mib" if "peak_mib" in values else stat
+            if not old or not old.get(key):
+                continue
+            new_value, old_value = values[key], old[key]
+            if key != "peak_mib" and new_value - old_value < min_delta_us:
+                continue
+            if new_value > old_value * (1 + threshold):
+                regressions.append(f"{group} {name}: {key} {old_value:.2f} -> {new_value:.2f} "
+                                   f"(+{(new_value / old_value - 1) * 100:.0f}%)")
+    return regressions
+
+
+def report(results: Dict[str, Any]) -> None:
+    for group, metrics in results["results"].items():
+        print(f"\n{group if group == 'users' else f'fleet of {group}'}")
+        print(f"{'metric':>26} {'count':>9} {'ops/s':>11} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'max us':>11}")
+        for name, values in metrics.items():
+            if "peak_mib" in values:
+                print(f"{name:>26} peak {values['peak_mib']:.1f} MiB, {values['bytes_per_resource']:.0f} B/resource")
+                continue
+            print(f"{name:>26} {values['count']:>9} {values['ops_per_sec']:>11.0f} {values['p50_us']:>10.1f} "
+                  f"{values['p95_us']:>10.1f} {values['p99_us']:>10.1f} {values['max_us']:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="fleet sizes to build (up to 1000000)")
+    parser.add_argument("--users", type=int, default=20, help="users to sign up and log in (0 to skip)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON (usable as a baseline)")
+    parser.add_argument("--baseline", metavar="FILE", help="fail if results regress against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown as a fraction")
+    parser.add_argument("--stat", default="p50_us", choices=("p50_us", "p95_us", "p99_us"))
+    parser.add_argument("--min-delta-us", type=float, default=1.0, help="ignore latency changes below this")
+    args = parser.parse_args()
+
+    output = args.output and os.path.abspath(args.output)
+    baseline = args.baseline and os.path.abspath(args.baseline)
+    # Relative paths (logs, data) land in a scratch directory
+    os.chdir(tempfile.mkdtemp(prefix="cloudconnect-bench-"))
+    set_console_echo(False)
+    results = run(args.sizes, args.users, not args.no_memory)
+    report(results)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if baseline:
+        with open(baseline, "r", encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold, args.stat, args.min_delta_us)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
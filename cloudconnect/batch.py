@@ -0,0 +1,165 @@
+import json
+from typing import Any, Dict, Iterator, TextIO, Tuple
+from application.groups import ResourceGroup
+from application.reconcile import Reconciler, load_manifest
+from application.user_manager import UserManager
+from cloudconnect.main import build_managers
+from utils.logger_utils import acting_as, close_logs, query_events, set_console_echo
+
+# Commands that need a logged-in user, as in the interactive CLI
+RESOURCE_COMMANDS = {"create", "start", "stop", "delete", "list", "count", "events",
+                     "start_group", "stop_group", "delete_group", "apply",
+                     "cache_get", "cache_set", "cache_delete", "cache_mget", "cache_mset", "cache_stats"}
+
+
+def read_commands(stream: TextIO) -> Iterator[Tuple[int, Any]]:
+    """
+    Lazily parse a JSONL command stream, yielding (line_number, command).
+    Blank lines and lines starting with '#' are skipped. A line that is not
+    valid JSON is yielded as the ValueError raised while parsing it.
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f"Invalid JSON: {e}")
+
+
+class BatchRunner:
+    """Executes batch commands against the same managers the CLI uses."""
+
+    def __init__(self, user_manager: UserManager = None, managers=None):
+        self.user_manager = user_manager or UserManager()
+        self._unified, app, storage, cache = managers or build_managers()
+        self.manager = self._unified
+        self._creators = {"appservice": app, "storageaccount": storage, "cachedb": cache}
+        self._reconciler = Reconciler(self._unified, self._creators)
+
+    def execute(self, command: Dict[str, Any]) -> Any:
+        """Run one command and return its result; raises on failure."""
+        if not isinstance(command, dict):
+            raise ValueError("Command must be a JSON object.")
+        op = command.get("op")
+        handler = getattr(self, f"_op_{op}", None) if isinstance(op, str) else None
+        if handler is None:
+            raise ValueError(f"Unknown op: {op}")
+        if op in RESOURCE_COMMANDS:
+            # A session token authenticates the command on its own
+            if "token" in command:
+                username = self.user_manager.validate_session(command["token"])
+                with acting_as(username):
+                    return handler(command)
+            if not self.user_manager.get_current_user():
+                raise PermissionError("Login required.")
+        return handler(command)
+
+    def _op_signup(self, command):
+        return self.user_manager.signup(command["username"], command["name"],
+                                         command["email"], command["password"])
+
+    def _op_login(self, command):
+        return self.user_manager.login(command["username"], command["password"])
+
+    def _op_logout(self, command):
+        return self.user_manager.logout()
+
+    def _op_session(self, command):
+        return {"token": self.user_manager.open_session(command["username"], command["password"])}
+
+    def _op_end_session(self, command):
+        return self.user_manager.close_session(command["token"])
+
+    def _op_create(self, command):
+        resource_type = command["type"]
+        manager = self._creators.get(resource_type.lower(), self._unified)
+        return manager.create_resource(resource_type, command["name"], dict(command.get("config") or {}))
+
+    def _op_start(self, command):
+        return self._unified.start_resource(command["name"])
+
+    def _op_stop(self, command):
+        return self._unified.stop_resource(command["name"])
+
+    def _op_delete(self, command):
+        return self._unified.delete_resource(command["name"])
+
+    def _op_start_group(self, command):
+        return self._unified.start_group(ResourceGroup.from_dict(command), command.get("workers"))
+
+    def _op_stop_group(self, command):
+        return self._unified.stop_group(ResourceGroup.from_dict(command), command.get("workers"))
+
+    def _op_delete_group(self, command):
+        return self._unified.delete_group(ResourceGroup.from_dict(command), command.get("workers"))
+
+    def _op_apply(self, command):
+        manifest = command["manifest"] if "manifest" in command else load_manifest(command["path"])
+        return self._reconciler.apply(manifest, dry_run=bool(command.get("dry_run")),
+                                      prune=command.get("prune"), workers=command.get("workers"))
+
+    def _op_cache_get(self, command):
+        return self._unified.cache(command["name"]).get(command["key"])
+
+    def _op_cache_set(self, command):
+        self._unified.cache(command["name"]).set(command["key"], command["value"], command.get("ttl"))
+        return "OK"
+
+    def _op_cache_delete(self, command):
+        return self._unified.cache(command["name"]).delete(command["key"])
+
+    def _op_cache_mget(self, command):
+        return self._unified.cache(command["name"]).mget(command["keys"])
+
+    def _op_cache_mset(self, command):
+        self._unified.cache(command["name"]).mset(command["items"], command.get("ttl"))
+        return "OK"
+
+    def _op_cache_stats(self, command):
+        return self._unified.cache(command["name"]).stats()
+
+    def _op_list(self, command):
+        filters = {key: value for key, value in command.items() if key not in ("op", "token")}
+        if not filters:
+            return self._unified.list_resources()
+        return self._unified.query(**filters)
+
+    def _op_count(self, command):
+        return self._unified.get_resource_count()
+
+    def _op_events(self, command):
+        filters = {key: value for key, value in command.items() if key not in ("op", "token")}
+        return list(query_events(**filters))
+
+
+def run_batch(stream: TextIO, out: TextIO, runner: BatchRunner = None) -> int:
+    """
+    Execute every command in `stream`, writing one JSON result line per
+    command to `out`. Returns the number of failed commands.
+    """
+    runner = runner or BatchRunner()
+    failures = 0
+    # stdout carries the JSON results, so resource log lines are not echoed
+    set_console_echo(False)
+    try:
+        for line_number, command in read_commands(stream):
+            op = command.get("op") if isinstance(command, dict) else None
+            try:
+                if isinstance(command, Exception):
+                    raise command
+                result = {"line": line_number, "op": op, "ok": True, "result": runner.execute(command)}
+            except KeyError as e:
+                failures += 1
+                result = {"line": line_number, "op": op, "ok": False, "error": f"Missing field: {e.args[0]}"}
+            except Exception as e:
+                failures += 1
+                result = {"line": line_number, "op": op, "ok": False, "error": str(e)}
+            out.write(json.dumps(result, default=str) + "\n")
+    finally:
+        out.flush()
+        runner.manager.close()
+        runner.user_manager.close()
+        close_logs()
+    return failures
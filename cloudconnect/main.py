@@ -1,26 +1,37 @@
+from application.persistence import InventoryStore
 from application.resource_manager import ResourceManager
 from application.user_manager import UserManager
-from core.factory import AppResourceFactory, DatabaseResourceFactory, StorageResourceFactory, CacheResourceFactory
-from resources.app_service import AppService
-from resources.storage_account import StorageAccount
-from resources.cache_db import CacheDB
+from core.factory import AppResourceFactory, StorageResourceFactory, CacheResourceFactory
+from resources import get as get_resource_type
+from utils.log_reader import LogReader
+from utils.logger_utils import LOG_DIR, close_logs, logged_resources, resource_log
+from functools import partial
 import os
 
+# Lines shown per screen by the log viewer
+LOG_PAGE_SIZE = 50
+
+def build_managers():
+    """
+    Create the unified resource manager plus the specialized managers used
+    to create each resource type. All of them share one inventory.
+    """
+    # Create a unified resource manager that can handle all resource types,
+    # restoring the inventory saved by previous runs
+    unified_manager = ResourceManager(factory=AppResourceFactory, use_decorator=True,
+                                      store=InventoryStore())
+    
+    # Create specialized managers that share the same resource storage
+    storage_manager = ResourceManager(factory=StorageResourceFactory, use_decorator=True,
+                                      inventory=unified_manager.inventory)
+    cache_manager = ResourceManager(factory=CacheResourceFactory, use_decorator=True,
+                                    inventory=unified_manager.inventory)
+    return unified_manager, unified_manager, storage_manager, cache_manager
+
 def cli_main():
     """Main CLI entry point with user authentication."""
     user_manager = UserManager()
-    
-    # Create a unified resource manager that can handle all resource types
-    unified_manager = ResourceManager(factory=AppResourceFactory, use_decorator=True)
-    
-    # Create specialized managers that share the same resource storage
-    app_manager = unified_manager
-    storage_manager = ResourceManager(factory=StorageResourceFactory, use_decorator=True)
-    cache_manager = ResourceManager(factory=CacheResourceFactory, use_decorator=True)
-    
-    # Share the same resource storage across all managers
-    storage_manager._resources = unified_manager._resources
-    cache_manager._resources = unified_manager._resources
+    unified_manager, app_manager, storage_manager, cache_manager = build_managers()
 
     print("\nWelcome to CloudConnect CLI")
     print("=" * 50)
@@ -70,6 +81,10 @@ def cli_main():
         except Exception as e:
             print(f"Error: {e}")
 
+    unified_manager.close()
+    user_manager.close()
+    close_logs()
+
 def _display_auth_menu():
     """Display the authentication menu."""
     print("\n" + "=" * 50)
@@ -164,31 +179,43 @@ def _get_resource_name() -> str:
             continue
         return name
 
-def _config_app_service():
-    """Configure AppService with validation."""
-    print("\nAvailable runtimes: python, nodejs, dotnet")
-    while True:
-        runtime = input("Runtime (python/nodejs/dotnet): ").strip().lower()
-        if runtime in ["python", "nodejs", "dotnet"]:
-            break
-        print("Invalid runtime. Please choose: python, nodejs, or dotnet")
-    
-    print("Available regions: EastUS, WestEurope, CentralIndia")
-    while True:
-        region = input("Region (EastUS/WestEurope/CentralIndia): ").strip()
-        if region in ["EastUS", "WestEurope", "CentralIndia"]:
-            break
-        print("Invalid region. Please choose: EastUS, WestEurope, or CentralIndia")
-    
+def _prompt(factory, resource_type, key, prompt, parse=str.strip, hint=None,
+            parse_error="Please enter a valid value"):
+    """
+    Ask for one config value until it passes the same compiled schema the
+    factory validates with, so the CLI never duplicates the rules.
+    """
     while True:
+        raw = input(prompt)
         try:
-            replica = int(input("Replica count (1/2/3): ").strip())
-            if replica in [1, 2, 3]:
-                break
-            print("Invalid replica count. Please choose: 1, 2, or 3")
+            value = parse(raw)
         except ValueError:
-            print("Please enter a valid number (1, 2, or 3)")
-    
+            print(parse_error)
+            continue
+        error = factory.check_field(resource_type, key, value)
+        if error is None:
+            return value
+        print(f"{error} {hint}" if hint else error)
+
+def _config_app_service():
+    """Configure AppService with validation."""
+    AppService = get_resource_type("AppService")
+    runtimes = sorted(AppService.VALID_RUNTIMES)
+    regions = sorted(AppService.VALID_REGIONS)
+    replicas = sorted(AppService.VALID_REPLICAS)
+    print(f"\nAvailable runtimes: {', '.join(runtimes)}")
+    runtime = _prompt(AppResourceFactory, "AppService", "runtime", f"Runtime ({'/'.join(runtimes)}): ",
+                      lambda raw: raw.strip().lower(), f"Please choose: {', '.join(runtimes)}")
+
+    print(f"Available regions: {', '.join(regions)}")
+    region = _prompt(AppResourceFactory, "AppService", "region", f"Region ({'/'.join(regions)}): ",
+                     hint=f"Please choose: {', '.join(regions)}")
+
+    replica_choices = "/".join(map(str, replicas))
+    replica = _prompt(AppResourceFactory, "AppService", "replica_count", f"Replica count ({replica_choices}): ",
+                      lambda raw: int(raw.strip()), f"Please choose: {', '.join(map(str, replicas))}",
+                      f"Please enter a valid number ({', '.join(map(str, replicas))})")
+
     return {"runtime": runtime, "region": region, "replica_count": replica}
 
 def _config_storage_account():
@@ -199,62 +226,39 @@ def _config_storage_account():
             enc = enc_input in ['y', 'yes']
             break
         print("Please enter 'y' for yes or 'n' for no")
-    
+
+    access_key = _prompt(StorageResourceFactory, "StorageAccount", "access_key", "Access key (min 8 chars): ")
+
     while True:
-        access_key = input("Access key (min 8 chars): ").strip()
-        if len(access_key) >= 8:
+        max_size = _prompt(StorageResourceFactory, "StorageAccount", "max_size_gb", "Max size (GB): ",
+                           lambda raw: int(raw.strip()), parse_error="Please enter a valid positive number")
+        if max_size > 0:
             break
-        print("Access key must be at least 8 characters long")
-    
-    while True:
-        try:
-            max_size = int(input("Max size (GB): ").strip())
-            if max_size > 0:
-                break
-            print("Size must be a positive number")
-        except ValueError:
-            print("Please enter a valid positive number")
-    
+        print("Size must be a positive number")
+
     return {"encryption_enabled": enc, "access_key": access_key, "max_size_gb": max_size}
 
 def _config_cache_db():
     """Configure CacheDB with validation."""
-    while True:
-        try:
-            ttl = int(input("TTL seconds: ").strip())
-            if ttl > 0:
-                break
-            print("TTL must be a positive number")
-        except ValueError:
-            print("Please enter a valid positive number")
-    
-    while True:
-        try:
-            cap = int(input("Capacity (MB): ").strip())
-            if cap > 0:
-                break
-            print("Capacity must be a positive number")
-        except ValueError:
-            print("Please enter a valid positive number")
-    
-    while True:
-        evict = input("Eviction policy (LRU/FIFO): ").strip().upper()
-        if evict in ["LRU", "FIFO"]:
-            break
-        print("Invalid eviction policy. Please choose: LRU or FIFO")
-    
+    policies = sorted(get_resource_type("CacheDB").VALID_EVICTION_POLICIES)
+    ttl = _prompt(CacheResourceFactory, "CacheDB", "ttl_seconds", "TTL seconds: ",
+                  lambda raw: int(raw.strip()), parse_error="Please enter a valid positive number")
+    cap = _prompt(CacheResourceFactory, "CacheDB", "capacity_mb", "Capacity (MB): ",
+                  lambda raw: int(raw.strip()), parse_error="Please enter a valid positive number")
+    evict = _prompt(CacheResourceFactory, "CacheDB", "eviction_policy", f"Eviction policy ({'/'.join(policies)}): ",
+                    lambda raw: raw.strip().upper(), f"Please choose: {' or '.join(policies)}")
+
     return {"ttl_seconds": ttl, "capacity_mb": cap, "eviction_policy": evict}
 
 def _start_resource_workflow(manager):
     """Improved start resource workflow."""
-    resources = manager.list_resources()
-    if not resources:
+    if not manager.get_resource_count()["total"]:
         print("No resources available to start.")
         return
     
     print("\nStart Resource")
     print("-" * 18)
-    _show_available_resources(resources)
+    _show_available_resources(manager)
     
     name = input("Enter resource name to start: ").strip()
     if name:
@@ -266,14 +270,13 @@ def _start_resource_workflow(manager):
 
 def _stop_resource_workflow(manager):
     """Improved stop resource workflow."""
-    resources = manager.list_resources()
-    if not resources:
+    if not manager.get_resource_count()["total"]:
         print("No resources available to stop.")
         return
     
     print("\nStop Resource")
     print("-" * 17)
-    _show_available_resources(resources)
+    _show_available_resources(manager)
     
     name = input("Enter resource name to stop: ").strip()
     if name:
@@ -285,14 +288,13 @@ def _stop_resource_workflow(manager):
 
 def _delete_resource_workflow(manager):
     """Improved delete resource workflow."""
-    resources = manager.list_resources()
-    if not resources:
+    if not manager.get_resource_count()["total"]:
         print("No resources available to delete.")
         return
     
     print("\nDelete Resource")
     print("-" * 19)
-    _show_available_resources(resources)
+    _show_available_resources(manager)
     
     name = input("Enter resource name to delete: ").strip()
     if name:
@@ -306,16 +308,14 @@ def _delete_resource_workflow(manager):
         else:
             print("Deletion cancelled.")
 
-def _show_available_resources(resources):
+def _show_available_resources(manager):
     """Show available resources in a formatted way, excluding deleted ones."""
-    active_resources = {name: meta for name, meta in resources.items() if not meta.get('deleted', False)}
-    
-    if not active_resources:
+    if not manager.get_resource_count()["active"]:
         print("No active resources available.")
         return
     
     print("Available resources:")
-    for name, meta in active_resources.items():
+    for _, name, meta in manager.iter_query(deleted=False):
         if meta['status'] == 'started':
             status = "[RUNNING]"
         elif meta['status'] == 'stopped':
@@ -376,53 +376,92 @@ def _list_resources_workflow(manager):
 
 def _view_logs():
     """Enhanced log viewing with better organization."""
-    logs_dir = os.path.join("cloudconnect", "logs")
-    if not os.path.exists(logs_dir):
-        print("No logs directory found.")
-        return
-    
-    files = [f for f in os.listdir(logs_dir) if f.endswith('.log')]
-    if not files:
+    logs = _available_logs()
+    if not logs:
         print("No logs found.")
         return
     
-    print(f"\nFound {len(files)} log files:")
-    for i, f in enumerate(files, 1):
-        print(f"{i}. {f}")
+    print(f"\nFound logs for {len(logs)} resources:")
+    for i, (name, _) in enumerate(logs, 1):
+        print(f"{i}. {name}")
     
-    choice = input("\nEnter log file number to view (or 'all' for all logs): ").strip().lower()
+    choice = input("\nEnter log number to view (or 'all' for all logs): ").strip().lower()
     
     if choice == 'all':
-        for f in sorted(files):
-            print(f"\n{'='*60}")
-            print(f"Logs for {f}")
-            print(f"{'='*60}")
+        # Only the tail of each log is read, however large the logs are
+        for name, open_reader in logs:
+            _print_log_header(name)
             try:
-                with open(os.path.join(logs_dir, f), 'r', encoding='utf-8') as file:
-                    content = file.read().strip()
-                    if content:
-                        print(content)
-                    else:
-                        print("No log entries found.")
+                _print_lines(open_reader().tail(LOG_PAGE_SIZE))
             except Exception as e:
-                print(f"Error reading log file: {e}")
+                print(f"Error reading log: {e}")
     else:
         try:
-            file_index = int(choice) - 1
-            if 0 <= file_index < len(files):
-                selected_file = files[file_index]
-                print(f"\n{'='*60}")
-                print(f"Logs for {selected_file}")
-                print(f"{'='*60}")
-                with open(os.path.join(logs_dir, selected_file), 'r', encoding='utf-8') as file:
-                    content = file.read().strip()
-                    if content:
-                        print(content)
-                    else:
-                        print("No log entries found.")
+            log_index = int(choice) - 1
+            if 0 <= log_index < len(logs):
+                name, open_reader = logs[log_index]
+                _print_log_header(name)
+                _browse_log(open_reader())
             else:
                 print("Invalid selection.")
         except ValueError:
             print("Please enter a valid number or 'all'.")
         except Exception as e:
-            print(f"Error reading log file: {e}")
+            print(f"Error reading log: {e}")
+
+def _available_logs():
+    """
+    (name, reader factory) pairs for every resource in the log store, plus
+    per-resource .log files written by older versions.
+    """
+    logs = {name: partial(resource_log, name) for name in logged_resources()}
+    if os.path.isdir(LOG_DIR):
+        for f in os.listdir(LOG_DIR):
+            if f.endswith('.log') and not f.startswith('segment-'):
+                logs.setdefault(f"{f[:-4]} (legacy)", partial(LogReader, os.path.join(LOG_DIR, f)))
+    return sorted(logs.items())
+
+def _print_log_header(file_name):
+    print(f"\n{'='*60}")
+    print(f"Logs for {file_name}")
+    print(f"{'='*60}")
+
+def _print_lines(lines):
+    if lines:
+        print("\n".join(lines))
+    else:
+        print("No log entries found.")
+
+def _browse_log(reader):
+    """Show the end of a log, then page through it or follow new entries."""
+    lines = reader.tail(LOG_PAGE_SIZE)
+    _print_lines(lines)
+    if not lines:
+        return
+    page = None  # Built lazily: tail() does not need the line index
+    while True:
+        command = input("\n[p]revious, [n]ext, page number, [f]ollow or [q]uit: ").strip().lower()
+        if command in ("", "q", "quit"):
+            return
+        if command == "f":
+            print("Following new entries (Ctrl+C to stop)...")
+            try:
+                for line in reader.follow():
+                    print(line)
+            except KeyboardInterrupt:
+                print()
+            continue
+        pages = reader.page_count(LOG_PAGE_SIZE)
+        if page is None:
+            page = pages
+        if command == "p":
+            page = max(1, page - 1)
+        elif command == "n":
+            page = min(pages, page + 1)
+        elif command.isdigit() and 1 <= int(command) <= pages:
+            page = int(command)
+        else:
+            print(f"Please enter p, n, f, q or a page number (1-{pages}).")
+            continue
+        print(f"--- page {page} of {pages} ---")
+        _print_lines(reader.page(page, LOG_PAGE_SIZE))
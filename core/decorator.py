@@ -1,7 +1,14 @@
-from utils.logger_utils import now_ts, write_log
+from time import perf_counter
+from utils.logger_utils import console_echo, log_event, now_ts, write_log
+from utils.metrics import METRICS
 
-class LoggingDecorator:
-    """Adds logging functionality to resource operations."""
+class ResourceDecorator:
+    """
+    Base for resource decorators: passes everything through to the wrapped
+    resource. Subclasses override start/stop/delete. Decorators must be
+    constructible from the wrapped resource alone, since ColumnarInventory
+    re-applies them by type on every lookup.
+    """
 
     def __init__(self, wrapped):
         self._wrapped = wrapped
@@ -14,6 +21,18 @@ class LoggingDecorator:
     def config(self):
         return self._wrapped.config
 
+    @property
+    def resource_type(self):
+        return self._wrapped.resource_type
+
+    @property
+    def status(self):
+        return self._wrapped.status
+
+    @property
+    def state(self):
+        return self._wrapped.state
+
     @property
     def deleted(self):
         return self._wrapped.deleted
@@ -22,10 +41,40 @@ class LoggingDecorator:
     def deleted(self, value):
         self._wrapped.deleted = value
 
+    def to_dict(self):
+        return self._wrapped.to_dict()
+
+    def validate_config(self):
+        return self._wrapped.validate_config()
+
+    def get_details(self):
+        return self._wrapped.get_details()
+
+    def set_state(self, state):
+        self._wrapped.set_state(state)
+
+    def set_listener(self, listener):
+        self._wrapped.set_listener(listener)
+
+    def start(self):
+        return self._wrapped.start()
+
+    def stop(self):
+        return self._wrapped.stop()
+
+    def delete(self):
+        return self._wrapped.delete()
+
+
+class LoggingDecorator(ResourceDecorator):
+    """Adds logging functionality to resource operations."""
+
     def _log(self, action: str, msg: str):
-        line = f"[{now_ts()}] {self._wrapped.__class__.__name__} '{self._wrapped.name}' {action} - {msg}"
-        print(line)
+        line = f"[{now_ts()}] {self._wrapped.resource_type} '{self._wrapped.name}' {action} - {msg}"
+        if console_echo():
+            print(line)
         write_log(self._wrapped.name, line)
+        log_event(self._wrapped.name, self._wrapped.resource_type, action, msg)
 
     def start(self):
         msg = self._wrapped.start()
@@ -42,14 +91,29 @@ class LoggingDecorator:
         self._log("deleted", msg)
         return msg
 
-    def to_dict(self):
-        return self._wrapped.to_dict()
 
-    def validate_config(self):
-        return self._wrapped.validate_config()
+class MetricsDecorator(ResourceDecorator):
+    """
+    Records the latency and outcome of start, stop and delete in METRICS,
+    labelled by resource type and operation. Wrap it around a
+    LoggingDecorator to include the cost of logging.
+    """
 
-    def get_details(self):
-        return self._wrapped.get_details()
+    def _measure(self, operation: str, call):
+        started = perf_counter()
+        try:
+            result = call()
+        except Exception:
+            METRICS.observe(self._wrapped.resource_type, operation, perf_counter() - started, ok=False)
+            raise
+        METRICS.observe(self._wrapped.resource_type, operation, perf_counter() - started)
+        return result
 
-    def set_state(self, state):
-        self._wrapped.set_state(state)
+    def start(self):
+        return self._measure("start", self._wrapped.start)
+
+    def stop(self):
+        return self._measure("stop", self._wrapped.stop)
+
+    def delete(self):
+        return self._measure("delete", self._wrapped.delete)
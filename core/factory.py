@@ -1,53 +1,112 @@
-from typing import Dict, Type, Any
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from domain.cloud_resource import CloudResource
+from providers import current_provider
 from resources import get
+from resources.schema import CompiledSchema, Field, Schema, compile_schema
+
+# Compiled validators per (factory, resource type), built on first use
+_schemas: Dict[Tuple[type, str], CompiledSchema] = {}
+
+def _same_types(config: Dict[str, Any], data: Dict[str, Any]) -> bool:
+    """Whether `config` holds values of the same types as `data` (1, 1.0 and True are equal)."""
+    if config is data:
+        return True
+    return len(config) == len(data) and all(type(data.get(key)) is type(value) for key, value in config.items())
 
 class ResourceFactory:
-    """Simple registry-based factory."""
+    """
+    Simple registry-based factory.
+    Subclasses declare per-type DEFAULTS (applied to missing keys) and LIMITS
+    (constraints added on top of the resource type's own SCHEMA). Both are
+    compiled together into a single validator per resource type.
+    """
+    DEFAULTS: Dict[str, Dict[str, Any]] = {}
+    LIMITS: Dict[str, Schema] = {}
 
-    @staticmethod
-    def create(resource_type: str, name: str, config: Dict[str, Any]) -> CloudResource:
-        cls = get(resource_type)
-        if not cls:
+    @classmethod
+    def create(cls, resource_type: str, name: str, config: Dict[str, Any]) -> CloudResource:
+        resource_cls = get(resource_type)
+        if not resource_cls:
             raise ValueError(f"Unknown resource type: {resource_type}")
-        instance = cls(name, config)
-        instance.validate_config()
+        schema = cls.schema_for(resource_type)
+        config = cls.apply_defaults(resource_type, config)
+        instance = resource_cls(name, config)
+        # Interned configs are shared, so each distinct config is validated once
+        # per schema, but only if the shared config holds the input's value types
+        if not (instance.config.is_validated(schema) and _same_types(instance.config, config)):
+            schema.validate(instance.config)
+            # The schema covers types that only declare one; extra checks still run
+            if resource_cls.validate_config is not CloudResource.validate_schema:
+                instance.validate_config()
+            instance.config.mark_validated(schema)
+        return instance
+
+    @classmethod
+    def provision(cls, resource_type: str, name: str, config: Dict[str, Any]) -> CloudResource:
+        """
+        create() a resource and register it with the active provider. Resources
+        rebuilt from a journal use create() alone, as they already exist.
+        """
+        instance = cls.create(resource_type, name, config)
+        current_provider().create(instance)
         return instance
 
+    @classmethod
+    def apply_defaults(cls, resource_type: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Return `config` with this factory's defaults filled in (never mutates it)."""
+        defaults = cls.DEFAULTS.get(resource_type.lower())
+        if not defaults:
+            return config
+        config = dict(config)
+        for key, value in defaults.items():
+            config.setdefault(key, value)
+        return config
+
+    @classmethod
+    def schema_for(cls, resource_type: str) -> CompiledSchema:
+        """The compiled validator for `resource_type` under this factory's limits."""
+        key = (cls, resource_type.lower())
+        schema = _schemas.get(key)
+        if schema is None:
+            resource_cls = get(resource_type)
+            if not resource_cls:
+                raise ValueError(f"Unknown resource type: {resource_type}")
+            # Factory limits are checked first, as they were before schemas existed
+            fields: Dict[str, List[Field]] = {}
+            for source in (cls.LIMITS.get(key[1], {}), getattr(resource_cls, "SCHEMA", None) or {}):
+                for name, field in source.items():
+                    fields.setdefault(name, []).extend(field if isinstance(field, (list, tuple)) else [field])
+            schema = _schemas[key] = compile_schema(fields, cls.DEFAULTS.get(key[1]))
+        return schema
+
+    @classmethod
+    def validate_many(cls, resource_type: str, configs: Iterable[Dict[str, Any]]) -> List[List[str]]:
+        """
+        Validate many configs in one pass without creating resources; missing
+        keys take this factory's defaults. Returns every error message per
+        config, in input order.
+        """
+        return cls.schema_for(resource_type).validate_many(configs)
+
+    @classmethod
+    def check_field(cls, resource_type: str, key: str, value: Any) -> Optional[str]:
+        """Validate a single config value; returns the error message or None."""
+        return cls.schema_for(resource_type).check_field(key, value)
+
 class AppResourceFactory(ResourceFactory):
     """Example of a specialized factory for app-related resources."""
-    @staticmethod
-    def create(resource_type: str, name: str, config: Dict[str, Any]) -> CloudResource:
-        if resource_type.lower() == "appservice":
-            config.setdefault("replica_count", 1)
-        return super(AppResourceFactory, AppResourceFactory).create(resource_type, name, config)
+    DEFAULTS = {"appservice": {"replica_count": 1}}
 
 class DatabaseResourceFactory(ResourceFactory):
     """Specialized factory for database-related resources."""
-    @staticmethod
-    def create(resource_type: str, name: str, config: Dict[str, Any]) -> CloudResource:
-        if resource_type.lower() == "cachedb":
-            config.setdefault("eviction_policy", "LRU")
-        return super(DatabaseResourceFactory, DatabaseResourceFactory).create(resource_type, name, config)
+    DEFAULTS = {"cachedb": {"eviction_policy": "LRU"}}
 
 class StorageResourceFactory(ResourceFactory):
     """Factory for storage-related resources like StorageAccount."""
-    @staticmethod
-    def create(resource_type: str, name: str, config: Dict[str, Any]) -> CloudResource:
-        if resource_type.lower() == "storageaccount":
-            config.setdefault("encryption_enabled", True)
-            config.setdefault("max_size_gb", 100)
-            if config.get("max_size_gb") > 1024:
-                raise ValueError("max_size_gb cannot exceed 1024 GB.")
-        return super(StorageResourceFactory, StorageResourceFactory).create(resource_type, name, config)
+    DEFAULTS = {"storageaccount": {"encryption_enabled": True, "max_size_gb": 100}}
+    LIMITS = {"storageaccount": {"max_size_gb": Field("max_size_gb cannot exceed 1024 GB.", le=1024)}}
 
 class CacheResourceFactory(ResourceFactory):
     """Factory for cache-related resources like CacheDB."""
-    @staticmethod
-    def create(resource_type: str, name: str, config: Dict[str, Any]) -> CloudResource:
-        if resource_type.lower() == "cachedb":
-            config.setdefault("eviction_policy", "LRU")
-            config.setdefault("ttl_seconds", 3600)
-            if config.get("ttl_seconds") < 300:
-                raise ValueError("ttl_seconds must be at least 300 seconds.")
-        return super(CacheResourceFactory, CacheResourceFactory).create(resource_type, name, config)
\ No newline at end of file
+    DEFAULTS = {"cachedb": {"eviction_policy": "LRU", "ttl_seconds": 3600}}
+    LIMITS = {"cachedb": {"ttl_seconds": Field("ttl_seconds must be at least 300 seconds.", ge=300)}}
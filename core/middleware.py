@@ -0,0 +1,166 @@
+import threading
+from random import random
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from utils.logger_utils import console_echo, log_event, now_ts, write_log
+from utils.metrics import METRICS, MetricsRegistry
+
+# (resource, action) -> message; what every link of a pipeline looks like
+Handler = Callable[[Any, str], str]
+
+# Log levels understood by LoggingMiddleware
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+_INFO, _WARNING = LEVELS["info"], LEVELS["warning"]
+
+# Past tense used in log lines and events for each lifecycle action
+PAST_TENSE = {"start": "started", "stop": "stopped", "delete": "deleted"}
+
+
+class Middleware:
+    """
+    Interceptor around lifecycle actions. Subclasses override __call__ and
+    call `proceed(resource, action)` to run the rest of the chain. A
+    middleware given `types` only joins the chains of those resource types.
+    """
+
+    def __init__(self, types: Optional[Iterable[str]] = None):
+        self._types = None if types is None else frozenset(t.lower() for t in types)
+
+    def applies_to(self, resource_type: str) -> bool:
+        return self._types is None or resource_type.lower() in self._types
+
+    def __call__(self, resource, action: str, proceed: Handler) -> str:
+        return proceed(resource, action)
+
+
+def _perform(resource, action: str) -> str:
+    return getattr(resource, action)()
+
+
+def _link(middleware: Middleware, proceed: Handler) -> Handler:
+    def handler(resource, action):
+        return middleware(resource, action, proceed)
+    return handler
+
+
+class Pipeline:
+    """
+    Ordered middleware (outermost first) around resource lifecycle actions.
+    The chain for a resource type is composed once, on first use, from the
+    middleware that applies to it; later calls cost one dict lookup plus
+    one call per middleware in the chain. A type with no middleware calls
+    the resource directly. Adding or removing middleware recomposes lazily.
+    """
+
+    def __init__(self, middleware: Iterable[Middleware] = ()):
+        self._middleware: Tuple[Middleware, ...] = tuple(middleware)
+        self._handlers: Dict[str, Handler] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def middleware(self) -> Tuple[Middleware, ...]:
+        return self._middleware
+
+    def __len__(self) -> int:
+        return len(self._middleware)
+
+    def add(self, middleware: Middleware, outermost: bool = False) -> None:
+        """Append `middleware` innermost, or put it in front with `outermost=True`."""
+        with self._lock:
+            self._middleware = (middleware,) + self._middleware if outermost else self._middleware + (middleware,)
+            self._handlers = {}
+
+    def remove(self, middleware: Middleware) -> None:
+        with self._lock:
+            self._middleware = tuple(m for m in self._middleware if m is not middleware)
+            self._handlers = {}
+
+    def handler_for(self, resource_type: str) -> Handler:
+        """The composed chain for `resource_type`."""
+        handler = self._handlers.get(resource_type)
+        if handler is None:
+            with self._lock:
+                handler = _perform
+                for middleware in reversed(self._middleware):
+                    if middleware.applies_to(resource_type):
+                        handler = _link(middleware, handler)
+                # Copy on write, so concurrent lookups never see a dict being resized
+                self._handlers = {**self._handlers, resource_type: handler}
+        return handler
+
+    def run(self, resource, action: str) -> str:
+        """Apply `action` ("start", "stop" or "delete") to `resource` through the chain."""
+        handler = self._handlers.get(resource.resource_type)
+        if handler is None:
+            handler = self.handler_for(resource.resource_type)
+        return handler(resource, action)
+
+
+class LoggingMiddleware(Middleware):
+    """
+    Writes a line to the resource's log for each lifecycle action: successes
+    at "info" (echoed to the console when enabled), rejected actions at
+    "warning". Lines below `level` are dropped, and only `sample_rate` of the
+    info lines are kept (1.0 keeps all).
+    """
+
+    def __init__(self, level: str = "info", sample_rate: float = 1.0, types: Optional[Iterable[str]] = None):
+        super().__init__(types)
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level: {level}")
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        self._log_success = LEVELS[level] <= _INFO
+        self._log_failure = LEVELS[level] <= _WARNING
+        self._sample_rate = sample_rate
+
+    def __call__(self, resource, action: str, proceed: Handler) -> str:
+        try:
+            msg = proceed(resource, action)
+        except Exception as e:
+            if self._log_failure:
+                # Not echoed: the caller reports the error itself
+                write_log(resource.name, f"[{now_ts()}] {resource.resource_type} '{resource.name}' "
+                                         f"{action} failed - {e}")
+            raise
+        if self._log_success and (self._sample_rate == 1.0 or random() < self._sample_rate):
+            line = f"[{now_ts()}] {resource.resource_type} '{resource.name}' {PAST_TENSE.get(action, action)} - {msg}"
+            if console_echo():
+                print(line)
+            write_log(resource.name, line)
+        return msg
+
+
+class EventMiddleware(Middleware):
+    """
+    Records a structured event for every lifecycle action, including
+    rejected ones ("<action>_failed", like "create_failed"). Events are the
+    audit trail, so they are never sampled.
+    """
+
+    def __call__(self, resource, action: str, proceed: Handler) -> str:
+        try:
+            msg = proceed(resource, action)
+        except Exception as e:
+            log_event(resource.name, resource.resource_type, f"{action}_failed", str(e))
+            raise
+        log_event(resource.name, resource.resource_type, PAST_TENSE.get(action, action), msg)
+        return msg
+
+
+class MetricsMiddleware(Middleware):
+    """Records latency and outcome of each lifecycle action in a MetricsRegistry."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, types: Optional[Iterable[str]] = None):
+        super().__init__(types)
+        self._registry = registry or METRICS
+
+    def __call__(self, resource, action: str, proceed: Handler) -> str:
+        started = perf_counter()
+        try:
+            msg = proceed(resource, action)
+        except Exception:
+            self._registry.observe(resource.resource_type, action, perf_counter() - started, ok=False)
+            raise
+        self._registry.observe(resource.resource_type, action, perf_counter() - started)
+        return msg
@@ -1,15 +1,21 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any
-from domain.state import CreatedState
+from domain.config import FrozenConfig
+from domain.lifecycle import LIFECYCLE, PHASE_NAMES, Phase
+from domain.state import STATES_BY_PHASE
+
+_CREATED = int(Phase.CREATED)
+_DELETED = int(Phase.DELETED)
 
 class CloudResource(ABC):
     """Abstract base class for all cloud resources following OOP principles."""
     
     def __init__(self, name: str, config: Dict[str, Any]):
         self._name = self._validate_name(name)
-        self._config = config.copy()  # Defensive copying
+        self._config = FrozenConfig.intern(config)  # Immutable and shared, so no defensive copies
         self._deleted = False
-        self._state = CreatedState(self)
+        self._phase = _CREATED
+        self._listener = None
     
     @property
     def name(self) -> str:
@@ -17,10 +23,25 @@ class CloudResource(ABC):
         return self._name
     
     @property
-    def config(self) -> Dict[str, Any]:
-        """Getter for resource configuration (encapsulation)."""
-        return self._config.copy()  # Return copy to prevent external modification
+    def config(self) -> FrozenConfig:
+        """Getter for resource configuration (read-only view, no copy)."""
+        return self._config
     
+    @property
+    def resource_type(self) -> str:
+        """Registered type name of the resource."""
+        return self.__class__.__name__
+
+    @property
+    def status(self) -> str:
+        """Name of the current lifecycle state."""
+        return PHASE_NAMES[self._phase]
+
+    @property
+    def state(self):
+        """Shared State object for the current phase."""
+        return STATES_BY_PHASE[self._phase]
+
     @property
     def deleted(self) -> bool:
         """Getter for deletion status."""
@@ -32,32 +53,48 @@ class CloudResource(ABC):
         if not isinstance(value, bool):
             raise ValueError("Deleted status must be boolean")
         self._deleted = value
+        if self._listener is not None:
+            self._listener(self)
+    
+    def set_listener(self, listener) -> None:
+        """Register a callback invoked with the resource after every state change."""
+        self._listener = listener
     
     def set_state(self, state):
         """Set the current state (State pattern)."""
-        self._state = state
+        self._phase = int(state.phase)
+        if self._listener is not None:
+            self._listener(self)
+    
+    def _enter(self, phase: int) -> None:
+        """Move to `phase`; called by the lifecycle engine."""
+        self._phase = phase
+        if phase == _DELETED:
+            self._deleted = True
+        if self._listener is not None:
+            self._listener(self)
     
     def start(self) -> str:
-        """Delegate to current state (State pattern)."""
-        return self._state.start()
+        """Apply the start transition (table-driven lifecycle)."""
+        return LIFECYCLE.fire(self, "start")
     
     def stop(self) -> str:
-        """Delegate to current state (State pattern)."""
-        return self._state.stop()
+        """Apply the stop transition (table-driven lifecycle)."""
+        return LIFECYCLE.fire(self, "stop")
     
     def delete(self) -> str:
-        """Delegate to current state (State pattern)."""
-        return self._state.delete()
+        """Apply the delete transition (table-driven lifecycle)."""
+        return LIFECYCLE.fire(self, "delete")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert resource to dictionary representation."""
         return {
             "name": self._name,
             "type": self.__class__.__name__,
-            "status": self._state.name,
+            "status": PHASE_NAMES[self._phase],
             "deleted": self._deleted,
             "details": self.get_details(),
-            "config": self._config.copy()
+            "config": self._config
         }
     
     @staticmethod
@@ -71,9 +108,22 @@ class CloudResource(ABC):
             raise ValueError("Resource name cannot exceed 50 characters")
         return name.strip()
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A SCHEMA stands in for validate_config() unless the type adds its own checks
+        if getattr(cls, "SCHEMA", None) is not None and getattr(cls.validate_config, "__isabstractmethod__", False):
+            cls.validate_config = CloudResource.validate_schema
+    
+    def validate_schema(self) -> None:
+        """Check the config against the SCHEMA compiled when the type was registered."""
+        self.compiled_schema.validate(self.config)
+    
     @abstractmethod
     def validate_config(self) -> None:
-        """Validate resource-specific configuration (Template Method pattern)."""
+        """
+        Validate resource-specific configuration (Template Method pattern).
+        Types that declare a SCHEMA need not implement it.
+        """
         pass
     
     @abstractmethod
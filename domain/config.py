@@ -0,0 +1,83 @@
+import threading
+import weakref
+from typing import Any, Dict, Mapping
+
+
+def _intern_key(data: Mapping[str, Any]) -> frozenset:
+    # 1, 1.0 and True are equal and hash alike, so the value's type is part of
+    # the key; otherwise {"x": 1} would be answered with an interned {"x": True}
+    return frozenset((key, type(value), value) for key, value in data.items())
+
+
+def _readonly(*args, **kwargs):
+    raise TypeError("FrozenConfig is read-only; use with_changes() to derive a new config")
+
+
+class FrozenConfig(dict):
+    """
+    Immutable, hashable resource configuration.
+    It is a dict subclass, so reads, iteration and JSON serialization work as
+    before without copying, but every mutating method raises TypeError.
+    `FrozenConfig.intern()` returns one shared instance per distinct config;
+    configs whose values are equal but of different types are not shared.
+    """
+
+    __slots__ = ("_hash", "_validated_by", "__weakref__")
+
+    _interned: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+    _intern_lock = threading.Lock()
+
+    def __init__(self, data: Mapping[str, Any] = ()):
+        super().__init__(data)
+        self._hash = None
+        self._validated_by = set()
+
+    @classmethod
+    def intern(cls, data: Mapping[str, Any]) -> "FrozenConfig":
+        """Return the shared FrozenConfig equal to `data` (hash-consing)."""
+        if type(data) is cls and data._is_interned():
+            return data
+        try:
+            key = _intern_key(data)
+        except TypeError:
+            # Unhashable values (lists, dicts) cannot be shared
+            return data if type(data) is cls else cls(data)
+        with cls._intern_lock:
+            config = cls._interned.get(key)
+            if config is None:
+                config = data if type(data) is cls else cls(data)
+                cls._interned[key] = config
+            return config
+
+    def with_changes(self, **changes: Any) -> "FrozenConfig":
+        """Return an interned copy of this config with `changes` applied."""
+        return FrozenConfig.intern({**self, **changes})
+
+    def mark_validated(self, resource_class: type) -> None:
+        """Record that `resource_class` accepted this config."""
+        self._validated_by.add(resource_class)
+
+    def is_validated(self, resource_class: type) -> bool:
+        return resource_class in self._validated_by
+
+    def copy(self) -> Dict[str, Any]:
+        """Return a regular, mutable dict copy."""
+        return dict(self)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __reduce__(self):
+        return (FrozenConfig, (dict(self),))
+
+    def _is_interned(self) -> bool:
+        try:
+            return self._interned.get(_intern_key(self)) is self
+        except TypeError:
+            return False
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
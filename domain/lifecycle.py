@@ -0,0 +1,100 @@
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Phase(IntEnum):
+    """Lifecycle phase of a resource, stored on the resource as a small int."""
+    CREATED = 0
+    STARTED = 1
+    STOPPED = 2
+    DELETED = 3
+
+
+PHASE_NAMES = tuple(phase.name.lower() for phase in Phase)
+PHASES_BY_NAME = {name: Phase(i) for i, name in enumerate(PHASE_NAMES)}
+
+ACTIONS = ("start", "stop", "delete")
+
+# (phase, action) -> (target phase, message) for allowed transitions, or
+# (None, error) for rejected ones. Messages are formatted with the resource name.
+TRANSITIONS: Dict[Tuple[Phase, str], Tuple[Optional[Phase], str]] = {
+    (Phase.CREATED, "start"): (Phase.STARTED, "{name} started."),
+    (Phase.CREATED, "stop"): (None, "Cannot stop: not started."),
+    (Phase.CREATED, "delete"): (Phase.DELETED, "{name} deleted."),
+
+    (Phase.STARTED, "start"): (None, "Already started."),
+    (Phase.STARTED, "stop"): (Phase.STOPPED, "{name} stopped."),
+    (Phase.STARTED, "delete"): (None, "Stop first before deleting."),
+
+    (Phase.STOPPED, "start"): (Phase.STARTED, "{name} started again."),
+    (Phase.STOPPED, "stop"): (None, "Already stopped."),
+    (Phase.STOPPED, "delete"): (Phase.DELETED, "{name} deleted."),
+
+    (Phase.DELETED, "start"): (None, "Cannot start deleted resource."),
+    (Phase.DELETED, "stop"): (None, "Cannot stop deleted resource."),
+    (Phase.DELETED, "delete"): (None, "Already deleted."),
+}
+
+# Hooks receive (resource, action, source phase, target phase)
+Hook = Callable[[object, str, Phase, Phase], None]
+
+
+class LifecycleEngine:
+    """
+    Applies lifecycle actions to resources by looking them up in a
+    declarative transition table. Pre-hooks run before the phase changes and
+    may veto it by raising; post-hooks run after it.
+    """
+
+    def __init__(self, transitions: Dict[Tuple[Phase, str], Tuple[Optional[Phase], str]] = TRANSITIONS):
+        # Rows are indexed by phase value for a list lookup instead of hashing
+        # a tuple; phases are kept as plain ints on the hot path
+        self._rows: List[Dict[str, Tuple[Optional[int], str]]] = [{} for _ in Phase]
+        for (phase, action), (target, message) in transitions.items():
+            if target is not None:
+                message = message.replace("{name}", "%s")
+            self._rows[phase][action] = (None if target is None else int(target), message)
+        self._pre_hooks: List[Hook] = []
+        self._post_hooks: List[Hook] = []
+
+    def add_pre_hook(self, hook: Hook) -> None:
+        self._pre_hooks.append(hook)
+
+    def add_post_hook(self, hook: Hook) -> None:
+        self._post_hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Unregister a pre- or post-hook."""
+        for hooks in (self._pre_hooks, self._post_hooks):
+            if hook in hooks:
+                hooks.remove(hook)
+
+    def check(self, phase: int, action: str) -> None:
+        """Raise what fire() would for `action` in `phase`, without changing anything."""
+        outcome = self._rows[phase].get(action)
+        if outcome is None:
+            raise ValueError(f"Unknown lifecycle action: {action}")
+        if outcome[0] is None:
+            raise RuntimeError(outcome[1])
+
+    def fire(self, resource, action: str) -> str:
+        """Apply `action` to `resource`; raises RuntimeError if not allowed."""
+        source = resource._phase
+        outcome = self._rows[source].get(action)
+        if outcome is None:
+            raise ValueError(f"Unknown lifecycle action: {action}")
+        target, message = outcome
+        if target is None:
+            raise RuntimeError(message)
+        if self._pre_hooks:
+            for hook in self._pre_hooks:
+                hook(resource, action, Phase(source), Phase(target))
+        resource._enter(target)
+        if self._post_hooks:
+            for hook in self._post_hooks:
+                hook(resource, action, Phase(source), Phase(target))
+        return message % resource._name
+
+
+# Engine shared by all resources
+LIFECYCLE = LifecycleEngine()
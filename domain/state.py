@@ -1,66 +1,71 @@
-from abc import ABC, abstractmethod
-
-class State(ABC):
-    def __init__(self, resource):
-        self._resource = resource
+from domain.lifecycle import LIFECYCLE, Phase
+
+class State:
+    """
+    Stateless, shared lifecycle state (flyweight).
+    Each subclass has exactly one instance; `CreatedState(resource)` returns
+    it, so existing callers keep working without allocating per transition.
+    The resource itself only stores the state's Phase.
+    """
+    phase: Phase = None
+
+    def __new__(cls, resource=None):
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+    def __init__(self, resource=None):
+        pass
 
     @property
-    @abstractmethod
     def name(self) -> str:
-        pass
+        return self.phase.name.lower()
 
-    @abstractmethod
-    def start(self) -> str: pass
-    @abstractmethod
-    def stop(self) -> str: pass
-    @abstractmethod
-    def delete(self) -> str: pass
+    def start(self, resource) -> str:
+        return LIFECYCLE.fire(resource, "start")
 
+    def stop(self, resource) -> str:
+        return LIFECYCLE.fire(resource, "stop")
 
-class CreatedState(State):
-    @property
-    def name(self): return "created"
+    def delete(self, resource) -> str:
+        return LIFECYCLE.fire(resource, "delete")
 
-    def start(self):
-        self._resource.set_state(StartedState(self._resource))
-        return f"{self._resource.name} started."
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
 
-    def stop(self): raise RuntimeError("Cannot stop: not started.")
-    def delete(self):
-        self._resource.deleted = True
-        self._resource.set_state(DeletedState(self._resource))
-        return f"{self._resource.name} deleted."
 
+class CreatedState(State):
+    phase = Phase.CREATED
 
-class StartedState(State):
-    @property
-    def name(self): return "started"
 
-    def start(self): raise RuntimeError("Already started.")
-    def stop(self):
-        self._resource.set_state(StoppedState(self._resource))
-        return f"{self._resource.name} stopped."
-    def delete(self): raise RuntimeError("Stop first before deleting.")
+class StartedState(State):
+    phase = Phase.STARTED
 
 
 class StoppedState(State):
-    @property
-    def name(self): return "stopped"
-
-    def start(self):
-        self._resource.set_state(StartedState(self._resource))
-        return f"{self._resource.name} started again."
-    def stop(self): raise RuntimeError("Already stopped.")
-    def delete(self):
-        self._resource.deleted = True
-        self._resource.set_state(DeletedState(self._resource))
-        return f"{self._resource.name} deleted."
+    phase = Phase.STOPPED
 
 
 class DeletedState(State):
-    @property
-    def name(self): return "deleted"
-
-    def start(self): raise RuntimeError("Cannot start deleted resource.")
-    def stop(self): raise RuntimeError("Cannot stop deleted resource.")
-    def delete(self): raise RuntimeError("Already deleted.")
\ No newline at end of file
+    phase = Phase.DELETED
+
+
+# Lookup of state classes by name, used to restore persisted resources
+STATES = {
+    "created": CreatedState,
+    "started": StartedState,
+    "stopped": StoppedState,
+    "deleted": DeletedState,
+}
+
+# Shared state instances indexed by Phase value
+STATES_BY_PHASE = tuple(STATES[phase.name.lower()]() for phase in Phase)
+
+def state_for(name: str, resource=None) -> State:
+    """Return the shared State called `name`."""
+    try:
+        return STATES[name](resource)
+    except KeyError:
+        raise ValueError(f"Unknown state: {name}")
@@ -0,0 +1,84 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+from domain.lifecycle import LIFECYCLE
+
+# Provider implementations that need extra modules (HttpProvider in
+# providers.http_provider, the mock server) are imported only when used.
+
+
+class Provider(ABC):
+    """
+    Adapter between resources and the control plane that actually runs them.
+    `ResourceFactory.provision()` calls create() for every new resource, and
+    each lifecycle transition calls transition() before the local state
+    changes, so a provider error vetoes the transition.
+    """
+
+    @abstractmethod
+    def create(self, resource) -> None:
+        """Create `resource` in the control plane; raise RuntimeError on failure."""
+
+    @abstractmethod
+    def transition(self, resource, action: str) -> None:
+        """Apply "start", "stop" or "delete" remotely; raise RuntimeError on failure."""
+
+    def apply_many(self, operations: Sequence[Tuple[str, object]]) -> List[Optional[str]]:
+        """
+        Run many (action, resource) operations, where action may also be
+        "create". Returns None or an error message per operation, in order.
+        """
+        errors: List[Optional[str]] = []
+        for action, resource in operations:
+            try:
+                if action == "create":
+                    self.create(resource)
+                else:
+                    self.transition(resource, action)
+                errors.append(None)
+            except Exception as e:
+                errors.append(str(e))
+        return errors
+
+    def close(self) -> None:
+        """Release connections held by the provider."""
+
+
+class LocalProvider(Provider):
+    """Default provider: resources live only in this process, so nothing is called."""
+
+    def create(self, resource) -> None:
+        pass
+
+    def transition(self, resource, action: str) -> None:
+        pass
+
+
+_provider: Provider = LocalProvider()
+_provider_lock = threading.Lock()
+
+
+def current_provider() -> Provider:
+    return _provider
+
+
+def set_provider(provider: Optional[Provider]) -> Provider:
+    """
+    Install `provider` for every factory and lifecycle transition (None
+    restores LocalProvider) and return the previous one. The lifecycle hook
+    is registered only while a non-local provider is installed, so local use
+    pays nothing per transition.
+    """
+    global _provider
+    with _provider_lock:
+        previous = _provider
+        _provider = provider if provider is not None else LocalProvider()
+        LIFECYCLE.remove_hook(_on_transition)
+        if not isinstance(_provider, LocalProvider):
+            LIFECYCLE.add_pre_hook(_on_transition)
+    return previous
+
+
+def _on_transition(resource, action, source, target) -> None:
+    _provider.transition(resource, action)
@@ -0,0 +1,236 @@
+import http.client
+import json
+import queue
+import select
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, urlsplit
+
+from providers import Provider
+
+
+class _Pending:
+    """
+    One operation waiting for a batch to carry it. `done` is set when it
+    has finished, or when its caller was handed a sender slot (`lead`).
+    """
+
+    __slots__ = ("operation", "done", "error", "finished", "lead")
+
+    def __init__(self, operation: Dict[str, Any]):
+        self.operation = operation
+        self.done = threading.Event()
+        self.error: Optional[str] = None
+        self.finished = False
+        self.lead = False
+
+
+def _dropped(connection: http.client.HTTPConnection) -> bool:
+    """Whether an idle keep-alive connection was closed by the server (it is readable at EOF)."""
+    if connection.sock is None:
+        return True
+    try:
+        return bool(select.select([connection.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+class HttpProvider(Provider):
+    """
+    Provider for a control plane speaking the JSON API of
+    `providers.mock_server.MockControlPlane`.
+
+    Connections use HTTP/1.1 keep-alive and up to `pool_size` of them are
+    kept open, so most requests skip the TCP handshake. At most `pool_size`
+    requests are in flight; operations arriving while they are busy queue up
+    and the next free connection sends them together as one /batch request
+    of up to `batch_size` operations (group commit, as the log sink does for
+    writes). A single caller therefore waits no longer than before, and
+    concurrent bulk operations need far fewer round trips.
+
+    With `pooled=False` every request opens and closes its own connection and
+    nothing is batched; benchmarks use that as the baseline.
+    """
+
+    def __init__(self, base_url: str, pool_size: int = 8, batch_size: int = 64, timeout: float = 10.0,
+                 pooled: bool = True):
+        if pool_size < 1 or batch_size < 1:
+            raise ValueError("pool_size and batch_size must be positive")
+        parts = urlsplit(base_url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Unsupported control plane URL: {base_url}")
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._pooled = pooled
+        self._pool_size = pool_size
+        self._batch_size = batch_size
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+        self._pending: List[_Pending] = []
+        self._senders = 0
+        self._stats = {"requests": 0, "connections": 0, "batches": 0}
+        self._lock = threading.Lock()
+
+    def create(self, resource) -> None:
+        self._call(self._operation("create", resource))
+
+    def transition(self, resource, action: str) -> None:
+        self._call(self._operation(action, resource))
+
+    def apply_many(self, operations: Sequence[Tuple[str, Any]]) -> List[Optional[str]]:
+        """Send the operations in /batch requests of up to `batch_size`."""
+        errors: List[Optional[str]] = []
+        for i in range(0, len(operations), self._batch_size):
+            batch = [_Pending(self._operation(action, resource))
+                     for action, resource in operations[i:i + self._batch_size]]
+            self._send(batch)
+            errors.extend(pending.error for pending in batch)
+        return errors
+
+    def stats(self) -> Dict[str, int]:
+        """HTTP requests sent, connections opened and /batch requests sent so far."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _call(self, operation: Dict[str, Any]) -> None:
+        pending = _Pending(operation)
+        if not self._pooled:
+            self._send([pending])
+        else:
+            with self._lock:
+                self._pending.append(pending)
+                pending.lead = self._senders < self._pool_size
+                if pending.lead:
+                    self._senders += 1
+            if not pending.lead:
+                pending.done.wait()
+                with self._lock:
+                    if not pending.finished:
+                        pending.done.clear()  # Woken to send; wait for completion later
+            if pending.lead:
+                self._drain(pending)
+                pending.done.wait()
+        if pending.error is not None:
+            raise RuntimeError(pending.error)
+
+    def _drain(self, own: _Pending) -> None:
+        # Send whatever has queued up until this caller's operation is done,
+        # then pass the sender slot to a waiting caller, so that no caller
+        # keeps sending for others under steady load
+        while True:
+            with self._lock:
+                if own.finished or not self._pending:
+                    successor = next((p for p in self._pending if not p.lead), None)
+                    if successor is None:
+                        self._senders -= 1
+                    else:
+                        successor.lead = True
+                        successor.done.set()
+                    return
+                batch = self._pending[:self._batch_size]
+                del self._pending[:self._batch_size]
+            self._send(batch)
+
+    def _send(self, batch: List[_Pending]) -> None:
+        try:
+            if len(batch) == 1:
+                operation = batch[0].operation
+                name = quote(operation["name"], safe="")
+                if operation["op"] == "create":
+                    self._request("PUT", f"/resources/{name}",
+                                  {"type": operation["type"], "config": operation["config"]})
+                else:
+                    self._request("POST", f"/resources/{name}/{quote(operation['op'], safe='')}")
+            else:
+                results = self._request("POST", "/batch", {"operations": [p.operation for p in batch]})["results"]
+                with self._lock:
+                    self._stats["batches"] += 1
+                if not isinstance(results, list) or len(results) != len(batch):
+                    # Results cannot be matched to operations, so none of them count
+                    count = len(results) if isinstance(results, list) else "no"
+                    raise RuntimeError(f"Control plane returned {count} results for {len(batch)} operations")
+                for pending, result in zip(batch, results):
+                    pending.error = None if result.get("ok") else result.get("error", "Unknown error")
+        except Exception as e:
+            # Every operation of a failed request fails; none may appear to succeed
+            for pending in batch:
+                pending.error = str(e) if isinstance(e, RuntimeError) else f"Control plane request failed: {e}"
+        finally:
+            with self._lock:
+                for pending in batch:
+                    pending.finished = True
+                    pending.done.set()
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        payload = None if body is None else json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if not self._pooled:
+            headers["Connection"] = "close"
+        # Idle connections the server has closed are dropped before reuse. A
+        # request is sent again only if sending it on a reused connection
+        # failed, as the server cannot have received all of it; once it is
+        # sent, a failure may follow a change the server already applied
+        for attempt in range(2):
+            connection, reused = self._acquire()
+            try:
+                connection.request(method, self._prefix + path, payload, headers)
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                if reused and attempt == 0:
+                    continue
+                raise RuntimeError(f"Control plane request failed: {e}")
+            try:
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                raise RuntimeError(f"Control plane request failed after it was sent; "
+                                   f"it may have been applied: {e}")
+            with self._lock:
+                self._stats["requests"] += 1
+            self._release(connection, response)
+            try:
+                result = json.loads(data) if data else {}
+            except ValueError:
+                raise RuntimeError(f"Invalid control plane response (HTTP {response.status})")
+            if response.status >= 400:
+                raise RuntimeError(result.get("error") or f"HTTP {response.status}")
+            return result
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        if self._pooled:
+            while True:
+                try:
+                    connection = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if not _dropped(connection):
+                    return connection, True
+                connection.close()
+        with self._lock:
+            self._stats["connections"] += 1
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout), False
+
+    def _release(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        if not self._pooled or response.will_close:
+            connection.close()
+            return
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    @staticmethod
+    def _operation(action: str, resource) -> Dict[str, Any]:
+        if action == "create":
+            return {"op": "create", "name": resource.name, "type": resource.resource_type,
+                    "config": resource.config}
+        return {"op": action, "name": resource.name}
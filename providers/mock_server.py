@@ -0,0 +1,202 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from domain.lifecycle import TRANSITIONS, Phase
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests unless asked otherwise
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, delayed ACKs stall keep-alive requests
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.plane._count("connections")
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = self._parts()
+        if len(parts) == 2 and parts[0] == "resources":
+            self._reply(*self.server.plane.describe(parts[1]))
+        else:
+            self._reply(404, {"error": f"No route for {self.path}"})
+
+    def do_PUT(self):
+        parts = self._parts()
+        body = self._body()
+        if len(parts) == 2 and parts[0] == "resources" and body is not None:
+            self._reply(*self.server.plane.handle({"op": "create", "name": parts[1], "type": body.get("type"),
+                                                   "config": body.get("config")}))
+        else:
+            self._reply(400, {"error": "Expected PUT /resources/<name> with a JSON object"})
+
+    def do_POST(self):
+        parts = self._parts()
+        body = self._body()
+        if parts == ["batch"] and body is not None:
+            self._reply(200, {"results": self.server.plane.handle_batch(body.get("operations") or [])})
+        elif len(parts) == 3 and parts[0] == "resources":
+            self._reply(*self.server.plane.handle({"op": parts[2], "name": parts[1]}))
+        else:
+            self._reply(404, {"error": f"No route for {self.path}"})
+
+    def _parts(self) -> List[str]:
+        return [unquote(part) for part in self.path.split("?", 1)[0].strip("/").split("/")]
+
+    def _body(self) -> Optional[Dict[str, Any]]:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 resets connections under bursts of new clients
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class MockControlPlane:
+    """
+    Local stand-in for a cloud control plane, for tests and benchmarks.
+
+    Serves the JSON API that HttpProvider speaks from a background thread:
+    PUT /resources/<name> creates, POST /resources/<name>/<action> applies a
+    lifecycle action and POST /batch runs a list of such operations. States
+    are kept in memory and follow the same transition table as local
+    resources. Every request waits `latency` seconds first (once per batch).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self._address = (host, port)
+        self._latency = latency
+        self._resources: Dict[str, List[Any]] = {}
+        self._stats = {"connections": 0, "requests": 0, "operations": 0}
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Mock control plane is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockControlPlane":
+        self._server = _Server(self._address, _Handler)
+        self._server.plane = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-control-plane", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def __enter__(self) -> "MockControlPlane":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Connections accepted, HTTP requests served and operations applied so far."""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self) -> None:
+        """Forget every resource and zero the counters."""
+        with self._lock:
+            self._resources.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+    def describe(self, name: str) -> Tuple[int, Dict[str, Any]]:
+        self._count("requests")
+        with self._lock:
+            entry = self._resources.get(name)
+            if entry is None:
+                return 404, {"error": f"Resource '{name}' not found"}
+            return 200, {"name": name, "type": entry[0], "status": Phase(entry[1]).name.lower()}
+
+    def handle(self, operation: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        self._count("requests")
+        self._wait()
+        return self._apply(operation)
+
+    def handle_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self._count("requests")
+        self._wait()
+        results = []
+        for operation in operations:
+            status, body = self._apply(operation)
+            results.append({"ok": True} if status < 400 else {"ok": False, "error": body["error"]})
+        return results
+
+    def _apply(self, operation: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        action, name = operation.get("op"), operation.get("name")
+        with self._lock:
+            self._stats["operations"] += 1
+            if action == "create":
+                if name in self._resources:
+                    return 409, {"error": f"Resource '{name}' already exists"}
+                self._resources[name] = [operation.get("type"), int(Phase.CREATED)]
+                return 201, {"status": "created"}
+            entry = self._resources.get(name)
+            if entry is None:
+                return 404, {"error": f"Resource '{name}' not found"}
+            outcome = TRANSITIONS.get((Phase(entry[1]), action))
+            if outcome is None:
+                return 400, {"error": f"Unknown lifecycle action: {action}"}
+            target, message = outcome
+            if target is None:
+                return 409, {"error": message}
+            entry[1] = int(target)
+            return 200, {"status": target.name.lower()}
+
+    def _wait(self) -> None:
+        if self._latency:
+            time.sleep(self._latency)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the mock control plane until interrupted")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    args = parser.parse_args()
+    with MockControlPlane(args.host, args.port, args.latency) as plane:
+        print(f"Mock control plane listening on {plane.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,73 @@
+import importlib
+import threading
+from typing import Dict, List
+
+from resources.schema import compile_schema
+
+# Built-in resource types: lower-cased type name -> module that registers it.
+# Modules are imported on the first get() of their type, not at startup.
+MANIFEST: Dict[str, str] = {
+    "appservice": "resources.app_service",
+    "storageaccount": "resources.storage_account",
+    "cachedb": "resources.cache_db",
+}
+
+# Third-party packages can add types under this entry point group, e.g.
+#   [project.entry-points."cloudconnect.resources"]
+#   QueueService = "mypkg.queue_service"
+ENTRY_POINT_GROUP = "cloudconnect.resources"
+
 _registry = {}
+_entry_points_loaded = False
+_load_lock = threading.RLock()
 
 def register(name):
     def decorator(cls):
+        # Declarative schemas are compiled once, when the type is registered
+        if getattr(cls, "SCHEMA", None) is not None:
+            cls.compiled_schema = compile_schema(cls.SCHEMA)
         _registry[name.lower()] = cls
         return cls
     return decorator
 
 def get(name):
-    return _registry.get(name.lower())
+    key = name.lower()
+    cls = _registry.get(key)
+    if cls is None:
+        cls = _load(key)
+    return cls
+
+def available() -> List[str]:
+    """Names of every known resource type, without importing any of them."""
+    _load_entry_points()
+    return sorted(set(MANIFEST) | set(_registry))
+
+def _load(key):
+    """Import the module that provides `key` (manifest first, then entry points)."""
+    with _load_lock:
+        if key in _registry:
+            return _registry[key]
+        if key not in MANIFEST:
+            _load_entry_points()
+        module = MANIFEST.get(key)
+        if module is not None:
+            importlib.import_module(module)
+        return _registry.get(key)
+
+def _load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    with _load_lock:
+        if _entry_points_loaded:
+            return
+        _entry_points_loaded = True
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:  # Python < 3.8
+            return
+        eps = entry_points()
+        group = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, ())
+        for ep in group:
+            # The value names the module; a ":attr" suffix is tolerated
+            MANIFEST.setdefault(ep.name.lower(), ep.value.split(":")[0].strip())
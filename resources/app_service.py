@@ -1,5 +1,6 @@
 from domain.cloud_resource import CloudResource
 from resources import register
+from resources.schema import Field
 
 @register("AppService")
 class AppService(CloudResource):
@@ -7,14 +8,11 @@ class AppService(CloudResource):
     VALID_REGIONS = {"EastUS", "WestEurope", "CentralIndia"}
     VALID_REPLICAS = {1, 2, 3}
 
-    def validate_config(self):
-        r = self.config
-        if r.get("runtime") not in self.VALID_RUNTIMES:
-            raise ValueError("Invalid runtime.")
-        if r.get("region") not in self.VALID_REGIONS:
-            raise ValueError("Invalid region.")
-        if r.get("replica_count") not in self.VALID_REPLICAS:
-            raise ValueError("Invalid replica count.")
+    SCHEMA = {
+        "runtime": Field("Invalid runtime.", choices=VALID_RUNTIMES),
+        "region": Field("Invalid region.", choices=VALID_REGIONS),
+        "replica_count": Field("Invalid replica count.", choices=VALID_REPLICAS),
+    }
 
     def get_details(self):
-        return f"{self.name} ({self.config['runtime']} in {self.config['region']})"
\ No newline at end of file
+        return f"{self.name} ({self.config['runtime']} in {self.config['region']})"
@@ -1,13 +1,49 @@
+import threading
 from domain.cloud_resource import CloudResource
+from domain.lifecycle import Phase
 from resources import register
+from resources.cache_engine import CacheEngine
+from resources.schema import Field
+
+_STARTED = int(Phase.STARTED)
 
 @register("CacheDB")
 class CacheDB(CloudResource):
-    def validate_config(self):
-        if self.config.get("eviction_policy") not in {"LRU", "FIFO"}:
-            raise ValueError("Invalid eviction policy.")
-        if self.config.get("ttl_seconds", 0) <= 0:
-            raise ValueError("ttl_seconds must be positive.")
+    VALID_EVICTION_POLICIES = {"LRU", "FIFO"}
+
+    SCHEMA = {
+        "eviction_policy": Field("Invalid eviction policy.", choices=VALID_EVICTION_POLICIES),
+        "ttl_seconds": Field("ttl_seconds must be positive.", type=(int, float), gt=0, default=0),
+        "capacity_mb": Field("capacity_mb must be positive.", type=(int, float), gt=0, required=False),
+    }
+
+    # Data plane of a running cache: built on first use after start and
+    # dropped when the cache leaves the started state, contents included
+    _engine = None
+    _engine_lock = threading.Lock()
+
+    @property
+    def data(self) -> CacheEngine:
+        """get/set/delete/mget/mset/stats of the running cache; RuntimeError unless started."""
+        if self._phase != _STARTED:
+            raise RuntimeError(f"CacheDB '{self.name}' is not running")
+        engine = self._engine
+        if engine is None:
+            with self._engine_lock:
+                engine = self._engine
+                if engine is None:
+                    engine = self._engine = CacheEngine.from_config(self.config)
+        return engine
+
+    def _enter(self, phase: int) -> None:
+        super()._enter(phase)
+        if phase != _STARTED and self._engine is not None:
+            self._engine = None
+
+    def set_state(self, state):
+        super().set_state(state)
+        if self._phase != _STARTED and self._engine is not None:
+            self._engine = None
 
     def get_details(self):
-        return f"{self.name} (ttl={self.config['ttl_seconds']}s, policy={self.config['eviction_policy']})"
\ No newline at end of file
+        return f"{self.name} (ttl={self.config['ttl_seconds']}s, policy={self.config['eviction_policy']})"
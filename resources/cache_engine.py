@@ -0,0 +1,282 @@
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+EVICTION_POLICIES = ("LRU", "FIFO")
+
+# Approximate bookkeeping bytes per key (hash table slots, entry tuple, timer)
+# charged against the capacity on top of the key and value sizes
+ENTRY_OVERHEAD = 96
+
+
+def _size_of(obj: Any) -> int:
+    if isinstance(obj, (bytes, bytearray, str)):
+        return len(obj)
+    return sys.getsizeof(obj)
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel for key expiry. Level l has 2**bits slots
+    that each span 2**(bits * l) ticks, so four levels of 64 slots cover
+    2**24 ticks; later deadlines wait in the last level and are re-placed
+    when reached. schedule() and cancel() are O(1). advance() empties one
+    level-0 slot per tick and, when a level wraps, cascades the matching
+    slot of the level above down, so an entry moves at most `levels - 1`
+    times before it expires. Nothing ever scans every key.
+    """
+
+    def __init__(self, tick: float = 1.0, start: float = 0.0, bits: int = 6, levels: int = 4):
+        if tick <= 0 or bits < 1 or levels < 1:
+            raise ValueError("tick, bits and levels must be positive")
+        self._tick = tick
+        self._bits = bits
+        self._mask = (1 << bits) - 1
+        self._wheels: List[List[Dict[Any, int]]] = [[{} for _ in range(1 << bits)] for _ in range(levels)]
+        self._spans = [1 << (bits * (level + 1)) for level in range(levels)]
+        self._now = int(start // tick)
+        self._where: Dict[Any, Dict[Any, int]] = {}
+        # Time at which advance() next has work to do
+        self.next_at = (self._now + 1) * tick
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Any, deadline: float) -> None:
+        """Expire `key` at `deadline` (rounded up to a tick), replacing any earlier schedule."""
+        slot = self._where.get(key)
+        if slot is not None:
+            del slot[key]
+        self._place(key, max(self._now + 1, math.ceil(deadline / self._tick)))
+
+    def cancel(self, key: Any) -> bool:
+        slot = self._where.pop(key, None)
+        if slot is None:
+            return False
+        del slot[key]
+        return True
+
+    def advance(self, now: float) -> List[Any]:
+        """Move the wheel to `now` and return the keys that expired on the way."""
+        target = int(now // self._tick)
+        expired: List[Any] = []
+        if not self._where:
+            self._now = max(self._now, target)
+        bits, mask, wheels = self._bits, self._mask, self._wheels
+        while self._now < target:
+            self._now += 1
+            tick = self._now
+            if not tick & mask:
+                # Cascade from the highest level whose position also wrapped
+                top = 1
+                while top + 1 < len(wheels) and not (tick >> (bits * top)) & mask:
+                    top += 1
+                for level in range(min(top, len(wheels) - 1), 0, -1):
+                    index = (tick >> (bits * level)) & mask
+                    slot = wheels[level][index]
+                    if slot:
+                        wheels[level][index] = {}
+                        for key, due in slot.items():
+                            self._place(key, due)
+            index = tick & mask
+            slot = wheels[0][index]
+            if slot:
+                wheels[0][index] = {}
+                for key, due in slot.items():
+                    if due <= tick:
+                        del self._where[key]
+                        expired.append(key)
+                    else:
+                        # Beyond the wheel's range when scheduled; place it again
+                        self._place(key, due)
+        self.next_at = (self._now + 1) * self._tick
+        return expired
+
+    def _place(self, key: Any, due: int) -> None:
+        delta = min(due - self._now, self._spans[-1] - 1)
+        level = 0
+        while delta >= self._spans[level]:
+            level += 1
+        slot = self._wheels[level][((self._now + delta) >> (self._bits * level)) & self._mask]
+        slot[key] = due
+        self._where[key] = slot
+
+
+class CacheEngine:
+    """
+    In-process key-value store behind a running CacheDB.
+
+    Entries live in an OrderedDict, so both eviction policies are O(1):
+    LRU moves a key to the end on every hit and set, FIFO keeps insertion
+    order, and eviction pops the front. (A plain dict would degrade when
+    its first key is popped repeatedly.) Each key is charged its key and
+    value size plus ENTRY_OVERHEAD against `capacity_bytes`; entries are
+    evicted until a set fits. Expiry is driven by a TimingWheel that is
+    advanced on each call, so a key lives at most one tick past its TTL
+    and idle expiry costs nothing. Thread-safe.
+    """
+
+    def __init__(self, capacity_bytes: Optional[int] = None, eviction_policy: str = "LRU",
+                 ttl_seconds: float = 0, clock: Callable[[], float] = time.monotonic, tick: float = 1.0):
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+        if capacity_bytes is not None and capacity_bytes <= 0:
+            raise ValueError("capacity_bytes must be positive")
+        self._capacity = capacity_bytes
+        self._lru = eviction_policy == "LRU"
+        self._policy = eviction_policy
+        self._ttl = ttl_seconds or 0
+        self._clock = clock
+        self._entries: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()
+        self._wheel = TimingWheel(tick, clock())
+        self._used = 0
+        self._hits = self._misses = self._sets = self._deletes = 0
+        self._evictions = self._expirations = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], **kwargs) -> "CacheEngine":
+        """Engine for a CacheDB config (capacity_mb, eviction_policy, ttl_seconds)."""
+        capacity_mb = config.get("capacity_mb")
+        return cls(capacity_bytes=int(capacity_mb * 2 ** 20) if capacity_mb else None,
+                   eviction_policy=config.get("eviction_policy") or "LRU",
+                   ttl_seconds=config.get("ttl_seconds") or 0, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            if self._lru:
+                self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def mget(self, keys: Iterable[Any], default: Any = None) -> List[Any]:
+        """Values for `keys` in order, with `default` for misses."""
+        values = []
+        with self._lock:
+            self._expire()
+            entries, lru = self._entries, self._lru
+            for key in keys:
+                entry = entries.get(key)
+                if entry is None:
+                    self._misses += 1
+                    values.append(default)
+                    continue
+                if lru:
+                    entries.move_to_end(key)
+                self._hits += 1
+                values.append(entry[0])
+        return values
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store `value` under `key`. `ttl` overrides the cache's ttl_seconds
+        for this key; 0 (or a cache ttl of 0) means it never expires.
+        """
+        size = self._charge(key, value)
+        with self._lock:
+            now = self._expire()
+            self._store(key, value, size, ttl, now)
+            self._evict()
+
+    def mset(self, items: Union[Mapping[Any, Any], Iterable[Tuple[Any, Any]]], ttl: Optional[float] = None) -> None:
+        """Store many (key, value) pairs with one lock acquisition."""
+        pairs = items.items() if isinstance(items, dict) else items
+        sized = [(key, value, self._charge(key, value)) for key, value in pairs]
+        with self._lock:
+            now = self._expire()
+            for key, value, size in sized:
+                self._store(key, value, size, ttl, now)
+            self._evict()
+
+    def delete(self, key: Any) -> bool:
+        """Remove `key`; returns whether it was present."""
+        with self._lock:
+            self._expire()
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self._deletes += 1
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire()
+            lookups = self._hits + self._misses
+            return {
+                "keys": len(self._entries),
+                "used_bytes": self._used,
+                "capacity_bytes": self._capacity,
+                "eviction_policy": self._policy,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "sets": self._sets,
+                "deletes": self._deletes,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def _charge(self, key: Any, value: Any) -> int:
+        size = _size_of(key) + _size_of(value) + ENTRY_OVERHEAD
+        if self._capacity is not None and size > self._capacity:
+            raise ValueError(f"Entry of {size} bytes exceeds the cache capacity of {self._capacity} bytes")
+        return size
+
+    def _store(self, key: Any, value: Any, size: int, ttl: Optional[float], now: float) -> None:
+        entries = self._entries
+        old = entries.get(key)
+        if old is not None:
+            self._used -= old[1]
+            if self._lru:
+                entries.move_to_end(key)
+        # Re-assigning an existing key keeps its position, which is what FIFO needs
+        entries[key] = (value, size)
+        self._used += size
+        ttl = self._ttl if ttl is None else ttl
+        if ttl:
+            self._wheel.schedule(key, now + ttl)
+        elif old is not None:
+            self._wheel.cancel(key)
+        self._sets += 1
+
+    def _evict(self) -> None:
+        if self._capacity is None:
+            return
+        while self._used > self._capacity:
+            key, (_, size) = self._entries.popitem(last=False)
+            self._used -= size
+            self._wheel.cancel(key)
+            self._evictions += 1
+
+    def _remove(self, key: Any) -> None:
+        _, size = self._entries.pop(key)
+        self._used -= size
+        self._wheel.cancel(key)
+
+    def _expire(self) -> float:
+        now = self._clock()
+        if now >= self._wheel.next_at:
+            for key in self._wheel.advance(now):
+                _, size = self._entries.pop(key)
+                self._used -= size
+                self._expirations += 1
+        return now
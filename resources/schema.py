@@ -0,0 +1,124 @@
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+_MISSING = object()
+_NUMBER = (int, float)
+
+
+class Field:
+    """
+    Declarative constraint on one config key. All failures of a field
+    report the same `message`. Comparisons (ge/gt/le) are skipped for
+    non-numeric values unless `type` already guarantees a number.
+    """
+
+    def __init__(self, message: str, type: Union[type, Tuple[type, ...], None] = None,
+                 choices: Optional[Iterable[Any]] = None, ge: Any = None, gt: Any = None,
+                 le: Any = None, min_length: Optional[int] = None, required: bool = True,
+                 default: Any = _MISSING):
+        self.message = message
+        self.type = type
+        self.choices = frozenset(choices) if choices is not None else None
+        self.ge = ge
+        self.gt = gt
+        self.le = le
+        self.min_length = min_length
+        self.required = required
+        self.default = default
+
+
+Schema = Mapping[str, Union[Field, Sequence[Field]]]
+
+
+class CompiledSchema:
+    """A schema compiled into straight-line validator functions."""
+
+    def __init__(self, schema: Schema, defaults: Optional[Mapping[str, Any]] = None):
+        self._fields: Dict[str, List[Field]] = {
+            key: list(fields) if isinstance(fields, (list, tuple)) else [fields]
+            for key, fields in schema.items()
+        }
+        self.defaults: Dict[str, Any] = dict(defaults or {})
+        self.errors: Callable[[Mapping[str, Any]], List[str]]
+        self.errors, self._validate_many = _compile(self._fields, self.defaults)
+        self._field_validators = {key: _compile({key: fields}, {})[0] for key, fields in self._fields.items()}
+
+    def fields(self, key: str) -> List[Field]:
+        return self._fields.get(key, [])
+
+    def validate(self, config: Mapping[str, Any]) -> None:
+        """Raise ValueError with the first error, as the hand-written validators did."""
+        errors = self.errors(config)
+        if errors:
+            raise ValueError(errors[0])
+
+    def validate_many(self, configs: Iterable[Mapping[str, Any]]) -> List[List[str]]:
+        """Return every error for every config; an empty list means valid."""
+        return self._validate_many(configs)
+
+    def check_field(self, key: str, value: Any) -> Optional[str]:
+        """Validate a single value (e.g. one CLI prompt); returns the error or None."""
+        validator = self._field_validators.get(key)
+        if validator is None:
+            return None
+        errors = validator({key: value})
+        return errors[0] if errors else None
+
+
+def compile_schema(schema: Schema, defaults: Optional[Mapping[str, Any]] = None) -> CompiledSchema:
+    """
+    Compile `schema`. `defaults` supplies values for missing keys (e.g. a
+    factory's defaults) so configs need not be copied before validation.
+    """
+    return CompiledSchema(schema, defaults)
+
+
+def _compile(fields: Dict[str, List[Field]], defaults: Mapping[str, Any]) -> Tuple[Callable, Callable]:
+    """
+    Generate the source of a single-config and a many-config validator for
+    all fields and exec it, so validation runs as straight-line code with no
+    per-field dispatch or per-config function calls.
+    """
+    namespace: Dict[str, Any] = {"_MISSING": _MISSING, "_NUMBER": _NUMBER}
+    body: List[str] = []
+
+    def const(value: Any) -> str:
+        name = f"_c{len(namespace)}"
+        namespace[name] = value
+        return name
+
+    for key, key_fields in fields.items():
+        for field in key_fields:
+            default = const(defaults.get(key, field.default))
+            message = const(field.message)
+            numeric = field.type is not None and all(
+                issubclass(t, _NUMBER) for t in (field.type if isinstance(field.type, tuple) else (field.type,)))
+            body.append(f"v = get({const(key)}, {default})")
+            body.append("if v is _MISSING:")
+            body.append(f"    {'errors.append(' + message + ')' if field.required else 'pass'}")
+            if field.type is not None:
+                body.append(f"elif not isinstance(v, {const(field.type)}):")
+                body.append(f"    errors.append({message})")
+            if field.choices is not None:
+                body.append(f"elif v not in {const(field.choices)}:")
+                body.append(f"    errors.append({message})")
+            if field.min_length is not None:
+                body.append(f"elif len(v) < {const(field.min_length)}:")
+                body.append(f"    errors.append({message})")
+            guard = "" if numeric else "isinstance(v, _NUMBER) and "
+            for op, bound in (("<", field.ge), ("<=", field.gt), (">", field.le)):
+                if bound is not None:
+                    body.append(f"elif {guard}v {op} {const(bound)}:")
+                    body.append(f"    errors.append({message})")
+    lines = ["def validator(config):", "    errors = []", "    get = config.get"]
+    lines += ["    " + line for line in body]
+    lines += ["    return errors",
+              "def validate_many(configs):",
+              "    results = []",
+              "    append = results.append",
+              "    for config in configs:",
+              "        errors = []",
+              "        get = config.get"]
+    lines += ["        " + line for line in body]
+    lines += ["        append(errors)", "    return results"]
+    exec(compile("\n".join(lines), "<schema>", "exec"), namespace)
+    return namespace["validator"], namespace["validate_many"]
@@ -1,5 +1,45 @@
 # run_cloudconnect.py
+import argparse
+import atexit
+import sys
 from cloudconnect.main import cli_main
 
+def main():
+    parser = argparse.ArgumentParser(description="CloudConnect resource manager")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run JSONL commands from FILE ('-' for stdin) instead of the interactive menu")
+    parser.add_argument("--provider", metavar="URL",
+                        help="send creates and lifecycle changes to the control plane at URL")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="record operation metrics and serve them for Prometheus on 127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="record operation metrics and write them to FILE in Prometheus text format on exit")
+    args = parser.parse_args()
+
+    if args.metrics_port is not None or args.metrics_file:
+        from utils.metrics import serve_metrics, set_metrics_enabled, write_prometheus
+        set_metrics_enabled(True)
+        if args.metrics_port is not None:
+            serve_metrics(args.metrics_port)
+        if args.metrics_file:
+            atexit.register(write_prometheus, args.metrics_file)
+
+    if args.provider:
+        from providers import set_provider
+        from providers.http_provider import HttpProvider
+        set_provider(HttpProvider(args.provider))
+
+    if args.batch is None:
+        cli_main()
+        return
+
+    from cloudconnect.batch import run_batch
+    if args.batch == "-":
+        failures = run_batch(sys.stdin, sys.stdout)
+    else:
+        with open(args.batch, "r", encoding="utf-8") as stream:
+            failures = run_batch(stream, sys.stdout)
+    sys.exit(1 if failures else 0)
+
 if __name__ == "__main__":
-    cli_main()
\ No newline at end of file
+    main()
@@ -0,0 +1,314 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+SEGMENT_PREFIX = "events-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+Event = Dict[str, Any]
+TimeLike = Union[int, float, str, datetime, None]
+
+
+def iso_time(ts: float) -> str:
+    """Render an epoch timestamp as sortable ISO 8601 UTC with milliseconds."""
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def to_epoch(value: TimeLike) -> Optional[float]:
+    """Accept epoch seconds, ISO 8601 strings or datetimes (naive means local time)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.timestamp()
+
+
+class _Bucket:
+    """Summary of the events written to one segment within one time bucket."""
+
+    __slots__ = ("start", "offset", "end", "count", "actions", "resources")
+
+    def __init__(self, start: int, offset: int):
+        self.start = start
+        self.offset = offset
+        self.end = offset
+        self.count = 0
+        self.actions = set()
+        self.resources = set()
+
+    def add(self, event: Event, end: int, max_resources: int) -> None:
+        self.end = end
+        self.count += 1
+        self.actions.add(event.get("action"))
+        if self.resources is not None:
+            self.resources.add(event.get("resource"))
+            if len(self.resources) > max_resources:
+                self.resources = None  # Too many to list: the bucket matches any resource
+
+    def to_json(self) -> str:
+        return json.dumps({"b": self.start, "o": self.offset, "e": self.end, "n": self.count,
+                           "a": sorted(a for a in self.actions if a is not None),
+                           "r": None if self.resources is None else sorted(r for r in self.resources if r)},
+                          separators=(",", ":"))
+
+
+class EventLog:
+    """
+    Structured resource events stored as JSONL segments (one per UTC day).
+
+    Every segment has a side index with one line per sealed time bucket
+    (`bucket_seconds` long): its start, byte range, event count and the
+    actions and resources it contains. Queries read only the byte ranges of
+    matching buckets, plus the not yet sealed tail of a segment.
+
+    Appends are expected from a single writer (the log sink thread); queries
+    may run concurrently from any thread.
+    """
+
+    def __init__(self, directory: str, bucket_seconds: int = 60, max_resources_per_bucket: int = 256):
+        if bucket_seconds < 1:
+            raise ValueError("bucket_seconds must be at least 1")
+        self._directory = directory
+        self._bucket_seconds = bucket_seconds
+        self._max_resources = max_resources_per_bucket
+        self._segment: Optional[str] = None
+        self._file = None
+        self._index = None
+        self._offset = 0
+        self._bucket: Optional[_Bucket] = None
+        self._index_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        self._second: Tuple[int, str] = (-1, "")
+        self._day_start = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    # -- writing -----------------------------------------------------------
+
+    def append_many(self, events: Iterable[Event]) -> None:
+        """Append events (dicts with at least "ts"); adds the ISO "time" field."""
+        with self._lock:
+            for event in events:
+                ts = event["ts"]
+                if self._segment is None or not self._day_start <= ts < self._day_start + 86400:
+                    self._open(self._segment_name(ts))
+                    self._day_start = int(ts // 86400) * 86400
+                bucket_start = int(ts // self._bucket_seconds) * self._bucket_seconds
+                if self._bucket is None or bucket_start != self._bucket.start:
+                    self._seal()
+                    self._bucket = _Bucket(bucket_start, self._offset)
+                line = (_encode({"time": self._iso_time(ts), **event}) + "\n").encode("utf-8")
+                self._file.write(line)
+                self._offset += len(line)
+                self._bucket.add(event, self._offset, self._max_resources)
+
+    def flush(self, fsync: bool = False) -> None:
+        with self._lock:
+            for handle in (self._file, self._index):
+                if handle is not None:
+                    handle.flush()
+                    if fsync:
+                        os.fsync(handle.fileno())
+
+    def close(self) -> None:
+        """Seal the open bucket and close the current segment."""
+        with self._lock:
+            self._close_segment()
+
+    def prune(self, before: float) -> int:
+        """Delete whole day segments (and their indexes) that ended before `before`."""
+        removed = 0
+        with self._lock:
+            for path in self._segments(None, None):
+                name = os.path.basename(path)
+                day_end = datetime.strptime(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)], "%Y%m%d").replace(
+                    tzinfo=timezone.utc).timestamp() + 86400
+                if day_end > before or name == self._segment:
+                    continue
+                for target in (path, path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX):
+                    try:
+                        os.remove(target)
+                    except FileNotFoundError:
+                        pass
+                self._index_cache.pop(path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX, None)
+                removed += 1
+        return removed
+
+    def _open(self, segment: str) -> None:
+        self._close_segment()
+        os.makedirs(self._directory, exist_ok=True)
+        path = os.path.join(self._directory, segment)
+        self._recover(path)
+        self._file = open(path, "ab")
+        self._offset = self._file.seek(0, os.SEEK_END)
+        self._index = open(path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX, "a", encoding="utf-8")
+        self._segment = segment
+
+    def _recover(self, path: str) -> None:
+        """Index events a previous process wrote without sealing their bucket."""
+        if not os.path.exists(path):
+            return
+        entries = self._read_index(path)
+        start = entries[-1]["e"] if entries else 0
+        size = os.path.getsize(path)
+        if start >= size:
+            return
+        buckets: List[_Bucket] = []
+        with open(path, "rb") as file:
+            file.seek(start)
+            offset = start
+            for raw in file:
+                end = offset + len(raw)
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    event = json.loads(raw)
+                except ValueError:
+                    offset = end
+                    continue
+                bucket_start = int(event["ts"] // self._bucket_seconds) * self._bucket_seconds
+                if not buckets or buckets[-1].start != bucket_start:
+                    buckets.append(_Bucket(bucket_start, offset))
+                buckets[-1].add(event, end, self._max_resources)
+                offset = end
+        if offset < size:
+            # Drop a torn final line so the next append starts a fresh line
+            with open(path, "r+b") as file:
+                file.truncate(offset)
+        if buckets:
+            with open(path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX, "a", encoding="utf-8") as index:
+                index.write("".join(bucket.to_json() + "\n" for bucket in buckets))
+
+    def _seal(self) -> None:
+        if self._bucket is not None and self._bucket.count:
+            self._file.flush()
+            self._index.write(self._bucket.to_json() + "\n")
+            self._index.flush()
+        self._bucket = None
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        self._seal()
+        self._file.close()
+        self._index.close()
+        self._file = self._index = self._segment = None
+
+    def _iso_time(self, ts: float) -> str:
+        # iso_time() with the date part formatted once per second (milliseconds truncated)
+        second = int(ts)
+        if second != self._second[0]:
+            self._second = (second, iso_time(second)[:-5])
+        return f"{self._second[1]}.{int((ts - second) * 1000):03d}Z"
+
+    @staticmethod
+    def _segment_name(ts: float) -> str:
+        return f"{SEGMENT_PREFIX}{time.strftime('%Y%m%d', time.gmtime(ts))}{SEGMENT_SUFFIX}"
+
+    # -- querying ----------------------------------------------------------
+
+    def query(self, since: TimeLike = None, until: TimeLike = None, action: Optional[str] = None,
+              resource: Optional[str] = None, user: Optional[str] = None, type: Optional[str] = None,
+              limit: Optional[int] = None) -> Iterator[Event]:
+        """
+        Yield events with since <= ts < until that match every given field,
+        oldest first. Only index-selected byte ranges are read.
+        """
+        since, until = to_epoch(since), to_epoch(until)
+        self.flush()
+        matched = 0
+        for path in self._segments(since, until):
+            for start, end in self._ranges(path, since, until, action, resource):
+                for event in self._read_range(path, start, end):
+                    ts = event.get("ts", 0)
+                    if since is not None and ts < since or until is not None and ts >= until:
+                        continue
+                    if (action is not None and event.get("action") != action
+                            or resource is not None and event.get("resource") != resource
+                            or user is not None and event.get("user") != user
+                            or type is not None and event.get("type") != type):
+                        continue
+                    yield event
+                    matched += 1
+                    if limit is not None and matched >= limit:
+                        return
+
+    def _segments(self, since: Optional[float], until: Optional[float]) -> List[str]:
+        try:
+            names = sorted(name for name in os.listdir(self._directory)
+                           if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX))
+        except FileNotFoundError:
+            return []
+        # Segment names sort by day, so the range check is a string comparison
+        low = self._segment_name(since) if since is not None else None
+        high = self._segment_name(until) if until is not None else None
+        return [os.path.join(self._directory, name) for name in names
+                if (low is None or name >= low) and (high is None or name <= high)]
+
+    def _ranges(self, path: str, since: Optional[float], until: Optional[float],
+                action: Optional[str], resource: Optional[str]) -> List[Tuple[int, int]]:
+        """Byte ranges of `path` that may hold matching events, with adjacent ranges merged."""
+        entries = self._read_index(path)
+        ranges: List[Tuple[int, int]] = []
+        for entry in entries:
+            if since is not None and entry["b"] + self._bucket_seconds <= since:
+                continue
+            if until is not None and entry["b"] >= until:
+                continue
+            if action is not None and action not in entry["a"]:
+                continue
+            if resource is not None and entry["r"] is not None and resource not in entry["r"]:
+                continue
+            if ranges and ranges[-1][1] == entry["o"]:
+                ranges[-1] = (ranges[-1][0], entry["e"])
+            else:
+                ranges.append((entry["o"], entry["e"]))
+        # Events after the last sealed bucket are not indexed yet
+        tail = entries[-1]["e"] if entries else 0
+        if os.path.getsize(path) > tail:
+            ranges.append((tail, None))
+        return ranges
+
+    def _read_index(self, path: str) -> List[Dict[str, Any]]:
+        index_path = path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+        try:
+            stat = os.stat(index_path)
+        except FileNotFoundError:
+            return []
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self._index_cache.get(index_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        entries = []
+        with open(index_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break  # Torn final line
+        self._index_cache[index_path] = (key, entries)
+        return entries
+
+    @staticmethod
+    def _read_range(path: str, start: int, end: Optional[int]) -> Iterator[Event]:
+        with open(path, "rb") as file:
+            file.seek(start)
+            position = start
+            for raw in file:
+                if end is not None and position >= end:
+                    return
+                position += len(raw)
+                if not raw.endswith(b"\n"):
+                    return
+                try:
+                    yield json.loads(raw)
+                except ValueError:
+                    continue
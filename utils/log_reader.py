@@ -0,0 +1,201 @@
+import mmap
+import os
+import threading
+from itertools import accumulate
+from typing import Iterator, List, Optional
+
+NEWLINE = b"\n"
+
+
+class LogReader:
+    """
+    Bounded-memory reader for one (append-only) log file.
+
+    - tail(n) seeks backwards from the end, so its cost depends on n, not
+      on the file size.
+    - page(number) uses a sparse index holding the byte offset of every
+      `index_every`-th line. The index is extended incrementally as the
+      file grows and rebuilt if the file is truncated.
+    - follow() yields lines as they are appended.
+
+    Files of at least `mmap_threshold` bytes are scanned through mmap
+    instead of read().
+    """
+
+    def __init__(self, path: str, index_every: int = 1000, chunk_size: int = 64 * 1024,
+                 mmap_threshold: int = 1 << 20, encoding: str = "utf-8"):
+        if index_every < 1 or chunk_size < 1:
+            raise ValueError("index_every and chunk_size must be positive")
+        self._path = path
+        self._index_every = index_every
+        self._chunk_size = chunk_size
+        self._mmap_threshold = mmap_threshold
+        self._encoding = encoding
+        # _offsets[i] is the byte offset where line i * index_every starts
+        self._offsets: List[int] = [0]
+        self._scanned = 0     # bytes covered by _lines
+        self._lines = 0       # complete lines in the first _scanned bytes
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self._path)
+        except FileNotFoundError:
+            return 0
+
+    def tail(self, n: int = 20) -> List[str]:
+        """Return the last `n` lines, reading backwards in fixed-size chunks."""
+        if n <= 0:
+            return []
+        with open(self._path, "rb") as file:
+            end = file.seek(0, os.SEEK_END)
+            position = end
+            data = b""
+            # One extra newline is needed to know the first line is complete;
+            # a trailing newline does not start a new line
+            needed = n + 1 if end and self._ends_with_newline(file, end) else n
+            while position > 0 and data.count(NEWLINE) < needed:
+                step = min(self._chunk_size, position)
+                position -= step
+                file.seek(position)
+                data = file.read(step) + data
+        lines = data.splitlines()
+        return [self._decode(line) for line in lines[-n:]]
+
+    def line_count(self) -> int:
+        """Number of lines in the file (a final line without newline counts)."""
+        with self._lock:
+            self._extend_index()
+            return self._lines + (1 if self._scanned < self.size() else 0)
+
+    def page_count(self, page_size: int = 50) -> int:
+        return max(1, -(-self.line_count() // page_size))
+
+    def page(self, number: int, page_size: int = 50) -> List[str]:
+        """Return 1-based page `number`; negative numbers count from the end."""
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        if number < 0:
+            number += self.page_count(page_size) + 1
+        if number < 1:
+            return []
+        return self.lines((number - 1) * page_size, page_size)
+
+    def lines(self, start: int, count: int) -> List[str]:
+        """Return up to `count` lines starting at 0-based line `start`."""
+        if start < 0 or count <= 0:
+            return []
+        with self._lock:
+            self._extend_index(until_line=start)
+            slot = start // self._index_every
+            if slot >= len(self._offsets):
+                return []
+            offset = self._offsets[slot]
+        skip = start - slot * self._index_every
+        result: List[str] = []
+        with open(self._path, "rb") as file:
+            file.seek(offset)
+            for raw in file:
+                if skip:
+                    skip -= 1
+                    continue
+                result.append(self._decode(raw.rstrip(b"\r\n")))
+                if len(result) == count:
+                    break
+        return result
+
+    def follow(self, from_end: bool = True, poll_interval: float = 0.25,
+               stop: Optional[threading.Event] = None) -> Iterator[str]:
+        """
+        Yield lines as they are appended, until `stop` is set (or forever).
+        Partial lines are held back until their newline arrives. If the file
+        is truncated or replaced, reading restarts from its beginning.
+        """
+        stop = stop or threading.Event()
+        file = None
+        pending = b""
+        position = 0
+        try:
+            while not stop.is_set():
+                if file is None:
+                    try:
+                        file = open(self._path, "rb")
+                    except FileNotFoundError:
+                        stop.wait(poll_interval)
+                        continue
+                    position = file.seek(0, os.SEEK_END) if from_end else 0
+                    file.seek(position)
+                    from_end = False
+                try:
+                    stat = os.stat(self._path)
+                except FileNotFoundError:
+                    stat = None
+                if stat is None or stat.st_size < position or stat.st_ino != os.fstat(file.fileno()).st_ino:
+                    # Truncated, rotated or removed: start over with the new file
+                    file.close()
+                    file, pending = None, b""
+                    stop.wait(poll_interval)
+                    continue
+                chunk = file.read(self._chunk_size)
+                if not chunk:
+                    stop.wait(poll_interval)
+                    continue
+                position += len(chunk)
+                data = pending + chunk
+                complete, newline, pending = data.rpartition(NEWLINE)
+                if newline:
+                    for line in complete.split(NEWLINE):
+                        yield self._decode(line.rstrip(b"\r"))
+        finally:
+            if file is not None:
+                file.close()
+
+    def _extend_index(self, until_line: Optional[int] = None) -> None:
+        """Scan newly appended bytes (or all, after truncation) into the sparse index."""
+        size = self.size()
+        if size < self._scanned:
+            self._offsets, self._scanned, self._lines = [0], 0, 0
+        if size == self._scanned or (until_line is not None and until_line < self._lines):
+            return
+        every = self._index_every
+        with open(self._path, "rb") as file:
+            if size >= self._mmap_threshold:
+                with mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as view:
+                    self._scan(view, size, every)
+            else:
+                self._scan(file.read(size), size, every)
+
+    def _scan(self, view, size: int, every: int) -> None:
+        # Newlines are counted per chunk in C; line offsets are only worked
+        # out for chunks that cross an index mark. Chunks are copied out of
+        # the view one at a time, so memory stays bounded by chunk_size.
+        position, lines = self._scanned, self._lines
+        offsets = self._offsets
+        while position < size:
+            chunk = view[position:position + self._chunk_size]
+            newlines = chunk.count(NEWLINE)
+            next_mark = len(offsets) * every
+            if lines + newlines >= next_mark:
+                # ends[i] is the chunk offset just after the (i + 1)-th newline
+                ends = list(accumulate(len(part) + 1 for part in chunk.split(NEWLINE)))
+                while next_mark <= lines + newlines:
+                    offsets.append(position + ends[next_mark - lines - 1])
+                    next_mark += every
+            lines += newlines
+            last = chunk.rfind(NEWLINE)
+            if last >= 0:
+                # Only complete lines are counted; a partial last line is rescanned later
+                self._scanned = position + last + 1
+            position += len(chunk)
+        self._lines = lines
+
+    def _ends_with_newline(self, file, end: int) -> bool:
+        file.seek(end - 1)
+        return file.read(1) == NEWLINE
+
+    def _decode(self, raw: bytes) -> str:
+        return raw.decode(self._encoding, errors="replace")
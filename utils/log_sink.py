@@ -0,0 +1,222 @@
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from utils.event_log import EventLog
+from utils.log_store import LogStore
+
+DURABILITY_MODES = ("buffered", "flush", "fsync")
+
+# Seconds between age-based rotation / retention checks while idle
+MAINTENANCE_INTERVAL = 30.0
+
+
+class CachedTimestamp:
+    """Formats wall-clock timestamps, re-running strftime at most once per second."""
+
+    def __init__(self, fmt: str):
+        self._fmt = fmt
+        self._cached: Tuple[int, str] = (-1, "")
+
+    def __call__(self) -> str:
+        second = int(time.time())
+        cached = self._cached
+        if cached[0] == second:
+            return cached[1]
+        text = datetime.fromtimestamp(second).strftime(self._fmt)
+        self._cached = (second, text)
+        return text
+
+
+class _Flush:
+    """Control message asking the writer thread to flush and acknowledge."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class LogSink:
+    """
+    Background log writer.
+    Lines are queued by callers and written in batches by a single writer
+    thread to a LogStore: a few rotated, compressed segments shared by all
+    resources. Structured events (entries whose resource name is None) go
+    to an EventLog in `<log_dir>/events`. Extra keyword arguments configure
+    the LogStore (segment size and age, retention).
+
+    Durability modes:
+      - "buffered": segments are flushed every `flush_interval` seconds.
+      - "flush": segments are flushed after every batch.
+      - "fsync": segments are flushed and fsynced after every batch.
+    """
+
+    def __init__(self, log_dir: str, queue_size: int = 10000, flush_interval: float = 0.5,
+                 durability: str = "flush", batch_size: int = 512, **store_options):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {', '.join(DURABILITY_MODES)}")
+        self._log_dir = log_dir
+        self._flush_interval = flush_interval
+        self._durability = durability
+        self._batch_size = batch_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._store = LogStore(log_dir, **store_options)
+        self._events = EventLog(os.path.join(log_dir, "events"))
+        self._dirty = False
+        self._events_dirty = False
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def durability(self) -> str:
+        return self._durability
+
+    @property
+    def store(self) -> LogStore:
+        return self._store
+
+    @property
+    def events(self) -> EventLog:
+        return self._events
+
+    def write(self, resource_name: str, message: str) -> None:
+        """Queue a single line for `resource_name`."""
+        self._ensure_running()
+        self._queue.put((resource_name, message))
+
+    def write_event(self, event: Dict[str, Any]) -> None:
+        """Queue a structured event for the event log."""
+        self._ensure_running()
+        self._queue.put((None, event))
+
+    def write_many(self, entries: Iterable[Tuple[Optional[str], Any]]) -> None:
+        """Queue several (resource_name, message) lines, or (None, event) events, as one batch."""
+        batch = list(entries)
+        if batch:
+            self._ensure_running()
+            self._queue.put(batch)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything queued so far has been written and flushed."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Log sink is closed")
+            if self._thread is None:
+                return
+        request = _Flush()
+        self._queue.put(request)
+        request.done.wait(timeout)
+
+    def close(self) -> None:
+        """Drain the queue, stop the writer thread and close the store."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+        self._store.close()
+        self._events.close()
+
+    def _ensure_running(self) -> None:
+        if self._closed:
+            raise RuntimeError("Log sink is closed")
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Log sink is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cloudconnect-log-sink", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        last_flush = last_maintenance = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                item = None
+
+            batch, controls, stop = [], [], False
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _Flush):
+                    controls.append(item)
+                elif isinstance(item, list):
+                    batch.extend(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if batch:
+                self._write_batch(batch)
+
+            now = time.monotonic()
+            if (controls or stop or self._durability != "buffered"
+                    or now - last_flush >= self._flush_interval):
+                self._flush()
+                last_flush = now
+
+            for control in controls:
+                control.done.set()
+            if stop:
+                return
+            if not batch and now - last_maintenance >= MAINTENANCE_INTERVAL:
+                self._maintain()
+                last_maintenance = now
+
+    def _write_batch(self, batch) -> None:
+        lines, events = [], []
+        for name, message in batch:
+            if name is None:
+                events.append(message)
+            else:
+                lines.append((name, message))
+        if events:
+            try:
+                self._events.append_many(events)
+                self._events_dirty = True
+            except Exception as e:
+                print(f"Log sink failed to write events: {e}", file=sys.stderr)
+        if lines:
+            try:
+                self._store.append_many(lines)
+                self._dirty = True
+            except Exception as e:
+                # Any error (e.g. an unencodable message) costs this batch,
+                # never the writer thread, which flush() waits on
+                print(f"Log sink failed to write log lines: {e}", file=sys.stderr)
+
+    def _flush(self) -> None:
+        fsync = self._durability == "fsync"
+        for dirty, target, label in ((self._dirty, self._store, "log lines"),
+                                     (self._events_dirty, self._events, "events")):
+            if dirty:
+                try:
+                    target.flush(fsync=fsync)
+                except Exception as e:
+                    print(f"Log sink failed to flush {label}: {e}", file=sys.stderr)
+        self._dirty = self._events_dirty = False
+
+    def _maintain(self) -> None:
+        """Age-based rotation and retention, run while the writer is idle."""
+        try:
+            self._store.maintain()
+            self._events.prune(time.time() - self._store.retention_seconds)
+        except Exception as e:
+            print(f"Log sink maintenance failed: {e}", file=sys.stderr)
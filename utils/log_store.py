@@ -0,0 +1,443 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{8})\.log(\.gz)?$")
+
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def _segment_path(directory: str, seq: int, sealed: bool) -> str:
+    return os.path.join(directory, f"segment-{seq:08d}.log{'.gz' if sealed else ''}")
+
+
+def _index_path(directory: str, seq: int) -> str:
+    return os.path.join(directory, f"segment-{seq:08d}.idx")
+
+
+class _SealedSegment:
+    """
+    A compressed, read-only segment. The data file is a series of gzip
+    members (one per block of whole lines), so one block can be read
+    without decompressing the rest. The index file has a header line (time
+    range and block table), a line with the sorted resource names, and then
+    one `<json name>\t<entry>` line per resource. Listing reads the names
+    line only; a lookup finds its entry line without parsing the others.
+    """
+
+    def __init__(self, directory: str, seq: int):
+        self.seq = seq
+        self.path = _segment_path(directory, seq, True)
+        self.index_path = _index_path(directory, seq)
+        with open(self.index_path, "r", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            self._names_at = file.tell()
+        self.first_ts: float = header["first"]
+        self.last_ts: float = header["last"]
+        self.blocks: List[List[int]] = header["blocks"]
+        self._version = header.get("version", 1)
+        self._names: Optional[List[str]] = None
+        self._entries: Optional[bytes] = None
+        self._found: Dict[str, Optional[List]] = {}
+        self._resources: Optional[Dict[str, List]] = None
+        self.size = os.path.getsize(self.path) + os.path.getsize(self.index_path)
+
+    @property
+    def names(self) -> List[str]:
+        """Sorted names of the resources with lines in this segment."""
+        if self._names is None:
+            if self._version < 2:
+                self._names = sorted(self._legacy_resources())
+            else:
+                with open(self.index_path, "r", encoding="utf-8") as file:
+                    file.seek(self._names_at)
+                    self._names = json.loads(file.readline())
+        return self._names
+
+    def entry(self, name: str) -> Optional[List]:
+        """[line count, block numbers holding its lines] of `name`, or None."""
+        if self._version < 2:
+            return self._legacy_resources().get(name)
+        if name in self._found:
+            return self._found[name]
+        if self._entries is None:
+            with open(self.index_path, "rb") as file:
+                file.seek(self._names_at)
+                file.readline()
+                self._entries = b"\n" + file.read()
+        key = b"\n" + _encode(name).encode("utf-8") + b"\t"
+        at = self._entries.find(key)
+        entry = None
+        if at >= 0:
+            start = at + len(key)
+            entry = json.loads(self._entries[start:self._entries.index(b"\n", start)])
+        if len(self._found) >= 4096:
+            self._found.clear()
+        self._found[name] = entry
+        return entry
+
+    def count(self, name: str) -> int:
+        entry = self.entry(name)
+        return entry[0] if entry else 0
+
+    def _legacy_resources(self) -> Dict[str, List]:
+        # Indexes written before the name table: one JSON map of all entries
+        if self._resources is None:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                file.seek(self._names_at)
+                self._resources = json.loads(file.readline())
+        return self._resources
+
+    def lines(self, name: str) -> Iterator[str]:
+        entry = self.entry(name)
+        if not entry:
+            return
+        # Cheap byte test first: only lines naming this resource are parsed
+        needle = b'"r":' + _encode(name).encode("utf-8") + b","
+        with open(self.path, "rb") as file:
+            for block in entry[1]:
+                offset, length = self.blocks[block]
+                file.seek(offset)
+                data = zlib.decompress(file.read(length), wbits=31)
+                for raw in data.splitlines():
+                    if needle in raw:
+                        record = json.loads(raw)
+                        if record["r"] == name:
+                            yield record["m"]
+
+    def remove(self) -> None:
+        for path in (self.path, self.index_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class LogStore:
+    """
+    Combined log for all resources, stored as a few size-bounded segments
+    instead of one file per resource.
+
+    Lines are appended to the active segment (JSON lines holding time,
+    resource and message). It is sealed once it reaches `max_segment_bytes`
+    or `max_segment_age` seconds: it is recompressed as independently
+    readable gzip blocks with a per-resource index. Sealed segments are
+    deleted oldest first while the store exceeds `retention_bytes`, and
+    once their newest line is older than `retention_seconds`.
+    Per-resource reads use the indexes and never scan unrelated segments.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 16 << 20, max_segment_age: float = 86400,
+                 retention_bytes: int = 1 << 30, retention_seconds: float = 30 * 86400,
+                 block_size: int = 64 << 10, compress_level: int = 6):
+        if max_segment_bytes < 1 or block_size < 1:
+            raise ValueError("max_segment_bytes and block_size must be positive")
+        self._directory = directory
+        self._max_segment_bytes = max_segment_bytes
+        self._max_segment_age = max_segment_age
+        self._retention_bytes = retention_bytes
+        self._retention_seconds = retention_seconds
+        self._block_size = block_size
+        self._compress_level = compress_level
+        self._sealed: List[_SealedSegment] = []
+        self._seq = 0
+        self._file = None
+        self._size = 0
+        self._first_ts: Optional[float] = None
+        self._last_ts: Optional[float] = None
+        self._offsets: Dict[str, List[int]] = {}
+        self._opened = False
+        self._lock = threading.RLock()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def retention_seconds(self) -> float:
+        return self._retention_seconds
+
+    # -- writing -----------------------------------------------------------
+
+    def append_many(self, entries: Iterable[Tuple[str, str]]) -> None:
+        """Append (resource_name, message) lines."""
+        with self._lock:
+            self._open()
+            now = time.time()
+            for name, message in entries:
+                line = (_encode({"t": now, "r": name, "m": message}) + "\n").encode("utf-8")
+                self._file.write(line)
+                self._offsets.setdefault(name, []).append(self._size)
+                self._size += len(line)
+                if self._first_ts is None:
+                    self._first_ts = now
+                self._last_ts = now
+                if self._size >= self._max_segment_bytes:
+                    self._rotate()
+
+    def maintain(self) -> None:
+        """Seal the active segment if it is too old and apply retention."""
+        with self._lock:
+            if not self._opened:
+                return
+            if self._first_ts is not None and time.time() - self._first_ts >= self._max_segment_age:
+                self._rotate()
+            else:
+                self._apply_retention()
+
+    def rotate(self) -> None:
+        """Seal the active segment now."""
+        with self._lock:
+            self._open()
+            if self._size:
+                self._rotate()
+
+    def flush(self, fsync: bool = False) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                if fsync:
+                    os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the active segment; it is reopened and appended to next time."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._opened = False
+            self._sealed = []
+            self._offsets = {}
+
+    # -- reading -----------------------------------------------------------
+
+    def resources(self) -> List[str]:
+        """Names of all resources with retained log lines."""
+        with self._lock:
+            self._open()
+            # Each segment's names are sorted, so the new names of every segment
+            # form a sorted run and the final sort only merges runs
+            runs: List[str] = []
+            seen = set()
+            for names in [segment.names for segment in self._sealed] + [sorted(self._offsets)]:
+                fresh = [name for name in names if name not in seen] if seen else names
+                seen.update(fresh)
+                runs += fresh
+            runs.sort()
+            return runs
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            self._open()
+            return sum(segment.count(name) for segment in self._sealed) + len(self._offsets.get(name, ()))
+
+    def lines(self, name: str, start: int = 0, count: Optional[int] = None) -> List[str]:
+        """Return up to `count` lines of `name`, oldest first, from 0-based line `start`."""
+        if start < 0 or count is not None and count <= 0:
+            return []
+        result: List[str] = []
+        with self._lock:
+            self._open()
+            for segment in self._sealed:
+                available = segment.count(name)
+                if start >= available:
+                    start -= available  # Skipped without decompressing anything
+                    continue
+                for message in segment.lines(name):
+                    if start:
+                        start -= 1
+                        continue
+                    result.append(message)
+                    if count is not None and len(result) == count:
+                        return result
+            offsets = self._offsets.get(name, [])[start:]
+            if offsets:
+                self._file.flush()
+                with open(_segment_path(self._directory, self._seq, False), "rb") as file:
+                    for offset in offsets:
+                        file.seek(offset)
+                        result.append(json.loads(file.readline())["m"])
+                        if count is not None and len(result) == count:
+                            break
+        return result
+
+    def tail(self, name: str, n: int = 20) -> List[str]:
+        if n <= 0:
+            return []
+        return self.lines(name, max(0, self.count(name) - n), n)
+
+    def reader(self, name: str) -> "ResourceLog":
+        return ResourceLog(self, name)
+
+    def disk_usage(self) -> int:
+        with self._lock:
+            self._open()
+            return self._size + sum(segment.size for segment in self._sealed)
+
+    # -- internals ---------------------------------------------------------
+
+    def _open(self) -> None:
+        """Load segment indexes and recover the active segment (first use only)."""
+        if self._opened:
+            return
+        os.makedirs(self._directory, exist_ok=True)
+        plain, sealed = [], set()
+        for name in os.listdir(self._directory):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                (sealed.add if match.group(2) else plain.append)(int(match.group(1)))
+        for seq in sorted(sealed):
+            if not os.path.exists(_index_path(self._directory, seq)):
+                # Sealing was interrupted before the index was renamed into place
+                if seq in plain:
+                    os.remove(_segment_path(self._directory, seq, True))
+                continue
+            self._sealed.append(_SealedSegment(self._directory, seq))
+        sealed_seqs = {segment.seq for segment in self._sealed}
+        plain.sort()
+        for seq in plain:
+            if seq in sealed_seqs:
+                # Sealed but not yet removed
+                os.remove(_segment_path(self._directory, seq, False))
+                continue
+            self._seq = seq
+            self._recover_active()
+            if seq != plain[-1]:
+                self._seal()
+        if self._file is None:
+            self._seq = max([self._seq] + [segment.seq for segment in self._sealed]) + 1
+            self._file = open(_segment_path(self._directory, self._seq, False), "ab")
+        self._opened = True
+        self._apply_retention()
+
+    def _recover_active(self) -> None:
+        path = _segment_path(self._directory, self._seq, False)
+        offsets: Dict[str, List[int]] = {}
+        position = 0
+        first_ts = last_ts = None
+        with open(path, "rb") as file:
+            for raw in file:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                offsets.setdefault(record["r"], []).append(position)
+                position += len(raw)
+                first_ts = record["t"] if first_ts is None else first_ts
+                last_ts = record["t"]
+        if position < os.path.getsize(path):
+            # Drop a torn final line left by a crash
+            with open(path, "r+b") as file:
+                file.truncate(position)
+        self._file = open(path, "ab")
+        self._size = position
+        self._offsets = offsets
+        self._first_ts, self._last_ts = first_ts, last_ts
+
+    def _rotate(self) -> None:
+        self._seal()
+        self._seq += 1
+        self._file = open(_segment_path(self._directory, self._seq, False), "ab")
+        self._size = 0
+        self._offsets = {}
+        self._first_ts = self._last_ts = None
+        self._apply_retention()
+
+    def _seal(self) -> None:
+        """Compress the active segment block by block and write its index."""
+        self._file.close()
+        self._file = None
+        seq = self._seq
+        plain = _segment_path(self._directory, seq, False)
+        if not self._size:
+            os.remove(plain)
+            return
+        target = _segment_path(self._directory, seq, True)
+        blocks: List[List[int]] = []
+        resources: Dict[str, List] = {}
+        with open(plain, "rb") as source, open(target + ".tmp", "wb") as out:
+            while True:
+                data = source.read(self._block_size)
+                if not data:
+                    break
+                if not data.endswith(b"\n"):
+                    data += source.readline()  # Blocks hold whole lines only
+                block = len(blocks)
+                for raw in data.splitlines():
+                    entry = resources.setdefault(json.loads(raw)["r"], [0, []])
+                    entry[0] += 1
+                    if not entry[1] or entry[1][-1] != block:
+                        entry[1].append(block)
+                compressor = zlib.compressobj(self._compress_level, zlib.DEFLATED, 31)
+                compressed = compressor.compress(data) + compressor.flush()
+                blocks.append([out.tell(), len(compressed)])
+                out.write(compressed)
+        header = {"version": 2, "first": self._first_ts, "last": self._last_ts, "blocks": blocks}
+        names = sorted(resources)
+        with open(_index_path(self._directory, seq) + ".tmp", "w", encoding="utf-8") as file:
+            file.write(_encode(header) + "\n" + _encode(names) + "\n")
+            file.writelines(f"{_encode(name)}\t{_encode(resources[name])}\n" for name in names)
+        os.replace(target + ".tmp", target)
+        os.replace(_index_path(self._directory, seq) + ".tmp", _index_path(self._directory, seq))
+        os.remove(plain)
+        self._sealed.append(_SealedSegment(self._directory, seq))
+
+    def _apply_retention(self) -> None:
+        cutoff = time.time() - self._retention_seconds
+        total = self._size + sum(segment.size for segment in self._sealed)
+        while self._sealed and (total > self._retention_bytes or self._sealed[0].last_ts < cutoff):
+            segment = self._sealed.pop(0)
+            total -= segment.size
+            try:
+                segment.remove()
+            except OSError as e:
+                print(f"Log store failed to remove segment {segment.seq}: {e}", file=sys.stderr)
+
+
+class ResourceLog:
+    """One resource's lines in a LogStore, with the same reading API as LogReader."""
+
+    def __init__(self, store: LogStore, name: str):
+        self._store = store
+        self._name = name
+
+    def tail(self, n: int = 20) -> List[str]:
+        return self._store.tail(self._name, n)
+
+    def line_count(self) -> int:
+        return self._store.count(self._name)
+
+    def page_count(self, page_size: int = 50) -> int:
+        return max(1, -(-self.line_count() // page_size))
+
+    def page(self, number: int, page_size: int = 50) -> List[str]:
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        if number < 0:
+            number += self.page_count(page_size) + 1
+        if number < 1:
+            return []
+        return self._store.lines(self._name, (number - 1) * page_size, page_size)
+
+    def follow(self, from_end: bool = True, poll_interval: float = 0.25,
+               stop: Optional[threading.Event] = None) -> Iterator[str]:
+        """Yield lines as they are logged, until `stop` is set (or forever)."""
+        stop = stop or threading.Event()
+        seen = self.line_count() if from_end else 0
+        while not stop.is_set():
+            total = self.line_count()
+            if total < seen:
+                seen = total  # Old segments were removed by retention
+            if total > seen:
+                for line in self._store.lines(self._name, seen, total - seen):
+                    yield line
+                seen = total
+            else:
+                stop.wait(poll_interval)
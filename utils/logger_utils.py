@@ -1,13 +1,167 @@
+import atexit
 import os
-from datetime import datetime
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.event_log import TimeLike
+from utils.log_sink import CachedTimestamp, LogSink
+from utils.log_store import ResourceLog
 
+# Holds the log segments and events/; created on first write, not at import
 LOG_DIR = os.path.join("cloudconnect", "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
 
-def now_ts():
-    return datetime.now().strftime("%Y-%m-%d %I:%M:%S %p")
+now_ts = CachedTimestamp("%Y-%m-%d %I:%M:%S %p")
+
+_sink: Optional[LogSink] = None
+_sink_options = {}
+_sink_lock = threading.Lock()
+_local = threading.local()
+_echo = True
+# User on whose behalf resource operations run; recorded in every event
+_actor: ContextVar[Optional[str]] = ContextVar("cloudconnect_actor", default=None)
+
+
+def configure_logging(**options) -> None:
+    """
+    Configure the shared log sink (see LogSink for the accepted options,
+    e.g. flush_interval, durability, queue_size, and the LogStore options
+    max_segment_bytes, max_segment_age, retention_bytes, retention_seconds).
+    An already running sink is drained and replaced.
+    """
+    global _sink, _sink_options
+    with _sink_lock:
+        old, _sink = _sink, None
+        _sink_options = dict(options)
+    if old is not None:
+        old.close()
+
+
+def get_sink() -> LogSink:
+    """Return the shared log sink, creating it on first use."""
+    global _sink
+    sink = _sink
+    if sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = LogSink(LOG_DIR, **_sink_options)
+            sink = _sink
+    return sink
+
 
 def write_log(resource_name, message):
-    path = os.path.join(LOG_DIR, f"{resource_name}.log")
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(message + "\n")
\ No newline at end of file
+    batch = getattr(_local, "batch", None)
+    if batch is not None:
+        batch.append((resource_name, message))
+    else:
+        get_sink().write(resource_name, message)
+
+
+def log_event(resource_name: str, resource_type: str, action: str, message: str) -> None:
+    """
+    Record a structured event (epoch and ISO timestamps, resource, type,
+    action, message and the current actor) in the JSONL event log.
+    """
+    event = {"ts": time.time(), "resource": resource_name, "type": resource_type,
+             "action": action, "message": message, "user": _actor.get()}
+    batch = getattr(_local, "batch", None)
+    if batch is not None:
+        batch.append((None, event))
+    else:
+        get_sink().write_event(event)
+
+
+def query_events(since: TimeLike = None, until: TimeLike = None, action: Optional[str] = None,
+                 resource: Optional[str] = None, user: Optional[str] = None,
+                 type: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield logged events, oldest first, filtered by time range (epoch seconds,
+    ISO 8601 strings or datetimes) and by exact field values.
+    """
+    flush_logs()
+    return get_sink().events.query(since=since, until=until, action=action, resource=resource,
+                                   user=user, type=type, limit=limit)
+
+
+def logged_resources() -> List[str]:
+    """Names of all resources with log lines in the log store."""
+    flush_logs()
+    return get_sink().store.resources()
+
+
+def resource_log(resource_name: str) -> ResourceLog:
+    """Reader (tail, page, follow) over one resource's lines in the log store."""
+    flush_logs()
+    return get_sink().store.reader(resource_name)
+
+
+def set_actor(username: Optional[str]) -> None:
+    """Set the user recorded in events logged by the current context."""
+    _actor.set(username)
+
+
+def current_actor() -> Optional[str]:
+    return _actor.get()
+
+
+@contextmanager
+def acting_as(username: Optional[str]):
+    """Attribute events logged inside the block to `username`."""
+    token = _actor.set(username)
+    try:
+        yield
+    finally:
+        _actor.reset(token)
+
+
+@contextmanager
+def log_batch():
+    """
+    Collect every write_log call made by the current thread and hand them to
+    the sink as one batch on exit. Console echo is suppressed meanwhile.
+    """
+    outer = getattr(_local, "batch", None)
+    if outer is not None:
+        yield
+        return
+    _local.batch = []
+    try:
+        yield
+    finally:
+        batch, _local.batch = _local.batch, None
+        write_logs(batch)
+
+
+def set_console_echo(enabled: bool) -> None:
+    """Enable or disable printing of resource log lines to the console."""
+    global _echo
+    _echo = enabled
+
+
+def console_echo() -> bool:
+    """Whether log lines should also be printed by the current thread."""
+    return _echo and getattr(_local, "batch", None) is None
+
+
+def write_logs(entries: Iterable[Tuple[Optional[str], Any]]):
+    """Write several (resource_name, message) lines, or (None, event) events, as a single batch."""
+    get_sink().write_many(entries)
+
+
+def flush_logs():
+    """Block until all queued log lines are on disk."""
+    if _sink is not None:
+        _sink.flush()
+
+
+def close_logs():
+    """Drain and close the shared log sink; a new one is created on next write."""
+    global _sink
+    with _sink_lock:
+        sink, _sink = _sink, None
+    if sink is not None:
+        sink.close()
+
+
+atexit.register(close_logs)
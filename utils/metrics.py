@@ -0,0 +1,180 @@
+import os
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = False
+
+
+def set_metrics_enabled(enabled: bool) -> None:
+    """Make managers created without `use_metrics` record metrics (default off)."""
+    global _enabled
+    _enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    return _enabled
+
+
+class _Histogram:
+    """Latency histogram of one (type, operation) plus its failure count."""
+
+    __slots__ = ("counts", "total", "count", "failures", "lock")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)
+        self.total = 0.0
+        self.count = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+
+class MetricsRegistry:
+    """
+    Operation metrics for resources: a latency histogram and success and
+    failure counters per (resource type, operation), plus gauges of how many
+    resources each tracked inventory holds per type and status. Gauges are
+    read from the inventories' counters when a snapshot is taken, so they
+    cost nothing per operation.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = tuple(sorted(buckets))
+        self._histograms: Dict[Tuple[str, str], _Histogram] = {}
+        self._inventories = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def observe(self, resource_type: str, operation: str, seconds: float, ok: bool = True) -> None:
+        """Record one operation that took `seconds`."""
+        key = (resource_type, operation)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, _Histogram(len(self._buckets)))
+        index = bisect_left(self._buckets, seconds)
+        with histogram.lock:
+            histogram.counts[index] += 1
+            histogram.total += seconds
+            histogram.count += 1
+            if not ok:
+                histogram.failures += 1
+
+    def track(self, inventory) -> None:
+        """Report `inventory.counts()` as gauges; tracking one twice is harmless."""
+        self._inventories.add(inventory)
+
+    def reset(self) -> None:
+        """Drop every recorded operation (tracked inventories are kept)."""
+        with self._lock:
+            self._histograms = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current values as plain data: "operations" maps "type.operation" to
+        count, failures, sum and mean seconds and cumulative bucket counts
+        (upper bound -> count, "+Inf" last); "resources" holds the summed
+        inventory gauges "by_type" and "by_status".
+        """
+        operations = {}
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        bounds = [f"{bound:g}" for bound in self._buckets] + ["+Inf"]
+        for (resource_type, operation), histogram in histograms:
+            with histogram.lock:
+                counts, total, count, failures = list(histogram.counts), histogram.total, histogram.count, histogram.failures
+            cumulative, running = {}, 0
+            for bound, bucket in zip(bounds, counts):
+                running += bucket
+                cumulative[bound] = running
+            operations[f"{resource_type}.{operation}"] = {
+                "type": resource_type, "operation": operation, "count": count, "failures": failures,
+                "sum_seconds": total, "mean_seconds": total / count if count else 0.0, "buckets": cumulative,
+            }
+        by_type: Dict[str, int] = {}
+        by_status: Dict[str, int] = {}
+        for inventory in list(self._inventories):
+            counts = inventory.counts()
+            for target, source in ((by_type, counts["by_type"]), (by_status, counts["by_status"])):
+                for key, value in source.items():
+                    target[key] = target.get(key, 0) + value
+        return {"operations": operations, "resources": {"by_type": by_type, "by_status": by_status}}
+
+
+# Registry used by MetricsMiddleware, MetricsDecorator and the exporters unless given another
+METRICS = MetricsRegistry()
+
+
+def render_prometheus(registry: Optional[MetricsRegistry] = None) -> str:
+    """Render a snapshot in the Prometheus text exposition format (0.0.4)."""
+    snapshot = (registry or METRICS).snapshot()
+    lines: List[str] = [
+        "# HELP cloudconnect_operation_seconds Latency of resource operations.",
+        "# TYPE cloudconnect_operation_seconds histogram",
+    ]
+    for entry in snapshot["operations"].values():
+        labels = f'type="{_escape(entry["type"])}",operation="{_escape(entry["operation"])}"'
+        for bound, count in entry["buckets"].items():
+            lines.append(f'cloudconnect_operation_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f"cloudconnect_operation_seconds_sum{{{labels}}} {entry['sum_seconds']!r}")
+        lines.append(f"cloudconnect_operation_seconds_count{{{labels}}} {entry['count']}")
+    lines += ["# HELP cloudconnect_operations_total Resource operations by outcome.",
+              "# TYPE cloudconnect_operations_total counter"]
+    for entry in snapshot["operations"].values():
+        labels = f'type="{_escape(entry["type"])}",operation="{_escape(entry["operation"])}"'
+        lines.append(f'cloudconnect_operations_total{{{labels},outcome="success"}} '
+                     f'{entry["count"] - entry["failures"]}')
+        lines.append(f'cloudconnect_operations_total{{{labels},outcome="failure"}} {entry["failures"]}')
+    for name, label, values in (("cloudconnect_resources_by_type", "type", snapshot["resources"]["by_type"]),
+                                ("cloudconnect_resources_by_status", "status", snapshot["resources"]["by_status"])):
+        lines += [f"# HELP {name} Resources currently in the inventory by {label}.", f"# TYPE {name} gauge"]
+        lines += [f'{name}{{{label}="{_escape(str(key))}"}} {value}' for key, value in sorted(values.items())]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, registry: Optional[MetricsRegistry] = None) -> None:
+    """Write the metrics to `path` atomically (e.g. for a node_exporter textfile collector)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(render_prometheus(registry))
+    os.replace(temp_path, path)
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None):
+    """
+    Serve GET /metrics on a background thread and return the server; call
+    its shutdown() to stop. Port 0 picks a free port (see server_address).
+    """
+    # Imported here so that importing this module stays cheap at startup
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus(registry).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="cloudconnect-metrics", daemon=True).start()
+    return server
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')